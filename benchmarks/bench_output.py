@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""Throughput and latency benchmarks for the terminal output pipeline.
+
+Drives TerminalTab / TabbedTerminalWidget with synthetic producer processes
+and records, per scenario:
+
+* lines/sec accepted by the display
+* emission-to-display latency (from ``@ts=`` markers in the output)
+* UI event-loop stalls (lateness of a 10 ms heartbeat)
+* memory growth (RSS) and peak output_queue depth
+
+Run under a real or virtual display (``xvfb-run python benchmarks/bench_output.py``)
+to include Tk rendering, or with ``--backend stub`` for a headless run.
+Results are written as JSON; pass ``--compare old.json`` to diff two runs.
+``--replay FILE.cast`` measures a recorded tab (see the tab's Rec button)
+instead, replaying real-world output without re-running the tools.
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import shlex
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PRODUCER = os.path.join(ROOT, "benchmarks", "producer.py")
+TS_MARKER = re.compile(r"@ts=(\d+\.\d+)")
+HEARTBEAT_MS = 10
+
+# name -> (producer mode, line count, extra producer args, number of tabs)
+SCENARIOS = {
+    "flood": ("flood", 200_000, [], 1),
+    "long_lines": ("long", 50, ["--width", str(1 << 20)], 1),
+    "ansi": ("ansi", 50_000, [], 1),
+    "many_tabs": ("flood", 20_000, [], 16),
+}
+
+
+def select_backend(name: str):
+    """Import customtkinter or the headless stub in its place."""
+    if name == "auto":
+        name = "tk" if os.environ.get("DISPLAY") or os.name == "nt" else "stub"
+    if name == "stub":
+        from benchmarks import headless_tk
+        sys.modules["customtkinter"] = headless_tk
+    import customtkinter
+    return name, customtkinter
+
+
+def rss_kb() -> int:
+    """Current resident set size in KB (0 if unknown)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except ImportError:
+        return 0
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+class Probe:
+    """Hooks a tab's display path and samples the event loop."""
+
+    def __init__(self, root, tabs: list):
+        self.root = root
+        self.tabs = tabs
+        self.lines = 0
+        self.bytes = 0
+        self.latencies = []
+        self.stalls = []
+        self.max_queue = 0
+        self.peak_rss = rss_kb()
+        self._last_beat = None
+        for tab in tabs:
+            self._hook(tab)
+
+    def _hook(self, tab):
+        original = tab._write_output
+
+        def write_output(ops):
+            original(ops)
+            now = time.time()
+            for op, text in ops:
+                if op != "text":
+                    continue
+                self.lines += text.count("\n")
+                self.bytes += len(text)
+                for match in TS_MARKER.finditer(text):
+                    self.latencies.append(now - float(match.group(1)))
+
+        tab._write_output = write_output
+
+    def heartbeat(self):
+        now = time.perf_counter()
+        if self._last_beat is not None:
+            self.stalls.append(max(0.0, now - self._last_beat - HEARTBEAT_MS / 1000))
+        self._last_beat = now
+        self.max_queue = max(self.max_queue, max(t.output_queue.qsize() for t in self.tabs))
+        self.peak_rss = max(self.peak_rss, rss_kb())
+        self.root.after(HEARTBEAT_MS, self.heartbeat)
+
+
+def run_scenario(ctk, name: str, scale: float, timeout: float, view: str = "textbox", replay: tuple = None) -> dict:
+    """Run one scenario in a fresh window and return its metrics.
+
+    ``replay`` is (recording path, speed) for the "replay" scenario.
+    """
+    from src import terminal
+    from src.config import get_setting
+    from src.run_history import RunHistory
+    from src.skip_cache import SkipCache
+    from src.terminal import TabbedTerminalWidget
+
+    terminal.get_setting = lambda key: view if key == "output_view" else get_setting(key)
+    # Keep benchmark runs out of the user's history.json and skip_cache.json
+    scratch = tempfile.TemporaryDirectory(prefix="tm-bench-")
+    terminal.HISTORY = RunHistory(Path(scratch.name) / "history.json")
+    terminal.SKIP_CACHE = SkipCache(Path(scratch.name) / "skip_cache.json")
+
+    if replay:
+        mode, count, extra, n_tabs = "replay", 0, [], 1
+    else:
+        mode, count, extra, n_tabs = SCENARIOS[name]
+    count = max(1, int(count * scale))
+    command = " ".join(shlex.quote(a) for a in [sys.executable, PRODUCER, mode, str(count), *extra])
+
+    root = ctk.CTk()
+    widget = TabbedTerminalWidget(root)
+    tab_ids = [widget._create_tab(f"bench {i}", select=(i == 0)) for i in range(n_tabs)]
+    tabs = [widget.tabs[tid] for tid in tab_ids]
+    probe = Probe(root, tabs)
+    root.update()
+
+    rss_before = rss_kb()
+    start = time.perf_counter()
+    for tab in tabs:
+        if replay:
+            tab.replay(*replay)
+        else:
+            tab.run_command(command, cwd=ROOT)
+    probe.heartbeat()
+
+    deadline = start + timeout
+    timed_out = False
+    while any(t.is_running or t.replayer or not t.output_queue.empty() for t in tabs):
+        if time.perf_counter() > deadline:
+            timed_out = True
+            for tab in tabs:
+                if tab.replayer:
+                    tab.replayer.stop()
+                tab.stop_process()
+            break
+        root.update()
+        time.sleep(0.001)
+    elapsed = time.perf_counter() - start
+    # Let the final poll tick land
+    settle = time.perf_counter() + 0.2
+    while time.perf_counter() < settle:
+        root.update()
+        time.sleep(0.005)
+    rss_after = rss_kb()
+    root.destroy()
+    scratch.cleanup()
+    if replay:
+        count = probe.lines
+        probe.latencies = []  # Recorded @ts= markers are from the original run
+
+    return {
+        "tabs": n_tabs,
+        "lines_expected": count * n_tabs,
+        "lines_displayed": probe.lines,
+        "bytes_displayed": probe.bytes,
+        "elapsed_s": round(elapsed, 3),
+        "lines_per_sec": round(probe.lines / elapsed, 1) if elapsed else 0.0,
+        "latency_ms_p50": round(percentile(probe.latencies, 50) * 1000, 2),
+        "latency_ms_p99": round(percentile(probe.latencies, 99) * 1000, 2),
+        "latency_ms_max": round(max(probe.latencies, default=0.0) * 1000, 2),
+        "stall_ms_p99": round(percentile(probe.stalls, 99) * 1000, 2),
+        "stall_ms_max": round(max(probe.stalls, default=0.0) * 1000, 2),
+        "max_queue_depth": probe.max_queue,
+        "rss_growth_kb": rss_after - rss_before,
+        "peak_rss_kb": probe.peak_rss,
+        "timed_out": timed_out,
+    }
+
+
+def compare(current: dict, baseline_path: str):
+    """Print metric changes relative to a previous results file."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"\nCompared with {baseline_path}:")
+    for name, metrics in current["scenarios"].items():
+        old = baseline.get("scenarios", {}).get(name)
+        if not old:
+            continue
+        print(f"  {name}")
+        for key, value in metrics.items():
+            before = old.get(key)
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not before:
+                continue
+            change = (value - before) / before * 100
+            print(f"    {key:<18} {before:>12} -> {value:>12}  ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the terminal output pipeline.")
+    parser.add_argument("scenarios", nargs="*", default=list(SCENARIOS), help=f"subset of {', '.join(SCENARIOS)}")
+    parser.add_argument("--backend", choices=["auto", "tk", "stub"], default="auto")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply producer line counts")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds per scenario")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", metavar="OLD_JSON")
+    parser.add_argument("--view", choices=["textbox", "virtual"], default="textbox", help="output widget to measure")
+    parser.add_argument("--replay", metavar="CAST", help="replay a recorded tab instead of the scenarios")
+    parser.add_argument("--speed", type=float, default=0.0, help="replay speed factor (0 = as fast as possible)")
+    args = parser.parse_args()
+    if args.replay:
+        args.scenarios = ["replay"]
+
+    backend, ctk = select_backend(args.backend)
+    results = {
+        "backend": backend,
+        "view": args.view,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "scenarios": {},
+    }
+    for name in args.scenarios:
+        if name not in SCENARIOS and not args.replay:
+            parser.error(f"unknown scenario: {name}")
+        print(f"Running {name} ({backend})...", flush=True)
+        replay = (args.replay, args.speed) if args.replay else None
+        metrics = run_scenario(ctk, name, args.scale, args.timeout, args.view, replay)
+        results["scenarios"][name] = metrics
+        print(f"  {metrics['lines_per_sec']:.0f} lines/s, latency p99 {metrics['latency_ms_p99']} ms, "
+              f"stall max {metrics['stall_ms_max']} ms, RSS +{metrics['rss_growth_kb']} KB")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
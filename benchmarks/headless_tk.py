@@ -0,0 +1,264 @@
+"""Minimal headless stand-in for the parts of customtkinter the terminal uses.
+
+Lets the output pipeline benchmarks run without an X display. Widgets keep
+their state in memory and ``after`` callbacks run on a simple timer loop,
+so measurements cover the reader/queue/poll path but not Tk rendering.
+Use a real display (e.g. ``xvfb-run``) to include rendering costs.
+"""
+
+import heapq
+import itertools
+import time
+
+
+class _EventLoop:
+    """Timer queue driving ``after`` callbacks."""
+
+    def __init__(self):
+        self._heap = []
+        self._seq = itertools.count()
+        self._cancelled = set()
+
+    def schedule(self, ms, func, args) -> str:
+        seq = next(self._seq)
+        heapq.heappush(self._heap, (time.monotonic() + ms / 1000, seq, func, args))
+        return f"after#{seq}"
+
+    def cancel(self, after_id):
+        if after_id:
+            self._cancelled.add(int(str(after_id).split("#")[1]))
+
+    def run_due(self):
+        """Run every callback that is due now."""
+        now = time.monotonic()
+        while self._heap and self._heap[0][0] <= now:
+            _, seq, func, args = heapq.heappop(self._heap)
+            if seq in self._cancelled:
+                self._cancelled.discard(seq)
+                continue
+            if func:
+                func(*args)
+
+    def next_due(self):
+        return self._heap[0][0] if self._heap else None
+
+
+_loop = _EventLoop()
+
+
+class _Widget:
+    """Base widget storing options and children in memory."""
+
+    def __init__(self, master=None, **kwargs):
+        self.master = master
+        self._options = dict(kwargs)
+        self._children = []
+        self._alive = True
+        if isinstance(master, _Widget):
+            master._children.append(self)
+
+    def winfo_exists(self):
+        return self._alive
+
+    def winfo_children(self):
+        return [c for c in self._children if c._alive]
+
+    def winfo_screenwidth(self):
+        return 1920
+
+    def winfo_screenheight(self):
+        return 1080
+
+    def configure(self, **kwargs):
+        self._options.update(kwargs)
+
+    def cget(self, key):
+        return self._options.get(key)
+
+    def after(self, ms, func=None, *args):
+        return _loop.schedule(ms, func, args)
+
+    def after_idle(self, func, *args):
+        return _loop.schedule(0, func, args)
+
+    def after_cancel(self, after_id):
+        _loop.cancel(after_id)
+
+    def destroy(self):
+        self._alive = False
+        for child in self._children:
+            child.destroy()
+
+    def _noop(self, *args, **kwargs):
+        return None
+
+    pack = pack_forget = grid = grid_remove = place = _noop
+    grid_rowconfigure = grid_columnconfigure = grid_propagate = _noop
+    bind = focus_set = focus_force = update_idletasks = _noop
+
+
+class CTk(_Widget):
+    """Root window: ``update`` runs due timer callbacks."""
+
+    def title(self, *args):
+        pass
+
+    def geometry(self, *args):
+        pass
+
+    def minsize(self, *args):
+        pass
+
+    def protocol(self, *args):
+        pass
+
+    def update(self):
+        _loop.run_due()
+
+    def mainloop(self):
+        while self._alive:
+            due = _loop.next_due()
+            if due is not None:
+                time.sleep(max(0.0, min(0.05, due - time.monotonic())))
+            else:
+                time.sleep(0.01)
+            _loop.run_due()
+
+
+class CTkTextbox(_Widget):
+    """Text widget keeping inserted chunks in a list."""
+
+    def __init__(self, master=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self._chunks = []
+
+    def _offset(self, text, index):
+        """Map "1.0", "end", "end-Nc" and "end-1c linestart" to a string offset (Tk's trailing newline is implicit)."""
+        if index in ("1.0", "0.0"):
+            return 0
+        if index == "end-1c linestart":
+            return text.rfind("\n") + 1
+        if index.startswith("end-") and index.endswith("c"):
+            return max(0, len(text) - int(index[4:-1]) + 1)
+        return len(text)
+
+    def insert(self, index, text, *tags):
+        if index in ("1.0", "0.0"):
+            self._chunks.insert(0, text)
+        elif index == "end":
+            self._chunks.append(text)
+        else:
+            current = "".join(self._chunks)
+            pos = self._offset(current, index)
+            self._chunks = [current[:pos], text, current[pos:]]
+
+    def delete(self, start, end=None):
+        if start in ("1.0", "0.0"):
+            self._chunks.clear()
+            return
+        current = "".join(self._chunks)
+        pos = self._offset(current, start)
+        stop = self._offset(current, end) if end else pos + 1
+        self._chunks = [current[:pos], current[stop:]]
+
+    def tag_config(self, tag, **kwargs):
+        pass
+
+    def get(self, start="1.0", end="end"):
+        text = "".join(self._chunks)
+        if isinstance(start, str) and start.startswith("end-") and start.endswith("c"):
+            return text[-int(start[4:-1]):]
+        return text
+
+    def see(self, index):
+        pass
+
+    def search(self, pattern, index, backwards=False, **kwargs):
+        text = "".join(self._chunks)
+        pos = text.rfind(pattern) if backwards else text.find(pattern)
+        if pos < 0:
+            return ""
+        line = text.count("\n", 0, pos) + 1
+        return f"{line}.{pos - (text.rfind(chr(10), 0, pos) + 1)}"
+
+    def index(self, index):
+        return "1.0"
+
+    tag_add = tag_remove = _Widget._noop
+
+
+class CTkFrame(_Widget):
+    pass
+
+
+class CTkToplevel(CTk):
+    pass
+
+
+class CTkScrollableFrame(_Widget):
+    pass
+
+
+class CTkLabel(_Widget):
+    pass
+
+
+class CTkButton(_Widget):
+    pass
+
+
+class CTkEntry(_Widget):
+    pass
+
+
+class CTkScrollbar(_Widget):
+    def set(self, first, last):
+        self._options["position"] = (first, last)
+
+
+class CTkCheckBox(_Widget):
+    def select(self):
+        self._options["value"] = 1
+
+    def deselect(self):
+        self._options["value"] = 0
+
+    def get(self):
+        return self._options.get("value", 0)
+
+
+class CTkOptionMenu(_Widget):
+    def set(self, value):
+        self._options["value"] = value
+
+    def get(self):
+        return self._options.get("value")
+
+
+class CTkInputDialog(_Widget):
+    def get_input(self):
+        return None
+
+
+class CTkFont:
+    def __init__(self, **kwargs):
+        self.options = kwargs
+
+
+class StringVar:
+    def __init__(self, value=""):
+        self._value = value
+
+    def get(self):
+        return self._value
+
+    def set(self, value):
+        self._value = value
+
+
+def set_appearance_mode(mode):
+    pass
+
+
+def set_default_color_theme(theme):
+    pass
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Synthetic output producers for the output pipeline benchmarks.
+
+Lines carry an ``@ts=<epoch>`` marker every ``--every`` lines so the
+benchmark can measure emission-to-display latency.
+
+Usage: producer.py {flood,long,ansi} COUNT [--every N] [--width N]
+"""
+
+import argparse
+import sys
+import time
+
+COLORS = ["31", "32", "33", "34", "35", "36", "1;31", "1;32"]
+
+
+def marker(i: int, every: int) -> str:
+    """Timestamp marker for sampled lines."""
+    return f" @ts={time.time():.6f}" if i % every == 0 else ""
+
+
+def flood(out, count: int, every: int, width: int):
+    """Short lines as fast as possible."""
+    pad = "x" * max(0, width - 20)
+    for i in range(count):
+        out.write(f"line {i} {pad}{marker(i, every)}\n")
+
+
+def long_lines(out, count: int, every: int, width: int):
+    """Very long lines written in chunks with no newline until the end."""
+    chunk = "y" * 4096
+    for i in range(count):
+        out.write(f"long {i}{marker(i, 1)} ")
+        for _ in range(max(1, width // len(chunk))):
+            out.write(chunk)
+            out.flush()
+        out.write("\n")
+
+
+def ansi(out, count: int, every: int, width: int):
+    """Colored log-style lines full of escape sequences."""
+    words = max(1, width // 12)
+    for i in range(count):
+        parts = [f"\x1b[{COLORS[(i + j) % len(COLORS)]}mword{j}\x1b[0m" for j in range(words)]
+        out.write(f"\x1b[2m[{i}]\x1b[0m {' '.join(parts)}{marker(i, every)}\n")
+
+
+MODES = {"flood": flood, "long": long_lines, "ansi": ansi}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("mode", choices=sorted(MODES))
+    parser.add_argument("count", type=int)
+    parser.add_argument("--every", type=int, default=100)
+    parser.add_argument("--width", type=int, default=80)
+    args = parser.parse_args()
+
+    MODES[args.mode](sys.stdout, args.count, args.every, args.width)
+    sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,50 @@
 #!/usr/bin/env python3
 """Terminal Manager - Entry point."""
 
+import argparse
 import sys
 import os
 
 # Add src to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from src.app import TerminalManagerApp
+from src.control_server import send_to_running_instance
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Terminal Manager")
+    parser.add_argument("project", nargs="?", help="project folder to open")
+    parser.add_argument("--run", metavar="COMMAND", help="command to run in a new tab")
+    parser.add_argument("--name", help="tab name for --run")
+    return parser.parse_args(argv)
 
 
 def main():
     """Run the application."""
+    args = parse_args()
+    request = {
+        "project": os.path.abspath(args.project) if args.project else None,
+        "command": args.run,
+        "name": args.name,
+    }
+    
+    # Hand off to an already running instance instead of starting another GUI
+    if send_to_running_instance(request):
+        return
+    
+    from src.app import TerminalManagerApp
+    
     app = TerminalManagerApp()
+    if args.project or args.run:
+        try:
+            app.handle_open_request(request)
+        except ValueError as e:
+            # A bad path shouldn't stop the app from starting
+            print(f"Error opening project: {e}", file=sys.stderr)
+            tab = app.terminal.get_current_tab()
+            if tab:
+                tab._append_text(f"\n⚠️ Could not open project: {e}\n")
     app.mainloop()
 
 
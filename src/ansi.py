@@ -0,0 +1,71 @@
+"""ANSI escape handling for terminal output shown in a plain text widget."""
+
+import re
+
+# CSI (colors, cursor moves), OSC (titles, hyperlinks) and two-byte escapes
+ANSI_RE = re.compile(r"\x1b(?:\[[0-?]*[ -/]*[@-~]|\][^\x07\x1b]*(?:\x07|\x1b\\)|[@-Z\\-_])")
+# An escape sequence cut off at the end of a read
+_PARTIAL_RE = re.compile(r"\x1b(?:\[[0-?]*[ -/]*|\][^\x07\x1b]*)?\Z")
+
+
+def strip_ansi(text: str) -> str:
+    """Remove ANSI escape sequences from text."""
+    return ANSI_RE.sub("", text) if "\x1b" in text else text
+
+
+class TerminalTextFilter:
+    """Turn raw pseudo-terminal output chunks into plain text.
+
+    Strips escape sequences (keeping any that are split across reads for the
+    next chunk), normalizes CRLF, and collapses carriage-return redraws such
+    as progress bars to their final state.
+
+    Redraws usually arrive one frame per read, so the filter remembers
+    whether the current line is already on screen. A frame that overwrites
+    it starts with a bare ``\r``, meaning "replace the open last line".
+    That is the only ``\r`` left in the output.
+    """
+
+    def __init__(self):
+        self._carry = ""
+        self._line = False  # Part of the current line was already returned
+        self._cr = False    # A \r is pending: the next text overwrites the line
+
+    def feed(self, chunk: str) -> str:
+        text = self._carry + chunk
+        self._carry = ""
+        partial = _PARTIAL_RE.search(text)
+        if partial:
+            self._carry = text[partial.start():]
+            text = text[:partial.start()]
+        text = strip_ansi(text).replace("\r\n", "\n")
+        if "\r" in text or self._cr:
+            text = self._collapse(text)
+        elif text:
+            self._line = not text.endswith("\n")
+        return text
+
+    def _collapse(self, text: str) -> str:
+        out = []
+        for i, segment in enumerate(text.split("\n")):
+            if i:
+                out.append("\n")
+                self._line = self._cr = False
+            frame = ""
+            erase = False
+            for j, piece in enumerate(segment.split("\r")):
+                if j:
+                    self._cr = True
+                if not piece:
+                    continue
+                if self._cr:
+                    # Overwrites this chunk's earlier frames, and what is on screen
+                    frame = piece
+                    erase = erase or self._line
+                    self._cr = False
+                else:
+                    frame += piece
+            if frame:
+                out.append("\r" + frame if erase else frame)
+                self._line = True
+        return "".join(out)
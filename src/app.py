@@ -3,28 +3,20 @@
 import customtkinter as ctk
 from tkinter import filedialog
 import os
+import tracemalloc
 
 from .terminal import TabbedTerminalWidget
 from .commands import COMMANDS, CATEGORY_ICONS
-from .config import add_recent_project, get_recent_projects, get_custom_commands, add_custom_command, remove_custom_command
+from .config import add_recent_project, get_recent_projects, get_custom_commands, add_custom_command, remove_custom_command, get_setting
 from .git_helper import get_git_branch, is_git_repo, get_commit_command
 from .process_helper import kill_port, check_port_in_use
-
-
-# Commands that should open in new tabs (long-running processes)
-NEW_TAB_COMMANDS = [
-    "npm run dev",
-    "npm run worker", 
-    "npm run start",
-    "npx prisma studio",
-    "npm run build:watch",
-]
-
-# Ports associated with commands
-COMMAND_PORTS = {
-    "npm run dev": 3000,
-    "npx prisma studio": 5555,
-}
+from .session import save_session, load_session
+from .metrics import export_metrics
+from .debug_panel import DebugPanel
+from .fanout_dialog import FanOutDialog
+from .git_panel import GitStatusPanel
+from .control_server import ControlServer
+from .project_scripts import discover_scripts, find_script, infer_command
 
 
 class TerminalManagerApp(ctk.CTk):
@@ -43,9 +35,26 @@ class TerminalManagerApp(ctk.CTk):
         
         self.current_project = None
         self.command_buttons = []
+        self.debug_panel = None
+        self.fanout_dialog = None
+        self.control_server = None
+        
+        if get_setting("metrics_tracemalloc"):
+            tracemalloc.start()
         
         self._setup_ui()
         self._load_recent_projects()
+        
+        if get_setting("restore_session"):
+            self._restore_session()
+        self.terminal.adopt_detached_runs()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self._schedule_autosave()
+        self.bind("<F12>", lambda e: self._toggle_debug_panel())
+        if get_setting("metrics_export_path"):
+            self._export_metrics()
+        if get_setting("control_api"):
+            self._start_control_server()
     
     def _setup_ui(self):
         """Setup the main UI layout."""
@@ -127,6 +136,20 @@ class TerminalManagerApp(ctk.CTk):
         )
         self.info_label.grid(row=5, column=0, sticky="w", pady=(5, 0))
         
+        # Run one command in several projects
+        self.fanout_btn = ctk.CTkButton(
+            self.project_frame,
+            text="🔀 Run in Projects...",
+            command=self._open_fanout_dialog,
+            height=28,
+            fg_color="transparent",
+            border_width=1
+        )
+        self.fanout_btn.grid(row=6, column=0, sticky="ew", pady=(5, 0))
+        
+        # Git changes (shown for git projects, packed above the commands)
+        self.git_panel = GitStatusPanel(self.sidebar)
+        
         # Scrollable command buttons area
         self.command_scroll = ctk.CTkScrollableFrame(
             self.sidebar,
@@ -180,6 +203,14 @@ class TerminalManagerApp(ctk.CTk):
         )
         self.run_btn.pack(side="left", padx=5)
         
+        # Opt-in: send the input bar's text to the current tab's running process
+        self.stdin_check = ctk.CTkCheckBox(
+            self.control_bar,
+            text="⌨ stdin",
+            width=70
+        )
+        self.stdin_check.pack(side="left", padx=5)
+        
         self.run_new_tab_btn = ctk.CTkButton(
             self.control_bar,
             text="📑 New Tab",
@@ -189,6 +220,17 @@ class TerminalManagerApp(ctk.CTk):
             fg_color=("#3a7ebf", "#1f538d")
         )
         self.run_new_tab_btn.pack(side="right", padx=5)
+        
+        self.debug_btn = ctk.CTkButton(
+            self.control_bar,
+            text="📈",
+            command=self._toggle_debug_panel,
+            width=35,
+            height=35,
+            fg_color="transparent",
+            border_width=1
+        )
+        self.debug_btn.pack(side="right", padx=(5, 0))
     
     def _create_command_buttons(self):
         """Create command buttons for each category."""
@@ -197,10 +239,8 @@ class TerminalManagerApp(ctk.CTk):
             widget.destroy()
         self.command_buttons.clear()
         
-        # Add preset command categories
-        for category, commands in COMMANDS.items():
-            if not commands and category != "Custom":
-                continue
+        # Add the project's own scripts, or the presets before a project is chosen
+        for category, commands in self._command_categories():
                 
             # Category label
             icon = CATEGORY_ICONS.get(category, "📌")
@@ -211,10 +251,7 @@ class TerminalManagerApp(ctk.CTk):
             ).pack(anchor="w", pady=(10, 5))
             
             # Command buttons
-            for label, cmd in commands:
-                # Check if this is a long-running command
-                is_new_tab = any(ntc in cmd for ntc in NEW_TAB_COMMANDS)
-                
+            for label, cmd, is_new_tab in commands:
                 btn_text = f"📑 {label}" if is_new_tab else label
                 
                 btn = ctk.CTkButton(
@@ -270,6 +307,28 @@ class TerminalManagerApp(ctk.CTk):
                 
                 self.command_buttons.append(btn)
     
+    def _command_categories(self) -> list:
+        """[(category, [(label, command, long_running), ...]), ...] for the sidebar.
+
+        Long-running commands (dev servers, watchers) open in their own tab.
+        """
+        project = self.current_project
+        discovered = discover_scripts(project) if project else []
+        categories = []
+        for category, scripts in discovered:
+            categories.append((category, [(s["label"], s["command"], s["long_running"]) for s in scripts]))
+        for category, commands in COMMANDS.items():
+            if not commands:
+                continue
+            if discovered and category == "NPM":
+                continue  # Replaced by the package.json scripts
+            if project and category == "Prisma" and not os.path.exists(os.path.join(project, "prisma")):
+                continue
+            if project and category == "Git" and not is_git_repo(project):
+                continue
+            categories.append((category, [(label, cmd, infer_command(cmd)[0]) for label, cmd in commands]))
+        return categories
+
     def _load_recent_projects(self):
         """Load recent projects into dropdown."""
         recent = get_recent_projects()
@@ -314,9 +373,15 @@ class TerminalManagerApp(ctk.CTk):
             branch = get_git_branch(path)
             self.git_label.configure(text=f"🔀 {branch}")
             self.git_label.grid(row=4, column=0, sticky="w", pady=(2, 0))
+            self.git_panel.set_project(path)
+            self.git_panel.pack(fill="x", padx=15, pady=(5, 0), before=self.command_scroll)
         else:
             self.git_label.configure(text="")
             self.git_label.grid_remove()
+            self.git_panel.set_project(None)
+            self.git_panel.pack_forget()
+
+        self._create_command_buttons()
     
     def _run_command(self, command: str, new_tab: bool = False, name: str = None):
         """Execute a command."""
@@ -331,13 +396,20 @@ class TerminalManagerApp(ctk.CTk):
             self._git_commit_dialog()
             return
 
-        # Auto-kill port if command uses one
-        port = COMMAND_PORTS.get(command)
-        if port:
-            if kill_port(port):
-                tab = self.terminal.get_current_tab()
-                if tab:
-                    tab._append_text(f"\n⚡ Auto-killed process on port {port}\n")
+        # Free the port a server command listens on, if its script or the command sets it
+        script = find_script(self.current_project, command)
+        if script:
+            long_running, port, explicit = script["long_running"], script["port"], script["port_explicit"]
+        else:
+            long_running, port, explicit = infer_command(command)
+        if long_running and port:
+            tab = self.terminal.get_current_tab()
+            if not explicit:
+                # Only the tool's usual port: it may be another app's, so just say so
+                if check_port_in_use(port) and tab:
+                    tab._append_text(f"\n⚠️ Port {port} is already in use\n")
+            elif kill_port(port) and tab:
+                tab._append_text(f"\n⚡ Stopped the process on port {port}\n")
         
         if new_tab:
             # Run in new dedicated tab
@@ -353,14 +425,26 @@ class TerminalManagerApp(ctk.CTk):
     def _run_custom_entry(self, event=None, new_tab: bool = False):
         """Run command from entry field."""
         cmd = self.cmd_entry.get().strip()
+        tab = self.terminal.get_current_tab()
+        if not new_tab and tab and tab.is_running:
+            if not self.stdin_check.get():
+                # Keep the text: it was probably meant as a new command
+                tab._append_text("\n[Process already running. Tick ⌨ stdin to send input to it]\n")
+                return
+            # Answer prompts of the running process (empty Enter accepts defaults)
+            tab.send_input(self.cmd_entry.get() + "\n")
+            self.cmd_entry.delete(0, "end")
+            return
         if cmd:
             self._run_command(cmd, new_tab=new_tab)
             self.cmd_entry.delete(0, "end")
     
     def _git_commit_dialog(self):
         """Show dialog for git commit message."""
+        # Show what `git add .` is about to pick up
+        summary = self.git_panel.commit_summary()
         dialog = ctk.CTkInputDialog(
-            text="Enter commit message:",
+            text=f"{summary}\n\nEnter commit message:" if summary else "Enter commit message:",
             title="Git Commit"
         )
         message = dialog.get_input()
@@ -419,3 +503,113 @@ class TerminalManagerApp(ctk.CTk):
         remove_custom_command(index)
         self._create_command_buttons()
 
+    def _save_session(self):
+        """Save open tabs and the current project."""
+        state = self.terminal.get_session_state(get_setting("session_scrollback_kb"))
+        state["project"] = self.current_project
+        save_session(state)
+
+    def _restore_session(self):
+        """Restore the previous session's project and tabs."""
+        state = load_session()
+        if not state:
+            return
+        project = state.get("project")
+        if project and os.path.isdir(project):
+            self._set_project(project)
+        self.terminal.restore_session(state)
+
+    def _autosave_session(self):
+        """Periodically save the session so a crash loses little."""
+        try:
+            self._save_session()
+        except Exception as e:
+            print(f"Error autosaving session: {e}")
+        self._schedule_autosave()
+
+    def _schedule_autosave(self):
+        """Queue the next autosave; ``session_autosave_s`` <= 0 disables it."""
+        try:
+            interval = float(get_setting("session_autosave_s"))
+        except (TypeError, ValueError) as e:
+            print(f"Error reading session_autosave_s: {e}")
+            return
+        if interval > 0:
+            self.after(int(interval * 1000), self._autosave_session)
+
+    def _toggle_debug_panel(self):
+        """Show or hide the metrics debug panel (F12)."""
+        if self.debug_panel and self.debug_panel.winfo_exists():
+            self.debug_panel.destroy()
+            self.debug_panel = None
+        else:
+            self.debug_panel = DebugPanel(self)
+
+    def _open_fanout_dialog(self):
+        """Open the multi-project runner, prefilled with the command entry."""
+        if self.fanout_dialog and self.fanout_dialog.winfo_exists():
+            self.fanout_dialog.lift()
+            return
+        self.fanout_dialog = FanOutDialog(
+            self,
+            projects=self._recent_paths,
+            command=self.cmd_entry.get().strip(),
+            open_output=self._show_fanout_output
+        )
+
+    def _show_fanout_output(self, name: str, text: str):
+        """Show one project's captured fan-out output in a new tab."""
+        tab_id = self.terminal._create_tab(name, select=True)
+        self.terminal.tabs[tab_id]._append_text(text)
+
+    def _export_metrics(self):
+        """Periodically write metrics to the configured JSON/Prometheus textfile."""
+        path = get_setting("metrics_export_path")
+        if not path:
+            return
+        export_metrics(path, get_setting("metrics_export_format"))
+        self.after(get_setting("metrics_export_interval_s") * 1000, self._export_metrics)
+
+    def _start_control_server(self):
+        """Start the local control API (opt-in via control_api)."""
+        try:
+            self.control_server = ControlServer(
+                self.terminal,
+                open_handler=self.handle_open_request,
+                port=get_setting("control_port")
+            )
+            self.control_server.start()
+        except OSError as e:
+            print(f"Error starting control API: {e}")
+            self.control_server = None
+
+    def handle_open_request(self, request: dict) -> dict:
+        """Open a project and/or run a command (launch args or control API)."""
+        project = request.get("project")
+        if project:
+            if not os.path.isdir(project):
+                raise ValueError(f"not a directory: {project}")
+            self._set_project(project)
+        tab_id = None
+        command = request.get("command")
+        if command:
+            tab_id = self.terminal.run_command_in_new_tab(
+                command,
+                name=request.get("name") or command[:15],
+                cwd=self.current_project
+            )
+        # Bring the window forward for the user who just launched us again
+        self.deiconify()
+        self.lift()
+        return {"ok": True, "tab_id": tab_id}
+
+    def _on_close(self):
+        """Save the session and close the window."""
+        try:
+            self._save_session()
+        except Exception as e:
+            print(f"Error saving session: {e}")
+        if self.control_server:
+            self.control_server.stop()
+        self.git_panel.stop()
+        self.destroy()
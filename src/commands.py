@@ -21,10 +21,32 @@ COMMANDS = {
     "Custom": []  # User-defined commands
 }
 
+# Default resource limits for presets (overridable via "command_limits")
+PRESET_LIMITS = {
+    "npm run build": {"nice": 10, "ionice": "idle", "heavy": True},
+    "npm install": {"nice": 5, "heavy": True},
+}
+
+# Inputs/outputs of deterministic presets (overridable via "command_inputs"):
+# the run is skipped while the inputs are unchanged since its last success
+PRESET_INPUTS = {
+    "npm install": {"inputs": ["package.json", "package-lock.json"], "outputs": ["node_modules"]},
+    "npx prisma generate": {
+        "inputs": ["prisma/**/*.prisma", "package-lock.json"],
+        "outputs": ["node_modules/.prisma/client"],
+    },
+}
+
 # Icons for command categories
 CATEGORY_ICONS = {
     "NPM": "📦",
     "Prisma": "🗄️",
     "Git": "🔀",
+    "Yarn": "🧶",
+    "pnpm": "📦",
+    "Bun": "🥟",
+    "Make": "🛠️",
+    "Python": "🐍",
+    "Docker": "🐳",
     "Custom": "⚡"
 }
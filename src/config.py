@@ -20,9 +20,52 @@ DEFAULT_CONFIG = {
     "recent_projects": [],
     "custom_commands": [],
     "max_recent": 10,
-    "theme": "dark"
+    "theme": "dark",
+    "watch_ignore": ["node_modules", "dist", "build", ".git", "__pycache__", ".venv", "venv"],
+    "watch_debounce_ms": 300,
+    "restore_session": True,
+    "session_scrollback_kb": 64,
+    "session_autosave_s": 60,
+    "metrics_export_path": "",
+    "metrics_export_format": "json",
+    "metrics_export_interval_s": 10,
+    "metrics_tracemalloc": False,
+    "output_queue_max": 10000,
+    "output_overflow_policy": "block",
+    "output_drain_max_lines": 5000,
+    "fold_repeats": "off",
+    "output_view": "textbox",
+    "json_logs": True,
+    "json_log_max_lines": 1000000,
+    "json_log_max_mb": 64,
+    "json_view_max_lines": 10000,
+    "command_limits": {},
+    "max_heavy_per_project": 1,
+    "skip_cache": True,
+    "command_inputs": {},
+    "problems": True,
+    "problem_matchers": [],
+    "run_history": True,
+    "run_history_max": 200,
+    "regression_window": 30,
+    "regression_factor": 1.5,
+    "project_groups": {},
+    "fanout_concurrency": 4,
+    "fanout_keep_lines": 5000,
+    "use_pty": False,
+    "control_api": False,
+    "control_port": 0,
+    "direct_exec": True,
+    "persistent_shell": False,
+    "detached_processes": False,
+    "project_env": True,
+    "project_env_files": [".env", ".env.local"],
+    "project_path_dirs": ["node_modules/.bin", ".venv/bin", ".venv/Scripts", "venv/bin"]
 }
 
+# Parsed config reused by get_setting until the file changes on disk
+_settings_cache: tuple = (None, None)
+
 
 def load_config() -> dict:
     """Load configuration from file."""
@@ -89,3 +132,18 @@ def get_custom_commands() -> list:
     """Get list of custom commands."""
     config = load_config()
     return config["custom_commands"]
+
+
+def get_setting(key: str):
+    """Get a single configuration value (falls back to the default)."""
+    global _settings_cache
+    try:
+        st = CONFIG_FILE.stat()
+        signature = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        signature = None
+    cached_signature, config = _settings_cache
+    if config is None or cached_signature != signature:
+        config = load_config()
+        _settings_cache = (signature, config)
+    return config.get(key, DEFAULT_CONFIG.get(key))
@@ -0,0 +1,317 @@
+"""Opt-in local control API (loopback HTTP/JSON) for scripting tabs.
+
+Requests must carry the token from ``control.json`` (written next to the
+config with owner-only permissions) in an ``X-Terminal-Manager-Token``
+header.
+
+    GET  /ping                      -> {"ok": true, "pid": ...}
+    GET  /tabs                      -> list of tabs
+    POST /tabs      {command, cwd?, name?, follow?}  -> run in a new tab, {"id": ...}
+                    (with "follow": true the response is the tab's output stream)
+    POST /tabs/<id>/run     {command, cwd?}
+    POST /tabs/<id>/stop
+    POST /tabs/<id>/restart
+    POST /tabs/<id>/input   {text}
+    GET  /tabs/<id>/output[?until_exit=1]   -> live text stream
+    POST /open      {project?, command?, name?}  (used by a second launch)
+"""
+
+import hmac
+import json
+import os
+import queue
+import secrets
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+from urllib.parse import parse_qs, urlparse
+
+from .config import ROOT_DIR
+
+CONTROL_FILE = ROOT_DIR / "control.json"
+TOKEN_HEADER = "X-Terminal-Manager-Token"
+UI_CALL_TIMEOUT = 10
+
+
+class _OutputSubscription:
+    """Buffers a tab's output chunks for one streaming client."""
+
+    def __init__(self, tab):
+        self.tab = tab
+        self.chunks = queue.Queue(maxsize=10000)
+        tab.add_output_listener(self._on_output)
+
+    def _on_output(self, text: str):
+        try:
+            self.chunks.put_nowait(text)
+        except queue.Full:
+            pass  # Client too slow; don't stall the reader thread
+
+    def close(self):
+        self.tab.remove_output_listener(self._on_output)
+
+
+def read_control_file() -> dict:
+    """Read the running instance's port and token, if any."""
+    try:
+        with open(CONTROL_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def send_to_running_instance(request: dict, timeout: float = 2.0) -> bool:
+    """Forward launch arguments to an already running app. Returns True if handled."""
+    info = read_control_file()
+    if not info.get("port") or not info.get("token"):
+        return False
+    req = urllib.request.Request(
+        f"http://127.0.0.1:{info['port']}/open",
+        data=json.dumps(request).encode("utf-8"),
+        headers={"Content-Type": "application/json", TOKEN_HEADER: info["token"]},
+        method="POST"
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return resp.status == 200
+    except (urllib.error.URLError, OSError, ValueError):
+        return False
+
+
+class ControlServer:
+    """Loopback HTTP server exposing TabbedTerminalWidget to local scripts.
+
+    Handler threads never touch Tk directly: UI work is queued and run on
+    the Tk thread by a polling ``after`` loop.
+    """
+
+    def __init__(self, terminal, open_handler: Callable = None, port: int = 0):
+        self.terminal = terminal
+        self.open_handler = open_handler
+        self.port = port
+        self.token = secrets.token_urlsafe(24)
+        self._calls = queue.Queue()
+        self._httpd = None
+        self._thread = None
+
+    def start(self):
+        """Bind to 127.0.0.1, publish the control file and start serving."""
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", self.port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._write_control_file()
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        self._process_calls()
+
+    def stop(self):
+        """Stop serving and remove the control file if it is ours."""
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+        if read_control_file().get("token") == self.token:
+            try:
+                os.remove(CONTROL_FILE)
+            except OSError:
+                pass
+
+    def _write_control_file(self):
+        info = {"port": self.port, "token": self.token, "pid": os.getpid()}
+        fd = os.open(CONTROL_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        if hasattr(os, "fchmod"):
+            os.fchmod(fd, 0o600)  # The mode above only applies when the file is created
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(info, f)
+
+    # --- Tk thread bridge ---
+
+    def _process_calls(self):
+        """Run queued UI calls on the Tk thread."""
+        try:
+            while True:
+                func, args, future = self._calls.get_nowait()
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(func(*args))
+                except Exception as e:
+                    future.set_exception(e)
+        except queue.Empty:
+            pass
+        if self._httpd and self.terminal.winfo_exists():
+            self.terminal.after(20, self._process_calls)
+
+    def call_in_ui(self, func: Callable, *args):
+        """Run func on the Tk thread and wait for its result."""
+        future = Future()
+        self._calls.put((func, args, future))
+        return future.result(timeout=UI_CALL_TIMEOUT)
+
+    # --- Operations (run on the Tk thread) ---
+
+    def _list_tabs(self) -> list:
+        return [
+            {
+                "id": tab_id,
+                "name": tab.tab_name,
+                "running": tab.is_running,
+                "command": getattr(tab, "last_cmd", None),
+                "cwd": getattr(tab, "last_cwd", None),
+            }
+            for tab_id, tab in self.terminal.tabs.items()
+        ]
+
+    def _new_tab(self, body: dict, follow: bool = False):
+        if not body.get("command"):
+            raise ValueError("command is required")
+        if not follow:
+            return {"id": self.terminal.run_command_in_new_tab(
+                body["command"], name=body.get("name"), cwd=body.get("cwd")
+            )}
+        # Subscribe before starting so not even the first line is missed
+        command = body["command"]
+        tab_id = self.terminal._create_tab(body.get("name") or command[:20], select=True)
+        tab = self.terminal.tabs[tab_id]
+        subscription = _OutputSubscription(tab)
+        tab.run_command(command, cwd=body.get("cwd") or self.terminal.current_project)
+        return subscription
+
+    def _subscribe(self, tab_id: str):
+        tab = self.terminal.tabs.get(tab_id)
+        if tab is None:
+            raise KeyError(tab_id)
+        return _OutputSubscription(tab)
+
+    def _tab_action(self, tab_id: str, action: str, body: dict) -> dict:
+        tab = self.terminal.tabs.get(tab_id)
+        if tab is None:
+            raise KeyError(tab_id)
+        if action == "run":
+            if not body.get("command"):
+                raise ValueError("command is required")
+            ok = tab.run_command(body["command"], cwd=body.get("cwd") or self.terminal.current_project)
+        elif action == "stop":
+            ok = tab.is_running
+            tab.stop_process()
+        elif action == "restart":
+            ok = bool(getattr(tab, "last_cmd", None))
+            tab.restart_process()
+        elif action == "input":
+            ok = tab.send_input(body.get("text", ""))
+        else:
+            raise ValueError(f"unknown action: {action}")
+        return {"ok": bool(ok)}
+
+    # --- HTTP ---
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass  # Keep the app's stdout clean
+
+            def _send_json(self, status: int, payload):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _authorized(self) -> bool:
+                token = self.headers.get(TOKEN_HEADER, "")
+                if hmac.compare_digest(token.encode(), server.token.encode()):
+                    return True
+                self._send_json(403, {"error": "invalid token"})
+                return False
+
+            def _read_body(self) -> dict:
+                length = int(self.headers.get("Content-Length") or 0)
+                if not length:
+                    return {}
+                return json.loads(self.rfile.read(length).decode("utf-8"))
+
+            def do_GET(self):
+                if not self._authorized():
+                    return
+                url = urlparse(self.path)
+                parts = [p for p in url.path.split("/") if p]
+                if parts == ["ping"]:
+                    self._send_json(200, {"ok": True, "pid": os.getpid()})
+                elif parts == ["tabs"]:
+                    self._send_json(200, server.call_in_ui(server._list_tabs))
+                elif len(parts) == 3 and parts[0] == "tabs" and parts[2] == "output":
+                    query = parse_qs(url.query)
+                    try:
+                        subscription = server.call_in_ui(server._subscribe, parts[1])
+                    except KeyError:
+                        self._send_json(404, {"error": f"not found: {parts[1]}"})
+                        return
+                    self._stream_output(subscription, query.get("until_exit", ["0"])[0] == "1")
+                else:
+                    self._send_json(404, {"error": "not found"})
+
+            def do_POST(self):
+                if not self._authorized():
+                    return
+                parts = [p for p in urlparse(self.path).path.split("/") if p]
+                try:
+                    body = self._read_body()
+                    if parts == ["tabs"] and body.get("follow"):
+                        subscription = server.call_in_ui(server._new_tab, body, True)
+                        self._stream_output(subscription, until_exit=True)
+                        return
+                    elif parts == ["tabs"]:
+                        result = server.call_in_ui(server._new_tab, body)
+                    elif parts == ["open"] and server.open_handler:
+                        result = server.call_in_ui(server.open_handler, body) or {"ok": True}
+                    elif len(parts) == 3 and parts[0] == "tabs":
+                        result = server.call_in_ui(server._tab_action, parts[1], parts[2], body)
+                    else:
+                        self._send_json(404, {"error": "not found"})
+                        return
+                except KeyError as e:
+                    self._send_json(404, {"error": f"not found: {e.args[0]}"})
+                    return
+                except (ValueError, TypeError) as e:
+                    self._send_json(400, {"error": str(e)})
+                    return
+                except Exception as e:
+                    self._send_json(500, {"error": str(e)})
+                    return
+                self._send_json(200, result)
+
+            def _stream_output(self, subscription, until_exit: bool):
+                tab = subscription.tab
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; charset=utf-8")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                try:
+                    while True:
+                        try:
+                            parts = [subscription.chunks.get(timeout=0.5)]
+                        except queue.Empty:
+                            # A run waiting for a heavy-command slot hasn't started yet
+                            if tab._closed or (until_exit and not tab.is_busy()):
+                                break
+                            continue
+                        # Coalesce whatever else is ready into one write
+                        while len(parts) < 1000:
+                            try:
+                                parts.append(subscription.chunks.get_nowait())
+                            except queue.Empty:
+                                break
+                        self.wfile.write("".join(parts).encode("utf-8"))
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                finally:
+                    subscription.close()
+
+        return Handler
@@ -0,0 +1,120 @@
+"""Debug panel showing live terminal engine metrics."""
+
+import tracemalloc
+
+import customtkinter as ctk
+
+from .metrics import METRICS, top_allocations
+
+
+def _fmt_bytes(n: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(n) < 1024:
+            return f"{n:.0f}{unit}" if unit == "B" else f"{n:.1f}{unit}"
+        n /= 1024
+    return f"{n:.1f}TB"
+
+
+class DebugPanel(ctk.CTkToplevel):
+    """Toggleable window with per-tab throughput, queue and timing stats."""
+
+    REFRESH_MS = 1000
+
+    def __init__(self, master, **kwargs):
+        super().__init__(master, **kwargs)
+        self.title("Terminal Manager - Debug")
+        self.geometry("900x420")
+
+        bar = ctk.CTkFrame(self, fg_color="transparent")
+        bar.pack(fill="x", padx=8, pady=(8, 0))
+
+        self.summary_label = ctk.CTkLabel(bar, text="", font=("Consolas", 12))
+        self.summary_label.pack(side="left")
+
+        self.snapshot_btn = ctk.CTkButton(
+            bar,
+            text="📸 Memory Snapshot",
+            width=140,
+            height=24,
+            command=self._show_allocations
+        )
+        self.snapshot_btn.pack(side="right", padx=2)
+
+        self.trace_btn = ctk.CTkButton(
+            bar,
+            text="",
+            width=120,
+            height=24,
+            command=self._toggle_tracemalloc
+        )
+        self.trace_btn.pack(side="right", padx=2)
+
+        self.table = ctk.CTkTextbox(
+            self,
+            font=("Consolas", 11),
+            fg_color="#1a1a1a",
+            text_color="#e0e0e0",
+            wrap="none"
+        )
+        self.table.pack(fill="both", expand=True, padx=8, pady=8)
+
+        self._allocations = []
+        self._refresh()
+
+    def _toggle_tracemalloc(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+            self._allocations = []
+        else:
+            tracemalloc.start()
+        self._refresh(reschedule=False)
+
+    def _show_allocations(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._allocations = top_allocations()
+        self._refresh(reschedule=False)
+
+    def _render(self, snapshot: dict) -> str:
+        header = (
+            f"{'Tab':<20} {'bytes/s':>9} {'lines/s':>9} {'lines':>10} {'folded':>9} {'queue':>7} {'q max':>7} "
+            f"{'drain p50':>10} {'drain p99':>10} {'insert p99':>11} {'insert max':>11}"
+        )
+        rows = [header, "-" * len(header)]
+        # Busiest tabs first so the culprit is at the top
+        for tab in sorted(snapshot["tabs"], key=lambda t: t["lines_in_per_sec"], reverse=True):
+            drain, insert = tab["drain_time"], tab["insert_time"]
+            rows.append(
+                f"{tab['name'][:20]:<20} {_fmt_bytes(tab['bytes_in_per_sec']):>9} "
+                f"{tab['lines_in_per_sec']:>9.0f} {tab['lines_in_total']:>10} {tab['lines_folded_total']:>9} "
+                f"{tab['queue_depth']:>7} {tab['max_queue_depth']:>7} "
+                f"{drain['p50_ms']:>8}ms {drain['p99_ms']:>8}ms "
+                f"{insert['p99_ms']:>9}ms {insert['max_ms']:>9}ms"
+            )
+        if self._allocations:
+            rows += ["", "Top allocations:"]
+            for item in self._allocations:
+                rows.append(f"  {_fmt_bytes(item['size_bytes']):>9} {item['count']:>8}x  {item['where']}")
+        return "\n".join(rows) + "\n"
+
+    def _refresh(self, reschedule: bool = True):
+        if not self.winfo_exists():
+            return
+        snapshot = METRICS.snapshot()
+        memory = snapshot["memory"]
+        summary = f"Threads: {snapshot['threads']}   Tabs: {len(snapshot['tabs'])}"
+        if memory["tracing"]:
+            summary += (
+                f"   Traced: {_fmt_bytes(memory['traced_bytes'])}"
+                f" (peak {_fmt_bytes(memory['traced_peak_bytes'])})"
+            )
+        self.summary_label.configure(text=summary)
+        self.trace_btn.configure(text="⏹ Stop Tracing" if memory["tracing"] else "▶️ Trace Memory")
+
+        self.table.configure(state="normal")
+        self.table.delete("1.0", "end")
+        self.table.insert("end", self._render(snapshot))
+        self.table.configure(state="disabled")
+
+        if reschedule:
+            self.after(self.REFRESH_MS, self._refresh)
@@ -0,0 +1,173 @@
+"""Detached runs: commands that survive an app restart and are re-adopted by their tabs."""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from typing import Optional
+
+from .config import ROOT_DIR
+from .launcher import prepare_launch
+from .limits import make_preexec, priority_creationflags
+
+RUNS_DIR = ROOT_DIR / "runs"
+REGISTRY_FILE = RUNS_DIR / "registry.json"
+
+_registry_lock = threading.Lock()
+
+
+def supported() -> bool:
+    """The supervisor is started with this interpreter, which a frozen build doesn't have."""
+    return not getattr(sys, "frozen", False)
+
+
+def _pid_alive(pid: int, run_id: str) -> bool:
+    if os.name == "nt":
+        import ctypes
+        handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        code = ctypes.c_ulong()
+        ctypes.windll.kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+        ctypes.windll.kernel32.CloseHandle(handle)
+        return code.value == 259  # STILL_ACTIVE
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    try:
+        # Guard against the pid having been reused since (e.g. after a reboot)
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return run_id.encode() in f.read()
+    except OSError:
+        return True  # No /proc (macOS): trust the pid
+
+
+class DetachedRun:
+    """A command running under src.supervisor, with output in a log file."""
+
+    stdin = None  # No input: the command reads from /dev/null
+
+    def __init__(self, entry: dict, popen: Optional[subprocess.Popen] = None):
+        self.entry = entry
+        self.run_id = entry["run_id"]
+        self.pid = entry["pid"]
+        self.dir = RUNS_DIR / self.run_id
+        self.log_path = self.dir / "output.log"
+        self.offset = 0       # Bytes of the log already read
+        self.shown_offset = 0  # Bytes of the log already on screen (saved with the session)
+        self._popen = popen   # Only for runs started by this app instance
+
+    def is_alive(self) -> bool:
+        if self._popen is not None:
+            return self._popen.poll() is None  # Also reaps the exited supervisor
+        return _pid_alive(self.pid, self.run_id)
+
+    def result(self) -> Optional[dict]:
+        """exit_code, ended, cpu and peak_kb once the supervisor recorded them."""
+        try:
+            with open(self.dir / "exit.json", "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def forget(self):
+        """Drop the run from the registry and delete its files.
+
+        While the supervisor is still up (e.g. its command is handling a stop
+        signal) it has yet to write exit.json, so the entry is only marked
+        closed and the files are deleted once it is done.
+        """
+        if self.result() is not None or not self.is_alive():
+            self._remove()
+            return
+        _update_registry(lambda runs: runs.get(self.run_id, {}).__setitem__("closed", True))
+        threading.Thread(target=self._remove_when_done, daemon=True).start()
+
+    def _remove_when_done(self):
+        while self.result() is None and self.is_alive():
+            time.sleep(0.5)
+        self._remove()
+
+    def _remove(self):
+        _update_registry(lambda runs: runs.pop(self.run_id, None))
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+def start_detached(command: str, cwd: Optional[str], name: str, limits: dict = None) -> DetachedRun:
+    """Start a command under a supervisor and add it to the registry."""
+    run_id = uuid.uuid4().hex[:12]
+    run_dir = RUNS_DIR / run_id
+    run_dir.mkdir(parents=True)
+    args, shell, env = prepare_launch(command, cwd)
+    with open(run_dir / "spec.json", "w", encoding="utf-8") as f:
+        # The environment is inherited from the supervisor, not written to disk
+        json.dump({"args": args, "shell": shell, "cwd": cwd}, f)
+    open(run_dir / "output.log", "wb").close()
+    flags = subprocess.CREATE_NO_WINDOW | subprocess.CREATE_NEW_PROCESS_GROUP if os.name == "nt" else 0
+    popen = subprocess.Popen(
+        [sys.executable, "-m", "src.supervisor", str(run_dir)],
+        cwd=ROOT_DIR,
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=os.name != "nt",
+        preexec_fn=make_preexec(limits),
+        creationflags=flags | priority_creationflags(limits or {})
+    )
+    entry = {
+        "run_id": run_id,
+        "pid": popen.pid,
+        "command": command,
+        "cwd": cwd,
+        "name": name,
+        "started": time.time(),
+    }
+    _update_registry(lambda runs: runs.__setitem__(run_id, entry))
+    return DetachedRun(entry, popen)
+
+
+def remove_stale_dirs(runs: dict):
+    """Delete run folders no registry entry refers to.
+
+    Runs whose tab was closed are taken out of ``runs`` and forgotten again.
+    """
+    for run_id, entry in list(runs.items()):
+        if entry.get("closed"):
+            DetachedRun(runs.pop(run_id)).forget()
+    if not RUNS_DIR.is_dir():
+        return
+    for path in RUNS_DIR.iterdir():
+        if path.is_dir() and path.name not in runs:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def load_registry() -> dict:
+    """run_id -> entry for every run not yet collected by a tab."""
+    try:
+        with open(REGISTRY_FILE, "r", encoding="utf-8") as f:
+            return json.load(f).get("runs", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def _update_registry(change):
+    """Apply ``change(runs)`` and write the registry atomically."""
+    with _registry_lock:
+        runs = load_registry()
+        change(runs)
+        tmp = REGISTRY_FILE.with_suffix(".tmp")
+        try:
+            RUNS_DIR.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"runs": runs}, f, indent=2)
+            os.replace(tmp, REGISTRY_FILE)
+        except OSError as e:
+            print(f"Error saving run registry: {e}")
@@ -0,0 +1,139 @@
+"""Run one command across several projects with a bounded worker pool."""
+
+import os
+import signal
+import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from .ansi import strip_ansi
+from .launcher import prepare_launch
+from .limits import make_preexec, priority_creationflags, resolve_limits
+
+
+class FanOutRun:
+    """One command fanned out to many project folders.
+
+    At most ``max_workers`` projects run at once. Each project's output is
+    kept (last ``keep_lines`` lines) and ``on_update(project)`` is called
+    from a worker thread whenever a project changes state.
+    """
+
+    def __init__(self, command: str, projects: list, max_workers: int = 4,
+                 keep_lines: int = 5000, on_update: Callable = None):
+        self.command = command
+        self.projects = list(dict.fromkeys(projects))
+        self.max_workers = max(1, max_workers)
+        self.on_update = on_update
+        self.results = {
+            path: {
+                "project": path,
+                "status": "queued",
+                "exit_code": None,
+                "started": None,
+                "duration": None,
+                "output": deque(maxlen=keep_lines),
+            }
+            for path in self.projects
+        }
+        self.cancelled = False
+        self._processes: dict = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def start(self):
+        self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="fanout")
+        for path in self.projects:
+            self._executor.submit(self._run_one, path)
+        self._executor.shutdown(wait=False)
+
+    def cancel(self):
+        """Skip queued projects and stop the running ones."""
+        self.cancelled = True
+        with self._lock:
+            processes = list(self._processes.values())
+        for process in processes:
+            try:
+                if os.name == "nt":
+                    subprocess.run(
+                        f"taskkill /PID {process.pid} /T /F",
+                        shell=True,
+                        creationflags=subprocess.CREATE_NO_WINDOW
+                    )
+                else:
+                    os.killpg(process.pid, signal.SIGTERM)
+            except OSError:
+                pass
+
+    def is_done(self) -> bool:
+        return all(r["status"] not in ("queued", "running") for r in self.results.values())
+
+    def _notify(self, path: str):
+        if self.on_update:
+            try:
+                self.on_update(path)
+            except Exception:
+                pass
+
+    def _run_one(self, path: str):
+        result = self.results[path]
+        limits = resolve_limits(self.command)
+        if self.cancelled:
+            result["status"] = "cancelled"
+            self._notify(path)
+            return
+        result["status"] = "running"
+        start = result["started"] = time.monotonic()
+        self._notify(path)
+        try:
+            args, shell, env = prepare_launch(self.command, path)
+            process = subprocess.Popen(
+                args,
+                shell=shell,
+                env=env,
+                cwd=path,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                stdin=subprocess.DEVNULL,  # Nobody can answer a prompt here
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                start_new_session=os.name != "nt",
+                preexec_fn=make_preexec(limits),
+                creationflags=(subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0) | priority_creationflags(limits)
+            )
+            with self._lock:
+                self._processes[path] = process
+            for line in process.stdout:
+                result["output"].append(line)
+            process.wait()
+            result["exit_code"] = process.returncode
+            if self.cancelled and process.returncode != 0:
+                status = "cancelled"
+            else:
+                status = "ok" if process.returncode == 0 else "failed"
+        except Exception as e:
+            result["output"].append(f"[Error starting process: {e}]\n")
+            status = "failed"
+        finally:
+            with self._lock:
+                self._processes.pop(path, None)
+            result["duration"] = time.monotonic() - start
+        result["status"] = status
+        self._notify(path)
+
+
+def failure_snippet(result: dict, lines: int = 5) -> list:
+    """Last non-blank output lines of a project, without color codes."""
+    tail = []
+    # Copy first: a worker may still be appending
+    for line in reversed(list(result["output"])):
+        line = strip_ansi(line).rstrip()
+        if line:
+            tail.append(line)
+            if len(tail) >= lines:
+                break
+    return tail[::-1]
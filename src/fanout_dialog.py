@@ -0,0 +1,196 @@
+"""Dialog for running one command in several projects at once."""
+
+import os
+import time
+from typing import Callable
+
+import customtkinter as ctk
+
+from .config import get_setting
+from .fanout import FanOutRun, failure_snippet
+
+STATUS_LABELS = {
+    "queued": "… queued",
+    "running": "● running",
+    "ok": "✓ ok",
+    "failed": "✗ failed",
+    "cancelled": "■ cancelled",
+}
+
+
+class FanOutDialog(ctk.CTkToplevel):
+    """Pick projects, run a command in all of them, and show a summary table."""
+
+    REFRESH_MS = 250
+
+    def __init__(self, master, projects: list, command: str = "", open_output: Callable = None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.title("Terminal Manager - Run in Projects")
+        self.geometry("900x600")
+        self.open_output = open_output    # (title, text) shows captured output in a tab
+        self.groups = get_setting("project_groups") or {}
+        self.run = None
+        self._refresh_pending = False
+
+        # Candidates: recent projects plus every project in a group
+        candidates = list(projects)
+        for paths in self.groups.values():
+            candidates += [p for p in paths if os.path.isdir(p)]
+        self.candidates = list(dict.fromkeys(candidates))
+
+        bar = ctk.CTkFrame(self, fg_color="transparent")
+        bar.pack(fill="x", padx=8, pady=(8, 0))
+
+        self.cmd_entry = ctk.CTkEntry(bar, placeholder_text="Command to run in each project...", height=32)
+        self.cmd_entry.pack(side="left", fill="x", expand=True, padx=(0, 5))
+        if command:
+            self.cmd_entry.insert(0, command)
+
+        self.workers_menu = ctk.CTkOptionMenu(bar, values=["1", "2", "4", "8", "16"], width=70, height=32)
+        self.workers_menu.set(str(get_setting("fanout_concurrency")))
+        self.workers_menu.pack(side="left", padx=2)
+
+        self.run_btn = ctk.CTkButton(bar, text="▶️ Run", width=80, height=32, command=self._on_run_click)
+        self.run_btn.pack(side="left", padx=2)
+
+        select_bar = ctk.CTkFrame(self, fg_color="transparent")
+        select_bar.pack(fill="x", padx=8, pady=(8, 0))
+
+        ctk.CTkLabel(select_bar, text="Select:").pack(side="left")
+        self.group_menu = ctk.CTkOptionMenu(
+            select_bar,
+            values=["All", "None", *self.groups],
+            command=self._select_group,
+            width=140,
+            height=24
+        )
+        self.group_menu.set("All")
+        self.group_menu.pack(side="left", padx=5)
+
+        self.output_menu = ctk.CTkOptionMenu(
+            select_bar,
+            values=["📄 Open output..."],
+            command=self._open_project_output,
+            width=200,
+            height=24
+        )
+        self.output_menu.set("📄 Open output...")
+        self.output_menu.pack(side="right")
+
+        self.project_list = ctk.CTkScrollableFrame(self, height=150)
+        self.project_list.pack(fill="x", padx=8, pady=8)
+        self.checkboxes = {}
+        for path in self.candidates:
+            box = ctk.CTkCheckBox(self.project_list, text=f"{os.path.basename(path)}   {path}")
+            box.select()
+            box.pack(anchor="w", pady=1)
+            self.checkboxes[path] = box
+
+        self.table = ctk.CTkTextbox(
+            self,
+            font=("Consolas", 11),
+            fg_color="#1a1a1a",
+            text_color="#e0e0e0",
+            wrap="none"
+        )
+        self.table.pack(fill="both", expand=True, padx=8, pady=(0, 8))
+        self.table.configure(state="disabled")
+
+    def _select_group(self, choice: str):
+        members = set(self.groups.get(choice, []))
+        for path, box in self.checkboxes.items():
+            if choice == "All" or path in members:
+                box.select()
+            else:
+                box.deselect()
+
+    def _selected_projects(self) -> list:
+        return [path for path, box in self.checkboxes.items() if box.get()]
+
+    def _on_run_click(self):
+        if self.run and not self.run.is_done():
+            self.run.cancel()
+            return
+        command = self.cmd_entry.get().strip()
+        projects = self._selected_projects()
+        if not command or not projects:
+            self._show("Enter a command and select at least one project.\n")
+            return
+        self.run = FanOutRun(
+            command,
+            projects,
+            max_workers=int(self.workers_menu.get()),
+            keep_lines=get_setting("fanout_keep_lines"),
+            on_update=self._on_update
+        )
+        self.run.start()
+        self.run_btn.configure(text="⏹ Cancel")
+        self.output_menu.configure(values=[os.path.basename(p) for p in projects])
+        self._refresh()
+
+    def _on_update(self, project: str):
+        """Called from worker threads: coalesce into one refresh on the Tk thread."""
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            try:
+                self.after(self.REFRESH_MS, self._refresh)
+            except Exception:
+                pass
+
+    def _render(self) -> str:
+        results = [self.run.results[p] for p in self.run.projects]
+        width = max([len(os.path.basename(p)) for p in self.run.projects] + [7])
+        header = f"{'Project':<{width}}  {'Status':<12} {'Exit':>5} {'Time':>8}  Last output"
+        rows = [f"$ {self.run.command}", "", header, "-" * (len(header) + 20)]
+        for result in results:
+            if result["duration"] is not None:
+                duration = f"{result['duration']:.1f}s"
+            elif result["started"] is not None:
+                duration = f"{time.monotonic() - result['started']:.1f}s"
+            else:
+                duration = ""
+            exit_code = "" if result["exit_code"] is None else str(result["exit_code"])
+            last = failure_snippet(result, 1)
+            rows.append(
+                f"{os.path.basename(result['project']):<{width}}  {STATUS_LABELS[result['status']]:<12} "
+                f"{exit_code:>5} {duration:>8}  {last[0][:80] if last else ''}"
+            )
+        done = sum(1 for r in results if r["status"] not in ("queued", "running"))
+        failed = [r for r in results if r["status"] == "failed"]
+        rows += ["", f"{done}/{len(results)} done, {len(failed)} failed"]
+        for result in failed:
+            rows += ["", f"✗ {result['project']} (exit {result['exit_code']}):"]
+            rows += [f"    {line}" for line in failure_snippet(result)]
+        return "\n".join(rows) + "\n"
+
+    def _refresh(self):
+        self._refresh_pending = False
+        if not self.winfo_exists() or not self.run:
+            return
+        self._show(self._render())
+        if self.run.is_done():
+            self.run_btn.configure(text="▶️ Run")
+        else:
+            # Keep durations of running projects ticking
+            self._on_update(None)
+
+    def _show(self, text: str):
+        self.table.configure(state="normal")
+        self.table.delete("1.0", "end")
+        self.table.insert("end", text)
+        self.table.configure(state="disabled")
+
+    def destroy(self):
+        """Closing the dialog stops whatever is still running."""
+        if self.run and not self.run.is_done():
+            self.run.cancel()
+        super().destroy()
+
+    def _open_project_output(self, choice: str):
+        if not self.run or not self.open_output:
+            return
+        for path in self.run.projects:
+            if os.path.basename(path) == choice:
+                result = self.run.results[path]
+                self.open_output(choice, f"$ {self.run.command}   ({path})\n" + "".join(result["output"]))
+                break
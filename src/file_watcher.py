@@ -0,0 +1,330 @@
+"""File watching for auto-restarting tabs (inotify with stat polling fallback)."""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import re
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Optional
+
+
+# inotify event masks (see <sys/inotify.h>)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+)
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+DEFAULT_IGNORE = ["node_modules", "dist", "build", ".git", "__pycache__", ".venv", "venv"]
+
+
+def glob_to_regex(pattern: str) -> "re.Pattern":
+    """Compile a glob supporting ``**`` into a regex matching posix relative paths."""
+    pattern = pattern.strip().replace("\\", "/")
+    if pattern.startswith("./"):
+        pattern = pattern[2:]
+    i, out = 0, []
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(out) + r"\Z")
+
+
+class PathFilter:
+    """Include/ignore glob matching on paths relative to the watch root.
+
+    Ignore patterns without a slash (e.g. ``node_modules``) match any path
+    component, so whole subtrees are pruned without being walked.
+    """
+
+    def __init__(self, include: list = None, ignore: list = None):
+        include = [p for p in (include or []) if p.strip()] or ["**"]
+        self.include = [glob_to_regex(p) for p in include]
+        # (fixed leading parts, part count or None for "**") of each include glob
+        self._include_dirs = []
+        for p in include:
+            parts = p.strip().replace("\\", "/").removeprefix("./").split("/")
+            fixed = []
+            for part in parts:
+                if "*" in part or "?" in part:
+                    break
+                fixed.append(part)
+            self._include_dirs.append((fixed, None if "**" in p else len(parts)))
+        self.ignore_names = []
+        self.ignore_paths = []
+        for p in ignore or []:
+            p = p.strip().rstrip("/")
+            if not p:
+                continue
+            if "/" in p:
+                self.ignore_paths.append(glob_to_regex(p))
+            else:
+                self.ignore_names.append(glob_to_regex(p))
+
+    def is_ignored(self, rel: str) -> bool:
+        """Check if a relative path (file or directory) is ignored."""
+        if any(rx.match(part) for part in rel.split("/") for rx in self.ignore_names):
+            return True
+        return any(rx.match(rel) for rx in self.ignore_paths)
+
+    def matches(self, rel: str) -> bool:
+        """Check if a changed file should trigger a restart."""
+        if not rel or self.is_ignored(rel):
+            return False
+        return any(rx.match(rel) for rx in self.include)
+
+    def may_contain(self, rel: str) -> bool:
+        """Check if files under a directory could match an include glob."""
+        if not rel or self.is_ignored(rel):
+            return False
+        parts = rel.split("/")
+        for fixed, depth in self._include_dirs:
+            if fixed[:len(parts)] != parts[:len(fixed)]:
+                continue  # Diverges from the glob's fixed prefix (e.g. docs/ for src/**)
+            if depth is None or depth > len(parts):
+                return True
+        return False
+
+
+def _load_inotify():
+    """Load libc inotify functions, or None if unavailable."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class FileWatcher:
+    """Watch a directory tree and call ``on_change`` after a burst of changes settles.
+
+    Uses one inotify watch per directory (never per file) and prunes ignored
+    directories before descending. Falls back to stat polling when inotify
+    is unavailable or the kernel watch limit is exhausted.
+    """
+
+    def __init__(self, root: str, on_change: Callable, include: list = None,
+                 ignore: list = None, debounce: float = 0.3, poll_interval: float = 1.0,
+                 use_inotify: bool = True):
+        self.root = os.path.abspath(root)
+        self.on_change = on_change
+        self.filter = PathFilter(include, DEFAULT_IGNORE if ignore is None else ignore)
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.mode = None
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._libc = None
+        self._fd = -1
+        self._wd_paths: dict[int, str] = {}
+
+    def start(self):
+        """Start the watcher thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the watcher thread and release kernel watches."""
+        self._stop.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+        self._thread = None
+
+    def _rel(self, path: str) -> str:
+        rel = os.path.relpath(path, self.root)
+        return "" if rel == "." else rel.replace(os.sep, "/")
+
+    def _walk_dirs(self, top: str):
+        """Yield non-ignored directories under top, pruning ignored subtrees."""
+        for dirpath, dirnames, _ in os.walk(top):
+            dirnames[:] = [
+                d for d in dirnames
+                if not self.filter.is_ignored(self._rel(os.path.join(dirpath, d)))
+            ]
+            yield dirpath
+
+    def _run(self):
+        """Thread entry point: pick a backend and run it until stopped."""
+        try:
+            if self.use_inotify and self._init_inotify():
+                self.mode = "inotify"
+                try:
+                    self._inotify_loop()
+                finally:
+                    os.close(self._fd)
+                    self._fd = -1
+                    self._wd_paths.clear()
+                if self._stop.is_set():
+                    return
+            self.mode = "poll"
+            self._poll_loop()
+        except Exception as e:
+            print(f"File watcher error ({self.root}): {e}")
+
+    # --- inotify backend ---
+
+    def _init_inotify(self) -> bool:
+        self._libc = _load_inotify()
+        if not self._libc:
+            return False
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            return False
+        for path in self._walk_dirs(self.root):
+            if not self._add_watch(path):
+                os.close(self._fd)
+                self._fd = -1
+                self._wd_paths.clear()
+                return False
+        return True
+
+    def _add_watch(self, path: str) -> bool:
+        """Add a watch for one directory. Returns False when the watch limit is hit."""
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                print(f"inotify watch limit reached under {self.root}, falling back to polling")
+                return False
+            return True  # Directory vanished or is unreadable; skip it
+        self._wd_paths[wd] = path
+        return True
+
+    def _read_events(self) -> bool:
+        """Drain pending inotify events. Returns True if a relevant change was seen."""
+        changed = False
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                changed = True
+                continue
+            if mask & IN_IGNORED:
+                self._wd_paths.pop(wd, None)
+                continue
+            parent = self._wd_paths.get(wd)
+            if parent is None:
+                continue
+            path = os.path.join(parent, os.fsdecode(name)) if name else parent
+            rel = self._rel(path)
+
+            if mask & IN_ISDIR:
+                if self.filter.is_ignored(rel):
+                    continue
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    for sub in self._walk_dirs(path):
+                        if not self._add_watch(sub):
+                            raise OverflowError("inotify watch limit reached")
+                # A moved or deleted folder's files get no events of their own
+                if self.filter.matches(rel) or self.filter.may_contain(rel):
+                    changed = True
+            elif self.filter.matches(rel):
+                changed = True
+        return changed
+
+    def _inotify_loop(self):
+        deadline = None
+        while not self._stop.is_set():
+            timeout = 0.5 if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self._fd], [], [], timeout)
+            if ready:
+                try:
+                    if self._read_events():
+                        deadline = time.monotonic() + self.debounce
+                except OverflowError:
+                    return  # Caller switches to polling
+            if deadline is not None and time.monotonic() >= deadline:
+                deadline = None
+                self._fire()
+
+    # --- polling backend ---
+
+    def _snapshot(self) -> dict:
+        """Stat every included file under non-ignored directories."""
+        snap = {}
+        for dirpath in self._walk_dirs(self.root):
+            try:
+                entries = list(os.scandir(dirpath))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    rel = self._rel(entry.path)
+                    if self.filter.matches(rel):
+                        st = entry.stat(follow_symlinks=False)
+                        snap[rel] = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    continue
+        return snap
+
+    def _poll_loop(self):
+        previous = self._snapshot()
+        pending = False
+        while not self._stop.wait(self.poll_interval):
+            current = self._snapshot()
+            if current != previous:
+                # Wait for one quiet interval so a burst restarts only once
+                previous = current
+                pending = True
+            elif pending:
+                pending = False
+                self._fire()
+
+    def _fire(self):
+        try:
+            self.on_change()
+        except Exception as e:
+            print(f"File watcher callback error: {e}")
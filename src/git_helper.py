@@ -2,6 +2,7 @@
 
 import subprocess
 import os
+from typing import Optional
 
 
 def get_git_branch(cwd: str) -> str:
@@ -41,3 +42,118 @@ def get_commit_command(message: str) -> str:
     # Escape quotes in message
     escaped_message = message.replace('"', '\\"')
     return f'git add . && git commit -m "{escaped_message}"'
+
+
+def get_git_dir(cwd: str) -> str:
+    """Absolute path of the repository's git directory ("" if not a repo)."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--absolute-git-dir"],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+        )
+        if result.returncode == 0:
+            return result.stdout.strip()
+    except Exception:
+        pass
+    return ""
+
+
+def git_dir_signature(git_dir: str, upstream: str = "") -> tuple:
+    """Stat of the index, HEAD and refs: changes when staging, committing, fetching or pushing."""
+    names = ["index", "HEAD", "logs/HEAD", "FETCH_HEAD", "packed-refs"]
+    if upstream:
+        names.append(f"refs/remotes/{upstream}")
+    signature = []
+    for name in names:
+        try:
+            st = os.stat(os.path.join(git_dir, name))
+            signature.append((name, st.st_mtime_ns, st.st_size))
+        except OSError:
+            pass
+    return tuple(signature)
+
+
+def _empty_status() -> dict:
+    return {
+        "branch": "",
+        "upstream": "",
+        "ahead": 0,
+        "behind": 0,
+        "staged": [],
+        "changed": [],
+        "untracked": [],
+        "conflicts": [],
+        "counts": {"staged": 0, "changed": 0, "untracked": 0, "conflicts": 0},
+    }
+
+
+def parse_status_v2(chunks, limit: int = 1000) -> dict:
+    """Parse ``git status --porcelain=v2 -z --branch`` output incrementally.
+
+    ``chunks`` yields bytes as they are read. Every entry is counted but
+    only the first ``limit`` of each kind are kept, so huge trees don't
+    cost memory proportional to their size.
+    """
+    status = _empty_status()
+    counts = status["counts"]
+
+    def add(kind: str, entry: tuple):
+        counts[kind] += 1
+        if counts[kind] <= limit:
+            status[kind].append(entry)
+
+    pending = b""
+    skip_orig_path = False
+    for chunk in chunks:
+        records = (pending + chunk).split(b"\0")
+        pending = records.pop()  # Incomplete record, finished by the next chunk
+        for raw in records:
+            if skip_orig_path:
+                # Rename/copy entries carry the original path as an extra field
+                skip_orig_path = False
+                continue
+            record = raw.decode("utf-8", "surrogateescape")
+            kind = record[:2]
+            if kind == "# ":
+                key, _, value = record[2:].partition(" ")
+                if key == "branch.head":
+                    status["branch"] = value
+                elif key == "branch.upstream":
+                    status["upstream"] = value
+                elif key == "branch.ab":
+                    ahead, behind = value.split()
+                    status["ahead"], status["behind"] = int(ahead), abs(int(behind))
+            elif kind in ("1 ", "2 "):
+                fields = record.split(" ", 8 if kind == "1 " else 9)
+                xy, path = fields[1], fields[-1]
+                if xy[0] != ".":
+                    add("staged", (xy[0], path))
+                if xy[1] != ".":
+                    add("changed", (xy[1], path))
+                skip_orig_path = kind == "2 "
+            elif kind == "u ":
+                add("conflicts", (record[2:4], record.split(" ", 10)[-1]))
+            elif kind == "? ":
+                add("untracked", ("?", record[2:]))
+    return status
+
+
+def get_git_status(cwd: str, limit: int = 1000) -> Optional[dict]:
+    """Working tree status of a repo, streamed from git (None if it fails)."""
+    try:
+        process = subprocess.Popen(
+            # No optional locks: don't rewrite the index (which would look like a change)
+            ["git", "--no-optional-locks", "status", "--porcelain=v2", "-z", "--branch"],
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+        )
+    except Exception:
+        return None
+    with process:
+        status = parse_status_v2(iter(lambda: process.stdout.read(65536), b""), limit)
+    return status if process.returncode == 0 else None
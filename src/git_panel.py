@@ -0,0 +1,188 @@
+"""Sidebar panel with the current project's git working tree status."""
+
+import threading
+from typing import Optional
+
+import customtkinter as ctk
+
+from .config import get_setting
+from .file_watcher import FileWatcher
+from .git_helper import get_git_dir, get_git_status, git_dir_signature
+
+SECTIONS = (
+    ("conflicts", "Conflicts"),
+    ("staged", "Staged"),
+    ("changed", "Changed"),
+    ("untracked", "Untracked"),
+)
+
+
+class GitStatusPanel(ctk.CTkFrame):
+    """Changed/staged/untracked files and ahead/behind counts.
+
+    ``git status`` runs on a worker thread and only when something changed:
+    the working tree (via FileWatcher) or the git directory (index, HEAD,
+    refs; checked by stat once a second). The last result is cached.
+    """
+
+    CHECK_MS = 1000
+    SHOW_PER_SECTION = 200
+
+    def __init__(self, master, **kwargs):
+        super().__init__(master, fg_color="transparent", **kwargs)
+        self.project: Optional[str] = None
+        self.status: Optional[dict] = None
+        self._git_dir = ""
+        self._signature = None
+        self._dirty = False
+        self._refreshing = False
+        self._watcher: Optional[FileWatcher] = None
+
+        header = ctk.CTkFrame(self, fg_color="transparent")
+        header.pack(fill="x")
+        self.title_label = ctk.CTkLabel(
+            header,
+            text="🔀 Changes",
+            font=ctk.CTkFont(size=13, weight="bold")
+        )
+        self.title_label.pack(side="left")
+        self.refresh_btn = ctk.CTkButton(
+            header,
+            text="⟳",
+            width=28,
+            height=22,
+            fg_color="transparent",
+            border_width=1,
+            command=self.refresh
+        )
+        self.refresh_btn.pack(side="right")
+
+        self.list = ctk.CTkTextbox(
+            self,
+            height=150,
+            font=("Consolas", 10),
+            fg_color="#1a1a1a",
+            text_color="#e0e0e0",
+            wrap="none"
+        )
+        self.list.pack(fill="x", pady=(4, 0))
+        self.list.configure(state="disabled")
+
+        self._check()
+
+    def set_project(self, path: Optional[str]):
+        """Track a new project (None or a non-repo path clears the panel)."""
+        if self._watcher:
+            self._watcher.stop()
+            self._watcher = None
+        self.project = path
+        self.status = None
+        self._signature = None
+        self._git_dir = get_git_dir(path) if path else ""
+        if not self._git_dir:
+            self.project = None
+            self._show("Not a git repository\n")
+            return
+        self._watcher = FileWatcher(
+            path,
+            on_change=self._on_tree_change,
+            ignore=get_setting("watch_ignore"),
+            debounce=get_setting("watch_debounce_ms") / 1000,
+            poll_interval=5.0  # Polling fallback walks the tree: keep it rare
+        )
+        self._watcher.start()
+        self._show("Loading…\n")
+        self.refresh()
+
+    def stop(self):
+        if self._watcher:
+            self._watcher.stop()
+            self._watcher = None
+
+    def _on_tree_change(self):
+        self._dirty = True  # Picked up by the next _check on the Tk thread
+
+    def _check(self):
+        """Refresh when the tree or git directory changed since the last run."""
+        if not self.winfo_exists():
+            return
+        if self.project and not self._refreshing:
+            upstream = self.status["upstream"] if self.status else ""
+            signature = git_dir_signature(self._git_dir, upstream)
+            if self._dirty or signature != self._signature:
+                self.refresh()
+        self.after(self.CHECK_MS, self._check)
+
+    def refresh(self):
+        """Re-run git status in the background (no-op while one is running)."""
+        if not self.project or self._refreshing:
+            return
+        self._dirty = False
+        self._refreshing = True
+        project = self.project
+        upstream = self.status["upstream"] if self.status else ""
+        # Taken before running so changes made during the run trigger another
+        self._signature = git_dir_signature(self._git_dir, upstream)
+        threading.Thread(target=self._refresh_worker, args=(project,), daemon=True).start()
+
+    def _refresh_worker(self, project: str):
+        status = get_git_status(project)
+        try:
+            self.after(0, lambda: self._on_status(project, status))
+        except Exception:
+            pass
+
+    def _on_status(self, project: str, status: Optional[dict]):
+        self._refreshing = False
+        if project != self.project or not self.winfo_exists():
+            return  # Project switched while git was running
+        if status is None:
+            self._show("git status failed\n")
+            return
+        if not self.status or status["upstream"] != self.status["upstream"]:
+            self._signature = None  # Now also watch the upstream ref
+        self.status = status
+        self._show(self._render(status))
+
+    def _render(self, status: dict) -> str:
+        counts = status["counts"]
+        branch = status["branch"] or "?"
+        sync = f"  ↑{status['ahead']} ↓{status['behind']}" if status["upstream"] else ""
+        self.title_label.configure(text=f"🔀 {branch}{sync}")
+        if not any(counts.values()):
+            return "Working tree clean\n"
+        lines = []
+        for key, title in SECTIONS:
+            if not counts[key]:
+                continue
+            lines.append(f"{title} ({counts[key]:,})")
+            for code, path in status[key][:self.SHOW_PER_SECTION]:
+                lines.append(f"  {code:<2} {path}")
+            if counts[key] > self.SHOW_PER_SECTION:
+                lines.append(f"  … {counts[key] - self.SHOW_PER_SECTION:,} more")
+        return "\n".join(lines) + "\n"
+
+    def _show(self, text: str):
+        self.list.configure(state="normal")
+        self.list.delete("1.0", "end")
+        self.list.insert("end", text)
+        self.list.configure(state="disabled")
+
+    def commit_summary(self, limit: int = 10) -> str:
+        """What `git add . && git commit` would include, from the cached status."""
+        status = self.status
+        if not status:
+            return ""
+        counts = status["counts"]
+        files = status["staged"] + status["changed"] + status["untracked"]
+        paths = list(dict.fromkeys(path for _, path in files))
+        total = counts["staged"] + counts["changed"] + counts["untracked"]
+        if not total:
+            return "Nothing to commit."
+        lines = [f"  {path}" for path in paths[:limit]]
+        if total > limit:
+            lines.append(f"  … and more ({total:,} entries)")
+        return (
+            f"Will commit: {counts['staged']} staged, {counts['changed']} changed, "
+            f"{counts['untracked']} untracked\n" + "\n".join(lines)
+        )
@@ -0,0 +1,269 @@
+"""JSON-lines log detection, compact rendering and a per-tab filter index."""
+
+import bisect
+import heapq
+import json
+import re
+import time
+from array import array
+from typing import Optional
+
+from .viewport import LineStore
+
+LEVELS = ("trace", "debug", "info", "warn", "error", "fatal")  # Codes 1..6, 0 = none
+_LEVEL_CODES = {name: i + 1 for i, name in enumerate(LEVELS)}
+_LEVEL_CODES.update({
+    "verbose": 1, "warning": 4, "err": 5, "critical": 6, "crit": 6,
+    "panic": 6, "dpanic": 6, "emergency": 6, "alert": 6,
+})
+LEVEL_KEYS = ("level", "lvl", "severity", "log.level", "levelname")
+TIME_KEYS = ("time", "timestamp", "ts", "@timestamp", "t")
+MESSAGE_KEYS = ("msg", "message", "event", "@message")
+# Consecutive log records needed before a tab switches to the log view, so a
+# printed config dict or a bare {} doesn't
+DETECT_RECORDS = 3
+# Fields worth an inverted index: short scalar values, bounded distinct values per key
+MAX_FIELD_VALUE_LEN = 64
+MAX_FIELD_VALUES = 256
+# Text that JSON encoders write verbatim (no escapes), so a raw byte search finds it
+_PLAIN = re.compile(r"[A-Za-z0-9_.:@+-]+")
+
+_raw_decode = json.JSONDecoder().raw_decode
+
+
+def parse_json_line(line: str) -> Optional[dict]:
+    """Return the object for a JSON log line, or None (cheap check first)."""
+    text = line.strip()
+    if not (text.startswith("{") and text.endswith("}")):
+        return None
+    try:
+        record, end = _raw_decode(text)
+    except ValueError:
+        return None
+    return record if end == len(text) else None
+
+
+def is_log_record(record: dict) -> bool:
+    """Whether a JSON object looks like a log record (has a time, level or message)."""
+    return any(key in record for keys in (TIME_KEYS, LEVEL_KEYS, MESSAGE_KEYS) for key in keys)
+
+
+def field_text(value) -> str:
+    """A scalar field value as it is written in JSON (strings unquoted)."""
+    if isinstance(value, str):
+        return value
+    if value is None or isinstance(value, bool):
+        return json.dumps(value)
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return json.dumps(value)
+
+
+def _first(record: dict, keys: tuple):
+    for key in keys:
+        if key in record:
+            return key, record[key]
+    return None, None
+
+
+def level_code(record: dict) -> int:
+    _, value = _first(record, LEVEL_KEYS)
+    if isinstance(value, bool) or value is None:
+        return 0
+    if isinstance(value, (int, float)):
+        # pino/bunyan numeric levels: 10 trace ... 60 fatal
+        return min(6, max(1, int(value) // 10)) if value >= 10 else 0
+    return _LEVEL_CODES.get(str(value).lower(), 0)
+
+
+def _format_time(value) -> str:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        seconds = value / 1000 if value > 1e11 else value  # Epoch ms or s
+        return time.strftime("%H:%M:%S", time.localtime(seconds)) + f".{int(seconds * 1000) % 1000:03d}"
+    text = str(value)
+    if "T" in text:
+        text = text.split("T", 1)[1]
+    return text[:12]
+
+
+def format_record(record: dict, max_fields: int = 200) -> str:
+    """Render as compact columns: time, level, message, then other fields."""
+    time_key, ts = _first(record, TIME_KEYS)
+    level_key, _ = _first(record, LEVEL_KEYS)
+    message_key, message = _first(record, MESSAGE_KEYS)
+    code = level_code(record)
+    level = LEVELS[code - 1].upper() if code else ""
+    skip = {time_key, level_key, message_key}
+    extras = " ".join(
+        f"{key}={field_text(value)}"
+        for key, value in record.items() if key not in skip
+    )
+    if len(extras) > max_fields:
+        extras = extras[:max_fields] + "…"
+    columns = [
+        _format_time(ts) if ts is not None else "",
+        f"{level:<5}",
+        "" if message is None else str(message),
+    ]
+    line = " ".join(c for c in columns if c)
+    return f"{line}  {extras}" if extras else line
+
+
+def display_line(line: str, record: Optional[dict]) -> str:
+    """A log record in compact columns; any other line (or JSON object) as is."""
+    return format_record(record) if record is not None and is_log_record(record) else line
+
+
+class LogDetector:
+    """Watches output for DETECT_RECORDS consecutive JSON log records.
+
+    ``partial`` is the incomplete last line seen so far.
+    """
+
+    def __init__(self, needed: int = DETECT_RECORDS):
+        self.needed = needed
+        self.partial = ""
+        self.streak = 0
+
+    def feed(self, text: str) -> bool:
+        """True once enough consecutive complete lines are log records."""
+        lines = (self.partial + text).split("\n")
+        self.partial = lines.pop()
+        for line in lines:
+            if "{" not in line:
+                if line.strip():
+                    self.streak = 0
+                continue
+            record = parse_json_line(line)
+            if record is None or not is_log_record(record):
+                self.streak = 0
+                continue
+            self.streak += 1
+            if self.streak >= self.needed:
+                return True
+        return False
+
+
+class LogIndex:
+    """Retained lines of a tab plus posting lists by level and by field value.
+
+    Lines are parsed once as they arrive; filtering afterwards only walks
+    posting lists (arrays of line numbers), never the text. The oldest lines
+    are dropped past ``max_lines`` or ``max_bytes`` of retained text;
+    ``dropped`` counts them, so ``number + dropped`` stays stable.
+    """
+
+    def __init__(self, max_lines: int = 1_000_000, max_bytes: int = 64 * 1024 * 1024):
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self.clear()
+
+    def clear(self):
+        self.dropped = 0
+        self.lines = LineStore()
+        self.levels = array("B")
+        self.by_level = {code: array("I") for code in range(1, len(LEVELS) + 1)}
+        self.by_field: dict = {}        # key -> {value: array of line numbers}
+        self.unindexed_keys: set = set()  # Keys with too many distinct values
+        self.json_lines = 0
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def add(self, line: str, record: Optional[dict]) -> int:
+        """Store a complete line (and its parsed record, if JSON). Returns its number."""
+        if len(self.levels) >= self.max_lines or self.lines.size() >= self.max_bytes:
+            self._compact()
+        number = len(self.levels)
+        self.lines.append_line(line)
+        code = level_code(record) if record is not None else 0
+        self.levels.append(code)
+        if record is None:
+            return number
+        self.json_lines += 1
+        if code:
+            self.by_level[code].append(number)
+        for key, value in record.items():
+            if key in TIME_KEYS or key in MESSAGE_KEYS or key in self.unindexed_keys:
+                continue
+            if isinstance(value, (dict, list)):
+                continue
+            value = field_text(value)
+            if len(value) > MAX_FIELD_VALUE_LEN:
+                continue
+            values = self.by_field.setdefault(key, {})
+            postings = values.get(value)
+            if postings is None:
+                if len(values) >= MAX_FIELD_VALUES:
+                    # High cardinality (ids, durations): scan instead of indexing
+                    self.unindexed_keys.add(key)
+                    del self.by_field[key]
+                    continue
+                postings = values[value] = array("I")
+            postings.append(number)
+        return number
+
+    def _compact(self):
+        """Drop the oldest 10% of lines, renumbering posting lists without re-parsing."""
+        drop = max(1, len(self.levels) // 10)
+        self.lines.drop_lines(drop)
+        self.levels = self.levels[drop:]
+        self.dropped += drop
+
+        def shift(postings: array) -> array:
+            start = bisect.bisect_left(postings, drop)
+            return array("I", (n - drop for n in postings[start:]))
+
+        self.by_level = {code: shift(p) for code, p in self.by_level.items()}
+        self.by_field = {
+            key: {value: shift(p) for value, p in values.items()}
+            for key, values in self.by_field.items()
+        }
+
+    def matches(self, min_level: int = 0, field: tuple = None) -> list:
+        """Line numbers at or above a level and/or with ``field == (key, value)``, in order."""
+        result = None
+        if min_level:
+            lists = [self.by_level[code] for code in range(min_level, len(LEVELS) + 1)]
+            result = list(heapq.merge(*lists)) if len(lists) > 1 else list(lists[0])
+        if field:
+            key, value = field
+            if key in self.unindexed_keys:
+                candidates = self._candidates(key, value)
+                if result is not None:
+                    wanted = set(result)
+                    candidates = (n for n in candidates if n in wanted)
+                return [n for n in candidates if self._field_equals(n, key, value)]
+            postings = self.by_field.get(key, {}).get(value, array("I"))
+            if result is None:
+                return list(postings)
+            wanted = set(postings)
+            result = [n for n in result if n in wanted]
+        return result if result is not None else list(range(len(self.levels)))
+
+    def _candidates(self, key: str, value: str):
+        """Lines that may hold ``key == value``, to be checked on decoded values.
+
+        The raw bytes are searched for the value only when JSON writes it
+        verbatim: escapes (``\\/``, ``\\u00e9``) and number spellings (``1e3``)
+        differ from the decoded text.
+        """
+        if _PLAIN.fullmatch(value) and not _is_number(value):
+            return self.lines.find_lines(value)
+        if _PLAIN.fullmatch(key):
+            return self.lines.find_lines(f'"{key}"')
+        return range(len(self.levels))
+
+    def _field_equals(self, number: int, key: str, value: str) -> bool:
+        record = parse_json_line(self.lines.line(number))
+        if record is None or key not in record:
+            return False
+        return field_text(record[key]) == value
+
+
+def _is_number(text: str) -> bool:
+    try:
+        float(text)
+    except ValueError:
+        return False
+    return True
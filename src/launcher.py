@@ -0,0 +1,140 @@
+"""Command launch preparation: direct exec fast path and per-project environments."""
+
+import os
+import re
+import shlex
+import shutil
+import threading
+from typing import Optional, Union
+
+from .config import get_setting
+
+# Anything here needs a real shell (pipes, redirects, chaining, expansion, globs...)
+_SHELL_SYNTAX = re.compile(r"[|&;<>()$`\\*?\[\]{}~!#%\n]|^\s*\w+=")
+# Commands that only exist as shell builtins
+_SHELL_BUILTINS = {
+    "cd", "export", "source", ".", "alias", "unalias", "set", "unset", "exit",
+    "eval", "exec", "ulimit", "umask", "type", "wait", "read", "trap", "shift",
+}
+
+_env_cache: dict = {}
+_env_lock = threading.Lock()
+
+
+def split_simple_command(command: str, path: str = None) -> Optional[list]:
+    """Return an argv list if the command can run without a shell, else None.
+
+    argv[0] is resolved against ``path`` so the project's PATH entries win.
+    """
+    if not command.strip() or _SHELL_SYNTAX.search(command):
+        return None
+    if os.name == "nt" and ('"' in command or "'" in command):
+        return None  # Leave Windows quoting rules to cmd.exe
+    try:
+        argv = shlex.split(command, posix=os.name != "nt")
+    except ValueError:
+        return None
+    if not argv or argv[0] in _SHELL_BUILTINS:
+        return None
+    if os.path.dirname(argv[0]) and not os.path.isabs(argv[0]):
+        return None  # ./script is relative to the child's cwd, not ours
+    executable = shutil.which(argv[0], path=path)
+    if not executable:
+        return None
+    if os.name == "nt" and executable.lower().endswith((".cmd", ".bat")):
+        return None  # Batch shims (npm.cmd, npx.cmd) need cmd.exe
+    return [executable, *argv[1:]]
+
+
+def parse_env_file(path: str) -> dict:
+    """Parse a dotenv file: KEY=VALUE lines, optional ``export``, quotes and comments."""
+    values = {}
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return values
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        if line.startswith("export "):
+            line = line[7:].lstrip()
+        key, value = line.split("=", 1)
+        key, value = key.strip(), value.strip()
+        if not key.isidentifier():
+            continue
+        quote = value[:1]
+        end = value.find(quote, 1) if quote in ("'", '"') else -1
+        if end > 0:
+            value = value[1:end]
+            if quote == '"':
+                value = value.replace("\\n", "\n")
+        elif " #" in value:
+            value = value.split(" #", 1)[0].rstrip()
+        values[key] = value
+    return values
+
+
+def _env_signature(cwd: str) -> tuple:
+    """Stat the profile's source files; any change invalidates the cached env."""
+    signature = []
+    for name in get_setting("project_env_files"):
+        try:
+            st = os.stat(os.path.join(cwd, name))
+            signature.append((name, st.st_mtime_ns, st.st_size))
+        except OSError:
+            pass
+    for rel in get_setting("project_path_dirs"):
+        if os.path.isdir(os.path.join(cwd, rel)):
+            signature.append((rel,))
+    return tuple(signature)
+
+
+def get_project_env(cwd: str) -> Optional[dict]:
+    """Environment for children started in a project, cached until its sources change.
+
+    Returns None (inherit unchanged) when the project adds nothing.
+    """
+    if not cwd or not get_setting("project_env"):
+        return None
+    cwd = os.path.abspath(cwd)
+    signature = _env_signature(cwd)
+    with _env_lock:
+        cached = _env_cache.get(cwd)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+    env = None
+    if signature:
+        env = dict(os.environ)
+        for name in get_setting("project_env_files"):
+            env.update(parse_env_file(os.path.join(cwd, name)))
+        extra_path = [
+            os.path.join(cwd, rel) for rel in get_setting("project_path_dirs")
+            if os.path.isdir(os.path.join(cwd, rel))
+        ]
+        if extra_path:
+            env["PATH"] = os.pathsep.join(extra_path + [env.get("PATH", "")])
+
+    with _env_lock:
+        _env_cache[cwd] = (signature, env)
+    return env
+
+
+def prepare_launch(command: str, cwd: str = None) -> tuple:
+    """Work out how to start a command.
+
+    Returns ``(args, shell, env)`` for subprocess.Popen: an argv list with
+    shell=False when the command is simple, otherwise the original string
+    with shell=True.
+    """
+    env = get_project_env(cwd)
+    args: Union[str, list] = command
+    shell = True
+    if get_setting("direct_exec"):
+        path = (env or os.environ).get("PATH")
+        argv = split_simple_command(command, path)
+        if argv:
+            args, shell = argv, False
+    return args, shell, env
@@ -0,0 +1,192 @@
+"""Per-command resource limits, scheduling priority and per-project heavy-command slots.
+
+A limits spec is a dict with any of:
+
+    nice            int, added niceness (Windows: maps to a lower priority class)
+    ionice          "idle", "best-effort" or "best-effort:<0-7>" (Linux)
+    cpus            CPU affinity, e.g. [0, 1] or "0-3,6" (Linux)
+    max_memory_mb   data segment limit (RLIMIT_DATA on Linux, RLIMIT_AS elsewhere)
+    max_cpu_s       CPU time limit in seconds (RLIMIT_CPU)
+    heavy           true to count against max_heavy_per_project
+"""
+
+import ctypes
+import ctypes.util
+import os
+import platform
+import subprocess
+from collections import deque
+from typing import Callable, Optional
+
+from .commands import PRESET_LIMITS
+from .config import get_setting
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# ioprio_set syscall numbers by machine (no libc wrapper exists)
+_IOPRIO_SET = {"x86_64": 251, "amd64": 251, "i386": 289, "i686": 289, "aarch64": 30, "arm64": 30, "armv7l": 314}
+_IOPRIO_CLASSES = {"best-effort": 2, "idle": 3}
+
+
+def resolve_limits(command: str) -> dict:
+    """Limits for a command: preset defaults, then command_limits, then its custom command entry."""
+    limits = dict(PRESET_LIMITS.get(command, {}))
+    limits.update((get_setting("command_limits") or {}).get(command, {}))
+    for item in get_setting("custom_commands") or []:  # Cached: no re-read per run
+        if item.get("command") == command:
+            limits.update(item.get("limits") or {})
+    return limits
+
+
+def parse_cpus(spec) -> set:
+    """CPU set from a list of ints or a "0-3,6" string."""
+    if isinstance(spec, (list, tuple, set)):
+        return {int(cpu) for cpu in spec}
+    cpus = set()
+    for part in str(spec).split(","):
+        part = part.strip()
+        if "-" in part:
+            first, last = part.split("-", 1)
+            cpus.update(range(int(first), int(last) + 1))
+        elif part:
+            cpus.add(int(part))
+    return cpus
+
+
+def describe_limits(limits: dict) -> str:
+    """Short human summary, e.g. "nice 10, ionice idle, mem 2048 MB"."""
+    parts = []
+    if limits.get("nice"):
+        parts.append(f"nice {limits['nice']}")
+    if limits.get("ionice"):
+        parts.append(f"ionice {limits['ionice']}")
+    if limits.get("cpus") is not None:
+        parts.append(f"cpus {limits['cpus']}")
+    if limits.get("max_memory_mb"):
+        parts.append(f"mem {limits['max_memory_mb']} MB")
+    if limits.get("max_cpu_s"):
+        parts.append(f"cpu {limits['max_cpu_s']}s")
+    if limits.get("heavy"):
+        parts.append("heavy")
+    return ", ".join(parts)
+
+
+def _ioprio_setter(spec: str) -> Optional[Callable]:
+    """Build the ioprio_set call in the parent; the child only invokes it."""
+    number = _IOPRIO_SET.get(platform.machine().lower())
+    if not number or not spec:
+        return None
+    name, _, level = str(spec).partition(":")
+    io_class = _IOPRIO_CLASSES.get(name)
+    if io_class is None:
+        return None
+    value = (io_class << 13) | (int(level or 7) if io_class == 2 else 0)
+    libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    syscall = libc.syscall
+    # who = IOPRIO_WHO_PROCESS (1), pid 0 = the calling process
+    return lambda: syscall(number, 1, 0, value)
+
+
+def make_preexec(limits: dict, then: Callable = None) -> Optional[Callable]:
+    """A preexec_fn applying limits in the child before exec (POSIX), or None.
+
+    ``then`` runs afterwards (e.g. acquiring a controlling tty) and is returned
+    as is when there is nothing to apply (e.g. only "heavy"). Failures to
+    apply a limit are ignored rather than preventing the command from starting.
+    """
+    if os.name == "nt" or not limits:
+        return then
+    nice = int(limits.get("nice") or 0)
+    ioprio = _ioprio_setter(limits.get("ionice")) if platform.system() == "Linux" else None
+    cpus = parse_cpus(limits["cpus"]) if limits.get("cpus") is not None else None
+    rlimits = []
+    if limits.get("max_memory_mb") and resource:
+        kind = resource.RLIMIT_DATA if platform.system() == "Linux" else resource.RLIMIT_AS
+        size = int(limits["max_memory_mb"]) * 1024 * 1024
+        rlimits.append((kind, (size, size)))
+    if limits.get("max_cpu_s") and resource:
+        seconds = int(limits["max_cpu_s"])
+        rlimits.append((resource.RLIMIT_CPU, (seconds, seconds)))
+    if not (nice or ioprio or cpus or rlimits):
+        return then  # Keeps the fast (vfork) spawn path when nothing is set
+
+    def preexec():
+        if nice:
+            try:
+                os.nice(nice)
+            except OSError:
+                pass
+        if ioprio:
+            ioprio()
+        if cpus and hasattr(os, "sched_setaffinity"):
+            try:
+                os.sched_setaffinity(0, cpus)
+            except OSError:
+                pass
+        for kind, value in rlimits:
+            try:
+                resource.setrlimit(kind, value)
+            except (OSError, ValueError):
+                pass
+        if then:
+            then()
+
+    return preexec
+
+
+def priority_creationflags(limits: dict) -> int:
+    """Windows priority class for a nice value (0 elsewhere)."""
+    if os.name != "nt" or not limits.get("nice"):
+        return 0
+    if int(limits["nice"]) >= 15:
+        return subprocess.IDLE_PRIORITY_CLASS
+    return subprocess.BELOW_NORMAL_PRIORITY_CLASS
+
+
+class HeavySlots:
+    """Per-project cap on concurrently running heavy commands (Tk thread only)."""
+
+    def __init__(self):
+        self.running: dict = {}   # project -> set of tab ids
+        self.waiting: dict = {}   # project -> deque of (tab_id, start callback)
+
+    def acquire(self, project: str, tab_id: str, cap: int) -> bool:
+        holders = self.running.setdefault(project, set())
+        if tab_id in holders:
+            return True  # Restarted before its previous run reported completion
+        if len(holders) >= max(1, cap):
+            return False
+        holders.add(tab_id)
+        return True
+
+    def wait(self, project: str, tab_id: str, start: Callable):
+        self.waiting.setdefault(project, deque()).append((tab_id, start))
+
+    def cancel(self, tab_id: str) -> bool:
+        """Drop a queued start. Returns True if the tab was waiting."""
+        for queue in self.waiting.values():
+            for item in list(queue):
+                if item[0] == tab_id:
+                    queue.remove(item)
+                    return True
+        return False
+
+    def release(self, tab_id: str):
+        """Free the tab's slot and start the next waiting command in that project."""
+        for project, holders in self.running.items():
+            if tab_id in holders:
+                holders.discard(tab_id)
+                self.start_next(project)
+                return
+
+    def start_next(self, project: str):
+        queue = self.waiting.get(project)
+        if queue:
+            _, start = queue.popleft()
+            start()
+
+
+HEAVY = HeavySlots()
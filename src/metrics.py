@@ -0,0 +1,237 @@
+"""Per-tab and global metrics for the terminal engine."""
+
+import bisect
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+# Histogram bucket upper bounds in milliseconds
+DEFAULT_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class Histogram:
+    """Fixed-bucket histogram (Prometheus style, values in ms)."""
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value_ms: float):
+        self.counts[bisect.bisect_left(self.buckets, value_ms)] += 1
+        self.count += 1
+        self.sum += value_ms
+        if value_ms > self.max:
+            self.max = value_ms
+
+    def percentile(self, pct: float) -> float:
+        """Approximate percentile (bucket upper bound)."""
+        if not self.count:
+            return 0.0
+        target = self.count * pct / 100
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return min(self.buckets[i], self.max) if i < len(self.buckets) else self.max
+        return self.max
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum_ms": round(self.sum, 3),
+            "avg_ms": round(self.sum / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p99_ms": self.percentile(99),
+            "max_ms": round(self.max, 3),
+        }
+
+
+class RateMeter:
+    """Events per second over a sliding window of whole seconds."""
+
+    def __init__(self, window: int = 5):
+        self.window = window
+        self.total = 0
+        self._buckets = deque()  # [second, amount]
+
+    def add(self, amount: int = 1):
+        self.total += amount
+        second = int(time.monotonic())
+        if self._buckets and self._buckets[-1][0] == second:
+            self._buckets[-1][1] += amount
+        else:
+            self._buckets.append([second, amount])
+            while self._buckets and self._buckets[0][0] <= second - self.window - 1:
+                self._buckets.popleft()
+
+    def rate(self) -> float:
+        # Only count completed seconds so the value doesn't jitter
+        now = int(time.monotonic())
+        amount = sum(n for sec, n in list(self._buckets) if now - self.window <= sec < now)
+        return amount / self.window
+
+
+class TabMetrics:
+    """Counters and histograms for one terminal tab.
+
+    ``record_input`` is called from the reader thread; everything else from
+    the Tk thread.
+    """
+
+    def __init__(self, tab_id: str, name: str):
+        self.tab_id = tab_id
+        self.name = name
+        self.bytes_in = RateMeter()
+        self.lines_in = RateMeter()
+        self.lines_drained = 0
+        self.lines_folded = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.drain_time = Histogram()
+        self.insert_time = Histogram()
+
+    def record_input(self, text: str):
+        self.bytes_in.add(len(text))
+        self.lines_in.add(text.count("\n") or 1)
+
+    def record_drain(self, depth: int, lines: int, elapsed_ms: float):
+        self.queue_depth = depth
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+        self.lines_drained += lines
+        if lines:
+            self.drain_time.observe(elapsed_ms)
+
+    def record_insert(self, elapsed_ms: float):
+        self.insert_time.observe(elapsed_ms)
+
+    def snapshot(self) -> dict:
+        return {
+            "tab_id": self.tab_id,
+            "name": self.name,
+            "bytes_in_total": self.bytes_in.total,
+            "bytes_in_per_sec": self.bytes_in.rate(),
+            "lines_in_total": self.lines_in.total,
+            "lines_in_per_sec": self.lines_in.rate(),
+            "lines_drained_total": self.lines_drained,
+            "lines_folded_total": self.lines_folded,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "drain_time": self.drain_time.snapshot(),
+            "insert_time": self.insert_time.snapshot(),
+        }
+
+
+class MetricsRegistry:
+    """Registry of all tab metrics plus process-wide gauges."""
+
+    def __init__(self):
+        self.tabs: dict[str, TabMetrics] = {}
+        self._lock = threading.Lock()
+        self.started = time.time()
+
+    def register(self, tab_id: str, name: str) -> TabMetrics:
+        with self._lock:
+            metrics = TabMetrics(tab_id, name)
+            self.tabs[tab_id] = metrics
+            return metrics
+
+    def unregister(self, tab_id: str):
+        with self._lock:
+            self.tabs.pop(tab_id, None)
+
+    def snapshot(self) -> dict:
+        """Current values for every tab and the process."""
+        with self._lock:
+            tabs = list(self.tabs.values())
+        memory = {"tracing": tracemalloc.is_tracing()}
+        if memory["tracing"]:
+            current, peak = tracemalloc.get_traced_memory()
+            memory.update(traced_bytes=current, traced_peak_bytes=peak)
+        return {
+            "timestamp": time.time(),
+            "uptime_s": round(time.time() - self.started, 1),
+            "threads": threading.active_count(),
+            "memory": memory,
+            "tabs": [t.snapshot() for t in tabs],
+        }
+
+
+def top_allocations(limit: int = 10) -> list:
+    """Largest allocation sites from a tracemalloc snapshot (empty if not tracing)."""
+    if not tracemalloc.is_tracing():
+        return []
+    stats = tracemalloc.take_snapshot().statistics("lineno")
+    return [
+        {"where": str(stat.traceback), "size_bytes": stat.size, "count": stat.count}
+        for stat in stats[:limit]
+    ]
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def to_prometheus(snapshot: dict) -> str:
+    """Render a snapshot in the Prometheus text exposition format."""
+    lines = [
+        "# TYPE terminal_manager_threads gauge",
+        f"terminal_manager_threads {snapshot['threads']}",
+    ]
+    memory = snapshot["memory"]
+    if memory.get("tracing"):
+        lines += [
+            "# TYPE terminal_manager_traced_bytes gauge",
+            f"terminal_manager_traced_bytes {memory['traced_bytes']}",
+            f"terminal_manager_traced_peak_bytes {memory['traced_peak_bytes']}",
+        ]
+    series = [
+        ("bytes_in_total", "counter"),
+        ("bytes_in_per_sec", "gauge"),
+        ("lines_in_total", "counter"),
+        ("lines_in_per_sec", "gauge"),
+        ("lines_drained_total", "counter"),
+        ("lines_folded_total", "counter"),
+        ("queue_depth", "gauge"),
+        ("max_queue_depth", "gauge"),
+    ]
+    for key, kind in series:
+        lines.append(f"# TYPE terminal_manager_tab_{key} {kind}")
+        for tab in snapshot["tabs"]:
+            labels = f'tab="{_escape_label(tab["tab_id"])}",name="{_escape_label(tab["name"])}"'
+            lines.append(f"terminal_manager_tab_{key}{{{labels}}} {tab[key]}")
+    for key in ("drain_time", "insert_time"):
+        lines.append(f"# TYPE terminal_manager_tab_{key}_ms summary")
+        for tab in snapshot["tabs"]:
+            labels = f'tab="{_escape_label(tab["tab_id"])}",name="{_escape_label(tab["name"])}"'
+            hist = tab[key]
+            for q, field in (("0.5", "p50_ms"), ("0.99", "p99_ms")):
+                lines.append(f'terminal_manager_tab_{key}_ms{{{labels},quantile="{q}"}} {hist[field]}')
+            lines.append(f"terminal_manager_tab_{key}_ms_sum{{{labels}}} {hist['sum_ms']}")
+            lines.append(f"terminal_manager_tab_{key}_ms_count{{{labels}}} {hist['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def export_metrics(path: str, fmt: str = "json") -> None:
+    """Write the current snapshot to a file (atomically, for textfile collectors)."""
+    snapshot = METRICS.snapshot()
+    if fmt == "prometheus":
+        content = to_prometheus(snapshot)
+    else:
+        content = json.dumps(snapshot, indent=2)
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Error exporting metrics: {e}")
+
+
+METRICS = MetricsRegistry()
@@ -0,0 +1,222 @@
+"""Problem matchers: pull file:line:col errors out of command output as it streams."""
+
+import re
+import threading
+from typing import Optional
+
+from .ansi import strip_ansi
+
+MAX_PROBLEMS = 1000
+MAX_MESSAGE_CHARS = 300
+
+
+class Matcher:
+    """A single-line pattern with named groups ``file``, ``line``, ``col``,
+    ``severity``, ``message`` and ``code`` (all but message optional).
+
+    ``hint`` is a substring every matching line contains; lines without it
+    skip the regex.
+    """
+
+    def __init__(self, name: str, pattern: str, hint: str = None, severity: str = "error"):
+        self.name = name
+        self.regex = re.compile(pattern)
+        self.hint = hint
+        self.severity = severity
+
+    def match(self, line: str) -> Optional[dict]:
+        if self.hint and self.hint not in line:
+            return None
+        m = self.regex.search(line)
+        if not m:
+            return None
+        groups = m.groupdict()
+        return _problem(
+            self.name,
+            groups.get("file"),
+            groups.get("line"),
+            groups.get("col"),
+            groups.get("severity") or self.severity,
+            groups.get("message") or line.strip(),
+            groups.get("code"),
+        )
+
+
+def _problem(source, file, line, col, severity, message, code=None) -> dict:
+    return {
+        "source": source,
+        "file": file or "",
+        "line": int(line) if line else 0,
+        "col": int(col) if col else 0,
+        "severity": (severity or "error").lower(),
+        "message": message.strip()[:MAX_MESSAGE_CHARS],
+        "code": code or "",
+        "count": 1,
+        "anchor": "",  # Output line to jump to
+    }
+
+
+BUILTIN_MATCHERS = [
+    # src/app.ts(12,5): error TS2322: Type 'string' is not assignable...
+    Matcher(
+        "tsc",
+        r"^(?P<file>[^\s(][^(]*?)\((?P<line>\d+),(?P<col>\d+)\): (?P<severity>error|warning) (?P<code>TS\d+): (?P<message>.*)$",
+        hint=" TS"
+    ),
+    # src/app.ts:12:5 - error TS2322: ... (tsc --pretty)
+    Matcher(
+        "tsc",
+        r"^(?P<file>\S+?):(?P<line>\d+):(?P<col>\d+) - (?P<severity>error|warning) (?P<code>TS\d+): (?P<message>.*)$",
+        hint=" - "
+    ),
+    # tests/test_api.py:42: AssertionError (pytest)
+    Matcher(
+        "pytest",
+        r"^(?P<file>[^\s:]+\.py):(?P<line>\d+): (?P<message>\w*(?:Error|Exception|Failed)\b.*)$",
+        hint=".py:"
+    ),
+    # main.go:12:5: undefined: x / file.c:3:1: error: ... / file.css:4:2: warning ...
+    Matcher(
+        "generic",
+        r"^(?P<file>(?:[A-Za-z]:)?[^\s:]+\.[A-Za-z]\w*):(?P<line>\d+):(?P<col>\d+):? +(?:(?P<severity>error|warning)\b:? *)?(?P<message>\S.*)$",
+        hint=":"
+    ),
+]
+
+# Multi-line formats, handled by ProblemScanner's state
+_ESLINT_FILE = re.compile(r"^(?:[A-Za-z]:)?[\w.@~/\\ -]+\.(?:[cm]?[jt]sx?|vue|svelte|astro)$")
+_ESLINT_ITEM = re.compile(
+    r"^\s+(?P<line>\d+):(?P<col>\d+)\s+(?P<severity>error|warning)\s+(?P<message>.+?)(?:\s{2,}(?P<code>[\w@/-]+))?$"
+)
+_JEST_FAILURE = re.compile(r"^\s*● (?P<message>.+)$")
+_JEST_FRAME = re.compile(r"\bat (?:.*\()?(?P<file>[^\s()]+?):(?P<line>\d+):(?P<col>\d+)\)?$")
+_PY_FRAME = re.compile(r'^\s*File "(?P<file>[^"]+)", line (?P<line>\d+)')
+_PY_EXCEPTION = re.compile(r"^(?P<message>[A-Za-z_][\w.]*(?:: .*)?)$")
+JEST_FRAME_WINDOW = 40  # Lines after a ● header to look for its test file frame
+
+
+class ProblemScanner:
+    """Incremental, deduplicated problem list for one output stream.
+
+    ``feed`` runs on the reader thread and only looks at new text; the Tk
+    thread reads ``problems`` when ``changed`` is set.
+    """
+
+    def __init__(self, custom: list = None):
+        self.matchers = list(BUILTIN_MATCHERS)
+        for spec in custom or []:
+            try:
+                self.matchers.append(Matcher(
+                    spec.get("name", "custom"),
+                    spec["pattern"],
+                    spec.get("hint"),
+                    spec.get("severity", "error")
+                ))
+            except (KeyError, re.error) as e:
+                print(f"Error in problem matcher {spec!r}: {e}")
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.problems: list = []
+            self._index: dict = {}
+            self._partial = ""
+            self._eslint_file = None
+            self._traceback = None   # (file, line) of the innermost frame so far
+            self._jest = None        # [message, anchor, lines left]
+            self.changed = True
+
+    def feed(self, text: str):
+        """Match the complete lines in ``text`` (a partial last line waits for the rest)."""
+        with self._lock:
+            lines = (self._partial + text).split("\n")
+            self._partial = lines.pop()[-4096:]
+            for raw in lines:
+                raw = raw.rstrip("\r").rsplit("\r", 1)[-1]  # Last frame of a redrawn line
+                line = strip_ansi(raw)
+                problem = self._match(line)
+                if problem:
+                    problem["anchor"] = problem["anchor"] or raw
+                    self._add(problem)
+
+    def _add(self, problem: dict):
+        key = (problem["file"], problem["line"], problem["col"], problem["message"])
+        existing = self._index.get(key)
+        if existing:
+            existing["count"] += 1
+        elif len(self.problems) < MAX_PROBLEMS:
+            self._index[key] = problem
+            self.problems.append(problem)
+        else:
+            return
+        self.changed = True
+
+    def _match(self, line: str) -> Optional[dict]:
+        # Python traceback: remember the innermost frame, report at the exception line
+        if self._traceback is not None:
+            frame = _PY_FRAME.match(line)
+            if frame:
+                self._traceback = (frame["file"], frame["line"])
+                return None
+            if line[:1].isspace() or not line:
+                return None
+            file, number = self._traceback
+            self._traceback = None
+            exception = _PY_EXCEPTION.match(line)
+            if exception:
+                return _problem("python", file, number, None, "error", exception["message"])
+        if line.startswith("Traceback (most recent call last):"):
+            self._traceback = (None, None)
+            return None
+
+        # jest: "● suite › test", then the first stack frame in a test file
+        if self._jest is not None:
+            frame = _JEST_FRAME.search(line) if "at " in line else None
+            if frame and "node_modules" not in frame["file"] and not frame["file"].startswith("node:"):
+                message, anchor, _ = self._jest
+                self._jest = None
+                problem = _problem("jest", frame["file"], frame["line"], frame["col"], "error", message)
+                problem["anchor"] = anchor
+                return problem
+            self._jest[2] -= 1
+            if self._jest[2] <= 0:
+                message, anchor, _ = self._jest
+                self._jest = None
+                problem = _problem("jest", None, None, None, "error", message)
+                problem["anchor"] = anchor
+                return problem
+        if "●" in line:
+            failure = _JEST_FAILURE.match(line)
+            if failure:
+                if self._jest is not None:
+                    # The previous failure had no frame in a test file
+                    self._add(_problem("jest", None, None, None, "error", self._jest[0]) | {"anchor": self._jest[1]})
+                self._jest = [failure["message"], line, JEST_FRAME_WINDOW]
+                return None
+
+        # eslint "stylish": a file header line, then indented line:col rows
+        if self._eslint_file and line[:1].isspace():
+            item = _ESLINT_ITEM.match(line)
+            if item:
+                return _problem(
+                    "eslint", self._eslint_file, item["line"], item["col"],
+                    item["severity"], item["message"], item["code"]
+                )
+        elif _ESLINT_FILE.match(line):
+            self._eslint_file = line.strip()
+            return None
+        elif not line.strip():
+            self._eslint_file = None
+
+        for matcher in self.matchers:
+            problem = matcher.match(line)
+            if problem:
+                return problem
+        return None
+
+    def snapshot(self) -> list:
+        """Copy of the problem list for the Tk thread (clears ``changed``)."""
+        with self._lock:
+            self.changed = False
+            return [dict(p) for p in self.problems]
@@ -0,0 +1,82 @@
+"""Problems panel: a tab's matched errors and warnings, click to jump to the output line."""
+
+from typing import Callable
+
+import customtkinter as ctk
+
+SEVERITY_ICONS = {"error": "✗", "warning": "⚠"}
+
+
+class ProblemsPanel(ctk.CTkFrame):
+    """List of problems from a ProblemScanner snapshot."""
+
+    SHOW_MAX = 500
+
+    def __init__(self, master, on_select: Callable = None, on_close: Callable = None, **kwargs):
+        super().__init__(master, fg_color="transparent", **kwargs)
+        self.on_select = on_select   # Called with the clicked problem
+        self.problems: list = []
+
+        header = ctk.CTkFrame(self, fg_color="transparent")
+        header.pack(fill="x")
+        self.title_label = ctk.CTkLabel(header, text="Problems", font=ctk.CTkFont(size=12, weight="bold"))
+        self.title_label.pack(side="left")
+        self.note_label = ctk.CTkLabel(header, text="", text_color="#9E9E9E", font=("Consolas", 10))
+        self.note_label.pack(side="left", padx=10)
+        ctk.CTkButton(
+            header,
+            text="✕",
+            width=24,
+            height=20,
+            fg_color="transparent",
+            command=on_close
+        ).pack(side="right")
+
+        self.list = ctk.CTkTextbox(
+            self,
+            height=130,
+            font=("Consolas", 10),
+            fg_color="#1a1a1a",
+            text_color="#e0e0e0",
+            wrap="none"
+        )
+        self.list.pack(fill="x")
+        self.list.tag_config("error", foreground="#f44336")
+        self.list.tag_config("warning", foreground="#FF9800")
+        self.list.configure(state="disabled")
+        self.list.bind("<Button-1>", self._on_click)
+
+    def show(self, problems: list):
+        self.problems = problems[:self.SHOW_MAX]
+        errors = sum(1 for p in problems if p["severity"] == "error")
+        others = len(problems) - errors
+        self.title_label.configure(
+            text=f"Problems: {errors} error{'s' if errors != 1 else ''}, {others} other{'s' if others != 1 else ''}"
+        )
+        self.note_label.configure(text="")
+        self.list.configure(state="normal")
+        self.list.delete("1.0", "end")
+        for i, problem in enumerate(self.problems):
+            location = problem["file"] or "(no location)"
+            if problem["line"]:
+                location += f":{problem['line']}"
+                if problem["col"]:
+                    location += f":{problem['col']}"
+            code = f"  [{problem['code']}]" if problem["code"] else ""
+            count = f"  ×{problem['count']}" if problem["count"] > 1 else ""
+            icon = SEVERITY_ICONS.get(problem["severity"], "•")
+            self.list.insert("end", f"{icon} ", problem["severity"])
+            self.list.insert("end", f"{location}  {problem['message']}{code}{count}")
+            if i < len(self.problems) - 1:
+                self.list.insert("end", "\n")
+        if len(problems) > self.SHOW_MAX:
+            self.list.insert("end", f"\n… {len(problems) - self.SHOW_MAX:,} more")
+        self.list.configure(state="disabled")
+
+    def set_note(self, text: str):
+        self.note_label.configure(text=text)
+
+    def _on_click(self, event):
+        row = int(self.list.index(f"@{event.x},{event.y}").split(".")[0]) - 1
+        if 0 <= row < len(self.problems) and self.on_select:
+            self.on_select(self.problems[row])
@@ -3,9 +3,22 @@
 import subprocess
 import os
 import re
+import signal
+import sys
+import threading
+import time
 
-def kill_port(port: int) -> bool:
-    """Kill process running on specified port."""
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Linux: sample the command's own peak RSS, since ru_maxrss also counts what
+# a forked child inherited from this (large) process before it exec'd
+_PROC = os.path.exists("/proc/self/status")
+
+def kill_port(port: int, grace: float = 2.0) -> bool:
+    """Stop the processes listening on a port: asked to exit first, killed after ``grace`` seconds."""
     try:
         if os.name == 'nt':  # Windows
             # Find PID using netstat
@@ -28,7 +41,13 @@ def kill_port(port: int) -> bool:
             if not pids:
                 return False
                 
-            # Kill processes
+            # Ask politely (WM_CLOSE), then force whatever is still running
+            for pid in pids:
+                subprocess.run(f'taskkill /PID {pid}', shell=True, capture_output=True)
+            deadline = time.monotonic() + grace
+            while pids and time.monotonic() < deadline:
+                time.sleep(0.1)
+                pids = {pid for pid in pids if _windows_pid_alive(pid)}
             for pid in pids:
                 subprocess.run(f'taskkill /F /PID {pid}', shell=True, capture_output=True)
             return True
@@ -36,18 +55,176 @@ def kill_port(port: int) -> bool:
         else:  # Linux/Mac
             cmd = f'lsof -t -i:{port}'
             result = subprocess.run(cmd, capture_output=True, text=True, shell=True)
-            if result.stdout:
-                pids = result.stdout.strip().split('\n')
-                for pid in pids:
-                    subprocess.run(f'kill -9 {pid}', shell=True)
+            pids = {int(pid) for pid in result.stdout.split() if pid.isdigit()}
+            if pids:
+                # SIGTERM lets servers close connections and remove pid/lock files
+                pids = _signal_pids(pids, signal.SIGTERM)
+                deadline = time.monotonic() + grace
+                while pids and time.monotonic() < deadline:
+                    time.sleep(0.05)
+                    pids = _signal_pids(pids, 0)
+                _signal_pids(pids, signal.SIGKILL)
                 return True
                 
     except Exception as e:
         print(f"Error killing port {port}: {e}")
     return False
 
+def _signal_pids(pids: set, sig: int) -> set:
+    """Send ``sig`` to each pid (0 only checks); returns the ones that still exist."""
+    alive = set()
+    for pid in pids:
+        try:
+            os.kill(pid, sig)
+        except (ProcessLookupError, PermissionError):
+            continue  # Gone, or another user's process that isn't ours to stop
+        alive.add(pid)
+    return alive
+
+def _windows_pid_alive(pid: str) -> bool:
+    result = subprocess.run(f'tasklist /FI "PID eq {pid}" /NH', shell=True, capture_output=True, text=True)
+    return pid in result.stdout
+
 def check_port_in_use(port: int) -> bool:
     """Check if a port is in use."""
     import socket
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
         return s.connect_ex(('localhost', port)) == 0
+
+def _windows_usage(process) -> tuple:
+    """CPU seconds and peak working set (KB) of an exited Windows process."""
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    try:
+        handle = wintypes.HANDLE(int(process._handle))  # Still open until Popen is collected
+        creation, exit_time, kernel, user = (ctypes.c_ulonglong() for _ in range(4))
+        cpu = None
+        if ctypes.windll.kernel32.GetProcessTimes(
+            handle, ctypes.byref(creation), ctypes.byref(exit_time), ctypes.byref(kernel), ctypes.byref(user)
+        ):
+            cpu = (kernel.value + user.value) / 1e7  # 100 ns units
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        peak = None
+        if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            peak = counters.PeakWorkingSetSize // 1024
+        return cpu, peak
+    except (AttributeError, OSError, ValueError):
+        return None, None
+
+def _read_cmdline(pid) -> bytes:
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return f.read()
+    except OSError:
+        return b""
+
+
+def _process_tree(pid: int) -> list:
+    """The process and its live descendants (Linux)."""
+    pids, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        pids.append(current)
+        try:
+            for task in os.listdir(f"/proc/{current}/task"):
+                with open(f"/proc/{current}/task/{task}/children", "r") as f:
+                    stack.extend(int(child) for child in f.read().split())
+        except (OSError, ValueError):
+            pass
+    return pids
+
+
+def _vm_hwm_kb(pid: int):
+    """Peak RSS (KB) of a live process, or None."""
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+class _PeakSampler:
+    """Polls VmHWM of a process tree until stopped; ``peak_kb`` is the largest single process.
+
+    A child that hasn't exec'd yet still has this process's memory (and
+    command line), so it is skipped until it has.
+    """
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.peak_kb = None
+        self._own_cmdline = _read_cmdline("self")
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _sample(self):
+        for pid in _process_tree(self.pid):
+            if _read_cmdline(pid) == self._own_cmdline:
+                continue
+            hwm = _vm_hwm_kb(pid)
+            if hwm and (self.peak_kb is None or hwm > self.peak_kb):
+                self.peak_kb = hwm
+
+    def _run(self):
+        interval = 0.02
+        while True:
+            self._sample()
+            if self._stop.wait(interval):
+                return
+            interval = min(interval * 1.5, 0.5)
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+def wait_with_usage(process) -> tuple:
+    """Wait for a Popen child. Returns (exit_code, cpu_seconds, peak_rss_kb).
+
+    On POSIX the usage covers the child and the descendants it waited for
+    (peak is the largest single process). ru_maxrss includes the memory a
+    forked child inherited from this process, so it is only used when it
+    exceeds this process's own peak; on Linux the peak is also sampled from
+    /proc while the command runs. Unknown values are None.
+    """
+    if os.name == 'nt':
+        process.wait()
+        return (process.returncode, *_windows_usage(process))
+    sampler = _PeakSampler(process.pid) if _PROC else None
+    try:
+        _, status, usage = os.wait4(process.pid, 0)
+    except ChildProcessError:
+        process.wait()  # Reaped elsewhere (e.g. by poll()); no usage available
+        return process.returncode, None, None
+    finally:
+        if sampler:
+            sampler.stop()
+    process.returncode = os.waitstatus_to_exitcode(status)
+    peak = usage.ru_maxrss
+    if resource and peak <= resource.getrusage(resource.RUSAGE_SELF).ru_maxrss:
+        peak = None  # Can't be told apart from what the child inherited
+    if peak and sys.platform == 'darwin':
+        peak //= 1024  # Bytes on macOS
+    if sampler and sampler.peak_kb and (peak is None or sampler.peak_kb > peak):
+        peak = sampler.peak_kb
+    return process.returncode, usage.ru_utime + usage.ru_stime, peak
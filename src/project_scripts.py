@@ -0,0 +1,308 @@
+"""Discover a project's runnable scripts: package.json, Makefile, pyproject and docker compose.
+
+Each script is a dict with ``label``, ``command``, ``long_running``,
+``port`` (None when unknown) and ``port_explicit`` (the port is written in
+the command or compose file rather than a tool's default), inferred from
+the script's name and body. Parsed files are cached by mtime and size.
+"""
+
+import json
+import os
+import re
+import threading
+from typing import Optional
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+# Script names (or name parts, e.g. "dev:api", "build:watch") that keep running
+LONG_RUNNING_NAMES = {"dev", "start", "serve", "server", "watch", "preview", "storybook", "worker", "develop", "up"}
+# ...unless another part says it's a one-off ("migrate:dev", "db:seed:dev")
+ONE_SHOT_NAMES = {"build", "migrate", "seed", "generate", "test", "lint", "reset"}
+# Tools that start servers or watchers, with their default port (None if it varies)
+SERVER_TOOLS = [
+    (re.compile(r"\bnext (?:dev|start)\b"), 3000),
+    (re.compile(r"\bvite(?:\s+(?:dev|serve))?(?:\s+-|\s*$|\s*&)"), 5173),
+    (re.compile(r"\bvite preview\b"), 4173),
+    (re.compile(r"\breact-scripts start\b"), 3000),
+    (re.compile(r"\bnuxi? dev\b"), 3000),
+    (re.compile(r"\bastro dev\b"), 4321),
+    (re.compile(r"\bremix(?:-serve| dev)\b"), 3000),
+    (re.compile(r"\bprisma studio\b"), 5555),
+    (re.compile(r"\bstorybook dev\b|\bstart-storybook\b"), 6006),
+    (re.compile(r"\bmanage\.py runserver\b"), 8000),
+    (re.compile(r"\buvicorn\b"), 8000),
+    (re.compile(r"\bflask run\b"), 5000),
+    (re.compile(r"\bgunicorn\b"), 8000),
+    (re.compile(r"\bhttp\.server\b"), 8000),
+    (re.compile(r"\bnest start\b"), 3000),
+    (re.compile(r"\b(?:nodemon|ts-node-dev|tsx watch|webpack serve|webpack-dev-server|http-server)\b"), None),
+    (re.compile(r"\b(?:docker compose|docker-compose) up\b"), None),
+    (re.compile(r"\b(?:cargo|parcel) watch\b"), None),
+    # --watch given to a tool known to keep watching (not "grep -w" or a build's own flags)
+    (re.compile(r"\b(?:tsc|webpack|rollup|esbuild|babel|swc|tsup|sass|tailwindcss|postcss|jest|vitest|mocha"
+                r"|node|deno|bun)\b[^&|;]*\s--watch(?:All)?\b"), None),
+]
+_PORT_RE = re.compile(r"(?:--port[= ]|(?:^|\s)-p\s+|\bPORT=|http\.server\s+)(\d{2,5})\b")
+# Listen addresses ("9000", "0.0.0.0:9000", "[::]:9000", "unix:/run/app.sock")
+_ADDRESS_RE = re.compile(
+    r"\brunserver\s+(?!-)(\S+)"
+    r"|\b(?:gunicorn|hypercorn|daphne)\b.*?\s(?:-b\s*|--bind[= ])(\S+)"
+    r"|--bind[= ](\S+)"
+)
+# "docker compose up -d" starts the containers and returns
+_DETACHED_RE = re.compile(r"\b(?:docker compose|docker-compose) up\b[^&|;]*\s(?:-d|--detach)(?:\s|$)")
+_RUNNER_RE = re.compile(r"^(?:npm run|pnpm(?: run)?|yarn(?: run)?|bun run|make|poetry run|pdm run|task)\s+([\w:.\-/]+)")
+_MAKE_TARGET = re.compile(r"^([A-Za-z0-9_][\w.\-/ ]*?)\s*:(?![:=])")
+
+COMPOSE_FILES = ("compose.yaml", "compose.yml", "docker-compose.yaml", "docker-compose.yml")
+
+_parse_cache: dict = {}
+_parse_lock = threading.Lock()
+
+
+def infer(name: str, body: str = "") -> tuple:
+    """(long_running, port, port_explicit) for a script from its name and what it runs."""
+    text = body or name
+    if _DETACHED_RE.search(text):
+        return False, None, False
+    port = None
+    explicit = False  # The command names its port or address: no tool default
+    match = _PORT_RE.search(text)
+    if match:
+        port = int(match.group(1))
+        explicit = True
+    else:
+        address = _ADDRESS_RE.search(text)
+        if address:
+            port = _address_port(next(group for group in address.groups() if group))
+            explicit = True
+    parts = set(re.split(r"[:_\-./\s]+", name.lower()))
+    long_running = bool(parts & LONG_RUNNING_NAMES) and ("watch" in parts or not parts & ONE_SHOT_NAMES)
+    for pattern, default_port in SERVER_TOOLS:
+        if pattern.search(text):
+            long_running = True
+            if not explicit:
+                port = default_port
+            break
+    if not long_running:
+        return False, None, False
+    return True, port, explicit and port is not None
+
+
+def _address_port(address: str) -> Optional[int]:
+    """Port of a listen address, or None if it has none (e.g. a unix socket)."""
+    match = re.fullmatch(r"(?:.*:)?(\d{1,5})", address.strip("\"'"))
+    return int(match.group(1)) if match else None
+
+
+def infer_command(command: str) -> tuple:
+    """(long_running, port, port_explicit) for a bare command line (e.g. typed, or a preset)."""
+    runner = _RUNNER_RE.match(command.strip())
+    return infer(runner.group(1) if runner else "", command)
+
+
+def _script(label: str, command: str, body: str = "") -> dict:
+    long_running, port, explicit = infer(label, body or command)
+    return {"label": label, "command": command, "long_running": long_running, "port": port,
+            "port_explicit": explicit}
+
+
+def _cached(path: str, parse) -> Optional[object]:
+    """parse(path), reused while the file's mtime and size are unchanged."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    key = (st.st_mtime_ns, st.st_size)
+    with _parse_lock:
+        cached = _parse_cache.get(path)
+        if cached and cached[0] == key:
+            return cached[1]
+    try:
+        result = parse(path)
+    except (OSError, ValueError) as e:
+        print(f"Error reading {path}: {e}")
+        result = None
+    with _parse_lock:
+        _parse_cache[path] = (key, result)
+    return result
+
+
+def _package_runner(project: str) -> tuple:
+    """(category, run prefix) from the lockfile present."""
+    for lockfile, category, prefix in (
+        ("pnpm-lock.yaml", "pnpm", "pnpm run"),
+        ("yarn.lock", "Yarn", "yarn run"),
+        ("bun.lockb", "Bun", "bun run"),
+        ("bun.lock", "Bun", "bun run"),
+    ):
+        if os.path.exists(os.path.join(project, lockfile)):
+            return category, prefix
+    return "NPM", "npm run"
+
+
+def _parse_package_json(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    scripts = data.get("scripts") if isinstance(data, dict) else None
+    return {k: v for k, v in (scripts or {}).items() if isinstance(v, str)}
+
+
+def _parse_makefile(path: str) -> list:
+    """(target, recipe) for explicit targets, skipping special and pattern rules."""
+    targets = []
+    current = None
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if line.startswith("\t"):
+                if current is not None:
+                    current[1].append(line.strip())
+                continue
+            current = None
+            match = _MAKE_TARGET.match(line)
+            if not match:
+                continue
+            for name in match.group(1).split():
+                if name.startswith(".") or "%" in name or name in (t for t, _ in targets):
+                    continue
+                current = (name, [])
+                targets.append(current)
+    return [(name, "\n".join(recipe)) for name, recipe in targets[:200]]
+
+
+def _parse_pyproject(path: str) -> list:
+    """(label, command) for project, poetry, pdm, hatch and taskipy scripts."""
+    if tomllib is None:
+        return []
+    with open(path, "rb") as f:
+        data = tomllib.load(f)
+    tool = data.get("tool", {})
+    scripts = []
+    for name in data.get("project", {}).get("scripts", {}):
+        scripts.append((name, name))  # Console entry points (.venv/bin is on PATH)
+    for name in tool.get("poetry", {}).get("scripts", {}):
+        scripts.append((name, f"poetry run {name}"))
+    for name in tool.get("pdm", {}).get("scripts", {}):
+        if not name.startswith("_"):
+            scripts.append((name, f"pdm run {name}"))
+    for name in tool.get("hatch", {}).get("envs", {}).get("default", {}).get("scripts", {}):
+        scripts.append((name, f"hatch run {name}"))
+    for name, task in tool.get("taskipy", {}).get("tasks", {}).items():
+        body = task if isinstance(task, str) else task.get("cmd", "") if isinstance(task, dict) else ""
+        scripts.append((name, f"task {name}", body))
+    return scripts
+
+
+def _compose_port(entry: str) -> Optional[int]:
+    """Host port of a compose port mapping ("3000:3000", "127.0.0.1:80:8080/tcp")."""
+    parts = entry.strip().strip("\"'").split("/")[0].split(":")
+    if len(parts) < 2:
+        return None  # Container-only port: the host side is random
+    host = parts[-2].split("-")[0]
+    return int(host) if host.isdigit() else None
+
+
+def _parse_compose(path: str) -> dict:
+    """Service name -> published host ports, read by indentation (no YAML dependency)."""
+    services = {}
+    in_services = False
+    service_indent = key_indent = None
+    current = None
+    in_ports = False
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        lines = f.read().splitlines()
+    for raw in lines:
+        line = raw.split(" #", 1)[0].rstrip()
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        indent = len(line) - len(line.lstrip())
+        text = line.strip()
+        if indent == 0:
+            in_services = text == "services:"
+            current = None
+            continue
+        if not in_services:
+            continue
+        if service_indent is None:
+            service_indent = indent
+        if indent == service_indent:
+            current = text.rstrip(":").strip("\"'")
+            services[current] = []
+            key_indent = None
+            in_ports = False
+            continue
+        if current is None:
+            continue
+        if key_indent is None:
+            key_indent = indent
+        if indent == key_indent:
+            in_ports = text.startswith("ports:")
+            inline = text[6:].strip() if in_ports else ""
+            if inline.startswith("["):
+                ports = [_compose_port(p) for p in inline.strip("[]").split(",") if p.strip()]
+                services[current] += [p for p in ports if p]
+        elif in_ports:
+            value = text[1:].strip() if text.startswith("-") else text
+            if value.startswith("published:"):
+                port = value.split(":", 1)[1].strip().strip("\"'")
+                if port.isdigit():
+                    services[current].append(int(port))
+            elif text.startswith("-") and ":" in value and not re.match(r"^\w+:\s", value):
+                port = _compose_port(value)
+                if port:
+                    services[current].append(port)
+    return services
+
+
+def discover_scripts(project: str) -> list:
+    """[(category, [script, ...]), ...] for the project's script sources."""
+    found = []
+    scripts = _cached(os.path.join(project, "package.json"), _parse_package_json)
+    if scripts:
+        category, prefix = _package_runner(project)
+        found.append((category, [_script(name, f"{prefix} {name}", body) for name, body in scripts.items()]))
+    for makefile in ("Makefile", "makefile", "GNUmakefile"):
+        targets = _cached(os.path.join(project, makefile), _parse_makefile)
+        if targets:
+            found.append(("Make", [_script(name, f"make {name}", recipe) for name, recipe in targets]))
+            break
+    entries = _cached(os.path.join(project, "pyproject.toml"), _parse_pyproject)
+    if entries:
+        found.append(("Python", [_script(*entry) for entry in entries]))
+    for compose_file in COMPOSE_FILES:
+        services = _cached(os.path.join(project, compose_file), _parse_compose)
+        if services:
+            compose = [
+                {"label": "up (all)", "command": "docker compose up", "long_running": True, "port": None,
+                 "port_explicit": False},
+                {"label": "down", "command": "docker compose down", "long_running": False, "port": None,
+                 "port_explicit": False},
+            ]
+            for name, ports in services.items():
+                compose.append({
+                    "label": name,
+                    "command": f"docker compose up {name}",
+                    "long_running": True,
+                    "port": ports[0] if ports else None,
+                    "port_explicit": bool(ports),
+                })
+            found.append(("Docker", compose))
+            break
+    return found
+
+
+def find_script(project: Optional[str], command: str) -> Optional[dict]:
+    """The discovered script for a command line, if the project defines it."""
+    if not project:
+        return None
+    for _, scripts in discover_scripts(project):
+        for script in scripts:
+            if script["command"] == command:
+                return script
+    return None
@@ -0,0 +1,189 @@
+"""Record a tab's output with timestamps (asciicast v2) and replay it into a tab."""
+
+import json
+import os
+import re
+import threading
+import time
+from typing import Callable, Optional
+
+from .config import ROOT_DIR
+
+RECORDINGS_DIR = ROOT_DIR / "recordings"
+# Label -> speed factor; 0 replays as fast as the tab accepts the output
+REPLAY_SPEEDS = {"1×": 1.0, "10×": 10.0, "Max": 0.0}
+
+
+def recording_path(name: str):
+    """A new file in RECORDINGS_DIR named after the tab and the time."""
+    safe = re.sub(r"[^\w.-]+", "_", name).strip("_") or "tab"
+    return RECORDINGS_DIR / f"{safe}-{time.strftime('%Y%m%d-%H%M%S')}.cast"
+
+
+class Recorder:
+    """Appends output chunks to an asciicast v2 file: a JSON header line,
+    then one ``[seconds, "o", text]`` line per chunk as it is read.
+
+    Chunks are stored as the process wrote them (colors and ``\r`` redraws
+    included), so the files play in asciinema as well. ``mode`` ("pty" or
+    "pipe") is kept in the header's ``env`` as ``TM_MODE``: only PTY output
+    goes through the terminal filter on replay. ``write`` is called on the
+    reader thread. A failed write (e.g. a full disk) closes the file
+    and calls ``on_error(exc)`` once.
+    """
+
+    def __init__(self, path, command: str = "", title: str = "", size: tuple = (50, 200),
+                 on_error: Callable = None, mode: str = "pty"):
+        self.path = path
+        self.events = 0
+        self.bytes = 0
+        self.error: Optional[OSError] = None
+        self.on_error = on_error
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = open(path, "w", encoding="utf-8", newline="\n")
+        header = {"version": 2, "width": size[1], "height": size[0], "timestamp": int(time.time()), "title": title,
+                  "env": {"TM_MODE": mode}}
+        if command:
+            header["command"] = command
+        self._file.write(json.dumps(header, ensure_ascii=False) + "\n")
+        self._start = time.monotonic()
+
+    def write(self, text: str):
+        with self._lock:
+            if self._file is None:
+                return
+            elapsed = round(time.monotonic() - self._start, 6)
+            try:
+                self._file.write(json.dumps([elapsed, "o", text], ensure_ascii=False, separators=(",", ":")) + "\n")
+            except OSError as e:
+                self.error = e
+                self._close()
+            else:
+                self.events += 1
+                self.bytes += len(text)
+                return
+        if self.on_error:
+            self.on_error(self.error)
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    def _close(self):
+        if self._file is None:
+            return
+        try:
+            self._file.close()
+        except OSError as e:
+            if self.error is None:
+                print(f"Error saving recording: {e}")
+        self._file = None
+
+
+def read_cast(path) -> tuple:
+    """(header, events) where events yields (seconds, type, data) lazily.
+
+    Raises ValueError if the file isn't an asciicast v2 recording.
+    """
+    f = open(path, "r", encoding="utf-8")
+    try:
+        header = json.loads(f.readline())
+        if not isinstance(header, dict) or header.get("version") != 2:
+            raise ValueError
+    except ValueError:
+        f.close()
+        raise ValueError(f"{os.path.basename(path)} is not an asciicast v2 recording")
+
+    def events():
+        with f:
+            for line in f:
+                try:
+                    seconds, kind, data = json.loads(line)
+                except (ValueError, TypeError):
+                    continue  # Torn last line of an interrupted recording
+                yield float(seconds), kind, data
+
+    return header, events()
+
+
+def cast_mode(header: dict) -> str:
+    """"pty" or "pipe": how the recorded output was read (other recorders' casts are PTY)."""
+    env = header.get("env")
+    mode = env.get("TM_MODE") if isinstance(env, dict) else None
+    return "pipe" if mode == "pipe" else "pty"
+
+
+class Replayer:
+    """Feeds a recording's output to ``sink`` on a thread, keeping the recorded
+    gaps scaled by ``speed`` (0 = no gaps).
+
+    ``sink`` may block (e.g. a full output queue); later chunks then follow
+    without delay until the replay is back on schedule, as a real pipe would.
+    ``on_done(events, elapsed_s, stopped)`` is called on the replay thread.
+    """
+
+    def __init__(self, path, sink: Callable, speed: float = 1.0, on_done: Callable = None):
+        self.header, self._events = read_cast(path)
+        self.path = path
+        self.sink = sink
+        self.speed = speed
+        self.on_done = on_done
+        self.events = 0
+        self._position = 0.0  # Recorded time of the last chunk sent
+        self._origin = (0.0, 0.0)  # (monotonic, recorded time) the schedule counts from
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._origin = (time.monotonic(), 0.0)
+        self._thread.start()
+
+    def set_speed(self, speed: float):
+        """Change speed from the current position on."""
+        with self._lock:
+            now = time.monotonic()
+            (wall, recorded), old = self._origin, self.speed
+            position = recorded + (now - wall) * old if old else self._position
+            self._origin = (now, max(position, self._position))
+            self.speed = speed
+        self._wake.set()
+
+    def stop(self):
+        self._stopped = True
+        self._wake.set()
+
+    def _wait_until(self, seconds: float) -> bool:
+        """Sleep until the chunk recorded at ``seconds`` is due. False if stopped."""
+        while not self._stopped:
+            with self._lock:
+                (wall, recorded), speed = self._origin, self.speed
+            if not speed:
+                return True
+            delay = wall + (seconds - recorded) / speed - time.monotonic()
+            if delay <= 0:
+                return True
+            if self._wake.wait(delay):
+                self._wake.clear()  # Speed changed or stopped: recompute
+        return False
+
+    def _run(self):
+        started = time.monotonic()
+        try:
+            for seconds, kind, data in self._events:
+                if kind != "o":
+                    continue
+                if not self._wait_until(seconds):
+                    break
+                with self._lock:
+                    self._position = seconds
+                self.sink(data)
+                self.events += 1
+        except OSError as e:
+            print(f"Error reading recording: {e}")
+        finally:
+            self._events.close()
+            if self.on_done:
+                self.on_done(self.events, time.monotonic() - started, self._stopped)
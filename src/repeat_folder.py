@@ -0,0 +1,76 @@
+"""Fold runs of repeated output lines into one line with a ×N counter."""
+
+import re
+
+FOLD_MODES = ("off", "exact", "numbers")
+
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+
+
+class RepeatFolder:
+    """Collapse consecutive identical lines in a stream of output chunks.
+
+    ``feed`` returns display operations in order: ``("text", str)`` to append
+    and ``("count", n)`` to set the repeat counter shown on the last line.
+    In ``numbers`` mode lines that only differ in their digits (timestamps,
+    attempt numbers, durations) count as repeats of the first one.
+    """
+
+    def __init__(self, mode: str = "exact"):
+        self.mode = mode if mode in FOLD_MODES else "off"
+        self.folded = 0          # Lines absorbed into a counter so far
+        self._last_key = None
+        self._count = 0
+        self._partial = False    # Last chunk ended mid-line
+
+    def reset(self):
+        """Forget the current run (something else was written to the display)."""
+        self._last_key = None
+        self._count = 0
+        self._partial = False
+
+    def _key(self, line: str):
+        if not line.strip():
+            return None  # Blank lines are never folded
+        return _NUMBER_RE.sub("#", line) if self.mode == "numbers" else line
+
+    def feed(self, text: str) -> list:
+        """Fold a chunk of output; returns the operations to apply to the display."""
+        if self.mode == "off":
+            return [("text", text)] if text else []
+        ops = []
+        buf = []
+        dirty = False
+        lines = text.split("\n")
+        tail = lines.pop()  # "" when the chunk ends with a newline
+        for i, line in enumerate(lines):
+            if i == 0 and self._partial:
+                # Continuation of a line already on screen: never a repeat
+                buf.append(line + "\n")
+                self._last_key = None
+                self._partial = False
+                continue
+            key = self._key(line)
+            if key is not None and key == self._last_key:
+                if buf:
+                    ops.append(("text", "".join(buf)))
+                    buf = []
+                self._count += 1
+                self.folded += 1
+                dirty = True
+                continue
+            if dirty:
+                ops.append(("count", self._count))
+                dirty = False
+            buf.append(line + "\n")
+            self._last_key = key
+            self._count = 1
+        if dirty:
+            ops.append(("count", self._count))
+        if tail:
+            buf.append(tail)
+            self._last_key = None
+            self._partial = True
+        if buf:
+            ops.append(("text", "".join(buf)))
+        return ops
@@ -0,0 +1,99 @@
+"""Per-project history of command runs (wall time, CPU, peak memory) and regression checks."""
+
+import json
+import os
+import statistics
+import threading
+from typing import Optional
+
+from .config import ROOT_DIR
+
+HISTORY_FILE = ROOT_DIR / "history.json"
+HISTORY_VERSION = 1
+# A run is one compact row: [started (epoch s), wall_s, cpu_s, peak_kb, exit_code]
+STARTED, WALL, CPU, PEAK_KB, EXIT_CODE = range(5)
+MIN_BASELINE_RUNS = 5    # Successful runs needed before flagging regressions
+MIN_SLOWDOWN_S = 2.0     # Ignore slowdowns that are large only in ratio (0.2s -> 0.5s)
+
+
+def format_duration(seconds: float) -> str:
+    """4.2s, 3m 05s, 1h 02m."""
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    minutes, secs = divmod(int(seconds), 60)
+    if minutes < 60:
+        return f"{minutes}m {secs:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m"
+
+
+class RunHistory:
+    """Runs per project and command, capped at ``max_runs`` each, saved as JSON."""
+
+    def __init__(self, path=HISTORY_FILE):
+        self.path = path
+        self._runs: Optional[dict] = None  # project -> command -> [row, ...]; loaded lazily
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        if self._runs is None:
+            self._runs = {}
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        state = json.load(f)
+                    if state.get("version") == HISTORY_VERSION:
+                        self._runs = state.get("runs", {})
+                except (json.JSONDecodeError, IOError):
+                    pass
+        return self._runs
+
+    def runs(self, project: str, command: str) -> list:
+        with self._lock:
+            return list(self._load().get(project, {}).get(command, []))
+
+    def baseline(self, project: str, command: str, window: int) -> tuple:
+        """Median wall time of the last ``window`` successful runs, and how many there were."""
+        durations = [row[WALL] for row in self.runs(project, command) if row[EXIT_CODE] == 0][-window:]
+        if not durations:
+            return None, 0
+        return statistics.median(durations), len(durations)
+
+    def check_regression(self, project: str, command: str, wall: float,
+                         window: int, factor: float) -> Optional[tuple]:
+        """(ratio, median, runs) if ``wall`` is ``factor`` times slower than the median, else None."""
+        median, count = self.baseline(project, command, window)
+        if count < MIN_BASELINE_RUNS or not median:
+            return None
+        if wall >= median * factor and wall - median >= MIN_SLOWDOWN_S:
+            return wall / median, median, count
+        return None
+
+    def record(self, project: str, command: str, started: float, wall: float,
+               cpu: Optional[float], peak_kb: Optional[int], exit_code: int, max_runs: int = 200):
+        """Append a run and save the file."""
+        row = [
+            round(started, 1),
+            round(wall, 3),
+            None if cpu is None else round(cpu, 3),
+            peak_kb,
+            exit_code,
+        ]
+        with self._lock:
+            rows = self._load().setdefault(project, {}).setdefault(command, [])
+            rows.append(row)
+            del rows[:-max_runs]
+            self._save()
+
+    def _save(self):
+        """Write atomically so a crash never leaves a torn file."""
+        tmp = self.path.with_suffix(".tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": HISTORY_VERSION, "runs": self._runs}, f, separators=(",", ":"))
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"Error saving run history: {e}")
+
+
+HISTORY = RunHistory()
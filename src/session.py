@@ -0,0 +1,64 @@
+"""Session persistence: open tabs, their commands and compressed scrollback."""
+
+import base64
+import json
+import os
+import zlib
+
+from .config import ROOT_DIR
+
+SESSION_FILE = ROOT_DIR / "session.json"
+SESSION_VERSION = 1
+
+
+def compress_scrollback(text: str, max_kb: int) -> str:
+    """Compress the last ``max_kb`` KB of text into a compact base64 blob."""
+    data = text.encode("utf-8", errors="replace")
+    limit = max_kb * 1024
+    if len(data) > limit:
+        data = data[-limit:]
+        # Don't start in the middle of a line (or a multi-byte character)
+        newline = data.find(b"\n")
+        if 0 <= newline < len(data) - 1:
+            data = data[newline + 1:]
+    return base64.b64encode(zlib.compress(data, 6)).decode("ascii")
+
+
+def decompress_scrollback(blob: str) -> str:
+    """Inverse of compress_scrollback."""
+    if not blob:
+        return ""
+    try:
+        return zlib.decompress(base64.b64decode(blob)).decode("utf-8", errors="replace")
+    except (ValueError, zlib.error):
+        return ""
+
+
+def save_session(state: dict) -> None:
+    """Write session state atomically so a crash never leaves a torn file."""
+    state = {"version": SESSION_VERSION, **state}
+    tmp = SESSION_FILE.with_suffix(".tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, separators=(",", ":"), ensure_ascii=False)
+        os.replace(tmp, SESSION_FILE)
+    except OSError as e:
+        print(f"Error saving session: {e}")
+
+
+def load_session() -> dict:
+    """Load the saved session, or an empty dict if there is none.
+
+    Scrollback blobs are returned still compressed; tabs decompress them
+    on first display.
+    """
+    if not SESSION_FILE.exists():
+        return {}
+    try:
+        with open(SESSION_FILE, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return {}
+    if state.get("version") != SESSION_VERSION:
+        return {}
+    return state
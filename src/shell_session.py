@@ -0,0 +1,122 @@
+"""Long-lived shell session that runs a tab's commands one after another."""
+
+import os
+import re
+import secrets
+import shlex
+import shutil
+import signal
+import subprocess
+import threading
+from typing import Callable, Optional
+
+
+class ShellSession:
+    """A persistent POSIX shell fed commands over stdin.
+
+    Each command is followed by a sentinel carrying a run number and the
+    exit code, so ``cd``, ``export`` and activated virtualenvs persist
+    between runs and no shell is started per command.
+    """
+
+    def __init__(self, cwd: str = None, env: dict = None,
+                 on_output: Callable = None, on_done: Callable = None, on_exit: Callable = None):
+        self.cwd = cwd
+        self.env = env
+        self.on_output = on_output    # (text) on the reader thread
+        self.on_done = on_done        # (run_id, exit_code) on the reader thread
+        self.on_exit = on_exit        # (exit_code) when the shell itself dies
+        self.process: Optional[subprocess.Popen] = None
+        self._nonce = secrets.token_hex(8)
+        self._marker = re.compile(rf"__TM_DONE_{self._nonce}_(\d+)_(-?\d+)__\n?")
+        self._run_id = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def supported() -> bool:
+        return os.name == "posix"
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        """Start the shell without rc files (they may print or prompt)."""
+        shell = shutil.which("bash")
+        argv = [shell, "--noprofile", "--norc"] if shell else ["/bin/sh"]
+        self.process = subprocess.Popen(
+            argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+            cwd=self.cwd,
+            env=self.env,
+            start_new_session=True
+        )
+        # A trap handler (not ignore) keeps the shell alive on Ctrl+C while
+        # children still get the default SIGINT behaviour. Commands run in a
+        # function (so cd/export persist) whose own trap returns from it: an
+        # interrupt aborts the rest of the command's list, not just its
+        # foreground job.
+        self._write(
+            "trap ':' INT\n"
+            "__tm_run() { trap 'trap : INT; return 130' INT; eval \"$1\"; "
+            "__tm_status=$?; trap : INT; return $__tm_status; }\n"
+        )
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def run(self, command: str, cwd: str = None) -> int:
+        """Queue a command; returns its run id (reported back via on_done)."""
+        with self._lock:
+            self._run_id += 1
+            run_id = self._run_id
+        prefix = f"cd -- {shlex.quote(cwd)} && " if cwd else ""
+        # One line, so bash parses all of it before running it: the command can't
+        # swallow the sentinel from stdin. The command goes through eval, so a
+        # malformed one (e.g. an unterminated quote) fails with a non-zero $?
+        # instead of a parse error that eats the sentinel.
+        self._write(
+            f"{prefix}__tm_run {shlex.quote(command)}; printf '__TM_DONE_{self._nonce}_{run_id}_%s__\\n' \"$?\"\n"
+        )
+        return run_id
+
+    def interrupt(self):
+        """Send SIGINT to the running command and abort the rest of it; the shell survives."""
+        if self.is_alive():
+            os.killpg(self.process.pid, signal.SIGINT)
+
+    def close(self):
+        """Kill the shell and everything it started."""
+        if self.is_alive():
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except OSError:
+                pass
+
+    def _write(self, text: str):
+        if not self.is_alive():
+            raise BrokenPipeError("shell session has exited")
+        self.process.stdin.write(text)
+        self.process.stdin.flush()
+
+    def _read(self):
+        process = self.process
+        try:
+            for line in iter(process.stdout.readline, ""):
+                match = self._marker.search(line)
+                if not match:
+                    self.on_output(line)
+                    continue
+                # Output without a trailing newline shares the sentinel's line
+                if match.start():
+                    self.on_output(line[:match.start()] + "\n")
+                self.on_done(int(match.group(1)), int(match.group(2)))
+            process.stdout.close()
+        except Exception as e:
+            self.on_output(f"\n[Error reading output: {e}]\n")
+        process.wait()
+        if self.on_exit:
+            self.on_exit(process.returncode)
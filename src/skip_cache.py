@@ -0,0 +1,171 @@
+"""Skip deterministic commands whose declared inputs haven't changed since their last successful run."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+from .commands import PRESET_INPUTS
+from .config import ROOT_DIR, get_setting
+from .file_watcher import PathFilter, glob_to_regex
+
+CACHE_FILE = ROOT_DIR / "skip_cache.json"
+CACHE_VERSION = 1
+
+
+def resolve_cache_spec(command: str) -> Optional[dict]:
+    """{"inputs": [...], "outputs": [...]} declared for a command, or None.
+
+    Presets come first, then "command_inputs" in config.json, then the
+    custom command's own "inputs"/"outputs" entries.
+    """
+    spec = dict(PRESET_INPUTS.get(command, {}))
+    spec.update((get_setting("command_inputs") or {}).get(command, {}))
+    for item in get_setting("custom_commands") or []:
+        if item.get("command") == command:
+            spec.update({key: item[key] for key in ("inputs", "outputs") if key in item})
+    if not spec.get("inputs"):
+        return None
+    return {"inputs": list(spec["inputs"]), "outputs": list(spec.get("outputs") or [])}
+
+
+def expand_inputs(root: str, patterns: list, ignore: list = None) -> list:
+    """Sorted relative paths of the files matched by input globs.
+
+    A plain directory means every file under it. Only the part of the tree
+    below a pattern's fixed prefix is walked, pruning ``ignore`` folders.
+    """
+    path_filter = PathFilter(ignore=ignore)
+    found = set()
+    for pattern in patterns:
+        pattern = pattern.strip().replace("\\", "/").removeprefix("./").strip("/")
+        regex = None
+        if "*" in pattern or "?" in pattern:
+            fixed = []
+            for part in pattern.split("/"):
+                if "*" in part or "?" in part:
+                    break
+                fixed.append(part)
+            prefix = "/".join(fixed)
+            regex = glob_to_regex(pattern)
+        else:
+            if os.path.isfile(os.path.join(root, pattern)):
+                found.add(pattern)
+                continue
+            prefix = pattern
+        top = os.path.join(root, prefix)
+        for dirpath, dirnames, filenames in os.walk(top):
+            below = os.path.relpath(dirpath, top).replace(os.sep, "/")
+            below = "" if below == "." else below + "/"
+            dirnames[:] = [d for d in dirnames if not path_filter.is_ignored(below + d)]
+            base = f"{prefix}/{below}" if prefix else below
+            for name in filenames:
+                rel = base + name
+                if regex is None or regex.match(rel):
+                    found.add(rel)
+    return sorted(found)
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha1(usedforsecurity=False)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class SkipCache:
+    """Input fingerprints of each command's last successful run, per project.
+
+    File digests are cached by (mtime, size), so re-checking an unchanged
+    tree only stats files instead of reading them. Called from worker
+    threads; one lock guards the data and the file.
+    """
+
+    def __init__(self, path=CACHE_FILE):
+        self.path = path
+        self._data: Optional[dict] = None
+        self._lock = threading.RLock()
+
+    def _load(self) -> dict:
+        if self._data is None:
+            self._data = {"files": {}, "runs": {}}
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        state = json.load(f)
+                    if state.get("version") == CACHE_VERSION:
+                        self._data = {"files": state["files"], "runs": state["runs"]}
+                except (json.JSONDecodeError, IOError, KeyError):
+                    pass
+        return self._data
+
+    def fingerprint(self, project: str, command: str, spec: dict) -> tuple:
+        """(key, file count) for the command's inputs as they are now."""
+        data = self._load()
+        slot = f"{project}\0{command}"
+        known = data["files"].get(slot, {})
+        files = {}
+        combined = hashlib.sha1(json.dumps([command, spec], sort_keys=True).encode(), usedforsecurity=False)
+        for rel in expand_inputs(project, spec["inputs"], get_setting("watch_ignore")):
+            try:
+                st = os.stat(os.path.join(project, rel))
+                cached = known.get(rel)
+                if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                    digest = cached[2]
+                else:
+                    digest = _file_digest(os.path.join(project, rel))
+            except OSError:
+                continue  # Vanished while checking
+            files[rel] = [st.st_mtime_ns, st.st_size, digest]
+            combined.update(f"{rel}\0{digest}\n".encode())
+        # Only this command's current inputs are kept, so the cache can't grow stale entries
+        data["files"][slot] = files
+        return combined.hexdigest(), len(files)
+
+    def check(self, project: str, command: str, spec: dict) -> Optional[str]:
+        """Why the command can be skipped, or None if it has to run."""
+        with self._lock:
+            return self._check(project, command, spec)
+
+    def _check(self, project: str, command: str, spec: dict) -> Optional[str]:
+        start = time.perf_counter()
+        last = self._load()["runs"].get(project, {}).get(command)
+        if not last:
+            return None
+        for output in spec["outputs"]:
+            if not os.path.exists(os.path.join(project, output)):
+                return None
+        key, count = self.fingerprint(project, command, spec)
+        if key != last:
+            return None
+        elapsed = (time.perf_counter() - start) * 1000
+        return f"{count} input file{'s' if count != 1 else ''} unchanged since the last successful run, checked in {elapsed:.0f} ms"
+
+    def record_success(self, project: str, command: str, spec: dict):
+        """Fingerprint the inputs after a successful run (the run may rewrite them, e.g. a lockfile)."""
+        with self._lock:
+            key, _ = self.fingerprint(project, command, spec)
+            self._load()["runs"].setdefault(project, {})[command] = key
+            self._save()
+
+    def forget(self, project: str, command: str):
+        with self._lock:
+            runs = self._load()["runs"].get(project, {})
+            if runs.pop(command, None):
+                self._save()
+
+    def _save(self):
+        """Write atomically so a crash never leaves a torn file."""
+        tmp = self.path.with_suffix(".tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_VERSION, **self._data}, f, separators=(",", ":"))
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"Error saving skip cache: {e}")
+
+
+SKIP_CACHE = SkipCache()
@@ -0,0 +1,62 @@
+"""Supervisor for a detached run: ``python -m src.supervisor <run_dir>``.
+
+Runs the command from ``run_dir/spec.json`` with its output appended to
+``run_dir/output.log``, then writes ``run_dir/exit.json`` with the exit
+code and resource usage. It runs in its own session, so it and the
+command outlive the app; the app tails the log and re-adopts the run on
+its next start.
+"""
+
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from .process_helper import wait_with_usage
+
+
+def _restore_sighup():
+    """Ignored signals survive exec: give the command the default SIGHUP back."""
+    signal.signal(signal.SIGHUP, signal.SIG_DFL)
+
+
+def main(argv: list) -> int:
+    run_dir = Path(argv[1])
+    with open(run_dir / "spec.json", "r", encoding="utf-8") as f:
+        spec = json.load(f)
+    if os.name != "nt":
+        # Stop signals go to the whole group: let the command handle them and
+        # stay around to record how it ended
+        signal.signal(signal.SIGTERM, lambda *_: None)
+        signal.signal(signal.SIGINT, lambda *_: None)
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    with open(run_dir / "output.log", "ab") as log:
+        try:
+            child = subprocess.Popen(
+                spec["args"],
+                shell=spec["shell"],
+                cwd=spec["cwd"],
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                stdin=subprocess.DEVNULL,
+                preexec_fn=_restore_sighup if os.name != "nt" else None,
+                creationflags=subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0
+            )
+        except OSError as e:
+            log.write(f"[Error starting process: {e}]\n".encode("utf-8"))
+            exit_code, cpu, peak_kb = 127, None, None
+        else:
+            exit_code, cpu, peak_kb = wait_with_usage(child)
+    result = {"exit_code": exit_code, "ended": time.time(), "cpu": cpu, "peak_kb": peak_kb}
+    tmp = run_dir / "exit.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(result, f)
+    os.replace(tmp, run_dir / "exit.json")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -3,10 +3,62 @@
 import subprocess
 import threading
 import queue
+import codecs
 import os
+import signal
+import struct
+import tempfile
+import time
+from tkinter import filedialog
 from typing import Optional, Callable
 import customtkinter as ctk
 
+try:
+    import fcntl
+    import pty
+    import termios
+except ImportError:  # Windows: pipes only
+    pty = None
+
+from .ansi import TerminalTextFilter
+from .config import get_setting
+from . import detached
+from .detached import DetachedRun, load_registry, remove_stale_dirs, start_detached
+from .file_watcher import FileWatcher
+from .json_logs import LEVELS, LogDetector, LogIndex, display_line, field_text, level_code, parse_json_line
+from .launcher import get_project_env, prepare_launch
+from .limits import HEAVY, describe_limits, make_preexec, priority_creationflags, resolve_limits
+from .metrics import METRICS
+from .problems import ProblemScanner
+from .problems_panel import ProblemsPanel
+from .process_helper import wait_with_usage
+from .recording import RECORDINGS_DIR, REPLAY_SPEEDS, Recorder, Replayer, cast_mode, recording_path
+from .repeat_folder import RepeatFolder
+from .run_history import HISTORY, format_duration
+from .session import compress_scrollback, decompress_scrollback
+from .shell_session import ShellSession
+from .skip_cache import SKIP_CACHE, resolve_cache_spec
+from .viewport import VirtualOutput
+
+OVERFLOW_POLICIES = ("block", "drop")
+OVERFLOW_LOG_DIR = os.path.join(tempfile.gettempdir(), "terminal-manager")
+PTY_SIZE = (50, 200)  # rows, columns reported to children
+QUEUE_ITEM_MAX_CHARS = 4096  # Longer lines are queued in pieces, so output_queue_max bounds memory too
+RESTORED_NOTE = "\n[Restored from previous session]\n"
+LOG_VIEW_BATCH = 500  # Retained lines re-formatted per tick when switching log views
+LOG_VIEWS = ("All", "Raw", *(f"≥ {level.capitalize()}" for level in LEVELS[1:5]), "Field…")
+
+
+class _ShownOffset(tuple):
+    """Queue marker (run, log offset): the detached run's output up to here is on screen."""
+
+
+class _LogLine(tuple):
+    """Queue item (line, record, shown) for a complete line, indexed on the reader thread.
+
+    ``shown`` is how much of the line was already displayed as a partial line.
+    """
+
 
 class TerminalTab(ctk.CTkFrame):
     """A single terminal tab with its own process."""
@@ -16,11 +68,62 @@ class TerminalTab(ctk.CTkFrame):
         
         self.tab_id = tab_id
         self.tab_name = name
-        self.output_queue = queue.Queue()
+        # Bounded so a fast producer can't grow memory or lag the display without limit
+        self.output_queue = queue.Queue(maxsize=get_setting("output_queue_max"))
+        self.overflow_policy = get_setting("output_overflow_policy")
+        self._drain_max_lines = get_setting("output_drain_max_lines")
+        self._dropped_lines = 0
+        self._dropped_lock = threading.Lock()
+        self._overflow_log = None
+        self._overflow_path: Optional[str] = None
+        self._closed = False
+        self.use_pty = bool(get_setting("use_pty")) and pty is not None
+        self._pty_fd: Optional[int] = None
+        self._own_session = False
+        self._reader_thread: Optional[threading.Thread] = None
+        self._output_listeners: list = []
+        self._folder = RepeatFolder(get_setting("fold_repeats"))
+        self._fold_len = 0  # Length of the live ×N counter on the last line
+        self._json_logs = bool(get_setting("json_logs"))
+        self.log_index: Optional[LogIndex] = None  # Created once JSON log lines show up
+        self._log_detector = LogDetector()
+        self._log_lock = threading.Lock()  # Index and partial line: reader threads vs. Tk
+        self._log_view = None        # None (formatted), "raw" or (min_level, (key, value))
+        self._log_partial = ""       # Incomplete line waiting for its newline
+        self._log_partial_shown = 0  # How much of it is already on screen
+        self._log_render_seq = 0     # Bumped to cancel an unfinished view switch
+        self._log_held: Optional[list] = None  # New output held back while one renders
+        self.persistent_shell = bool(get_setting("persistent_shell")) and ShellSession.supported()
+        self._shell: Optional[ShellSession] = None
+        self._shell_cwd: Optional[str] = None
+        self._shell_run_id = 0
+        self._shell_pending: Optional[int] = None
+        self._shell_idle = threading.Event()
+        self._run_seq = 0
+        self._queued = False  # Waiting for a heavy-command slot
+        self._starting = False  # Leaving the queue: not running yet, but not idle
+        self._checking = False  # Skip-cache inputs are being fingerprinted on a worker thread
+        self._stop_requested = False  # The user pressed Stop during the current run
+        self._run_started: Optional[tuple] = None  # (epoch, monotonic, project, command)
+        self._cache_run: Optional[tuple] = None    # (project, command, spec) for the skip cache
+        # Fed on the reader thread; the panel is refreshed from _poll_output
+        self.problems = ProblemScanner(get_setting("problem_matchers")) if get_setting("problems") else None
+        self._problems_visible = False
+        self.detached = bool(get_setting("detached_processes")) and detached.supported()
+        self.detached_run: Optional[DetachedRun] = None
+        self.restored_run: Optional[tuple] = None  # (run_id, log offset) from the saved session
+        self.recorder: Optional[Recorder] = None
+        self.replayer: Optional[Replayer] = None
         self.process: Optional[subprocess.Popen] = None
         self.is_running = False
         self.on_close = on_close
         self.on_process_end: Optional[Callable] = None
+        self.watcher: Optional[FileWatcher] = None
+        self.watch_include: list = []
+        self._output_version = 0
+        self._pending_history: Optional[str] = None
+        self._session_cache: tuple = (None, None)
+        self.metrics = METRICS.register(tab_id, name)
         
         self._setup_ui()
         self._poll_output()
@@ -42,6 +145,15 @@ class TerminalTab(ctk.CTkFrame):
         )
         self.status_label.pack(side="left")
         
+        # Last run's duration, CPU time and peak memory
+        self.duration_label = ctk.CTkLabel(
+            self.header,
+            text="",
+            text_color="#9E9E9E",
+            font=("Consolas", 11)
+        )
+        self.duration_label.pack(side="left", padx=(10, 0))
+        
         self.action_btn = ctk.CTkButton(
             self.header,
             text="⏹ Stop",
@@ -63,80 +175,557 @@ class TerminalTab(ctk.CTkFrame):
         )
         self.clear_btn.pack(side="right", padx=2)
         
-        # Terminal output area
-        self.output = ctk.CTkTextbox(
+        self.watch_btn = ctk.CTkButton(
+            self.header,
+            text="👁 Watch",
+            width=80,
+            height=24,
+            fg_color="transparent",
+            border_width=1,
+            command=self._on_watch_click
+        )
+        self.watch_btn.pack(side="right", padx=2)
+        
+        self.record_btn = ctk.CTkButton(
+            self.header,
+            text="⏺ Rec",
+            width=90,
+            height=24,
+            fg_color="transparent",
+            border_width=1,
+            command=self._on_record_click
+        )
+        self.record_btn.pack(side="right", padx=2)
+        
+        # Replay speed, shown while a recording is replayed
+        self.replay_menu = ctk.CTkOptionMenu(
+            self.header,
+            values=list(REPLAY_SPEEDS),
+            command=self._on_replay_speed,
+            width=70,
+            height=24
+        )
+        
+        self.policy_menu = ctk.CTkOptionMenu(
+            self.header,
+            values=list(OVERFLOW_POLICIES),
+            command=self.set_overflow_policy,
+            width=80,
+            height=24
+        )
+        self.policy_menu.set(self.overflow_policy)
+        self.policy_menu.pack(side="right", padx=2)
+        
+        # JSON log view filter, shown once JSON lines are detected
+        self.log_menu = ctk.CTkOptionMenu(
+            self.header,
+            values=list(LOG_VIEWS),
+            command=self._on_log_view,
+            width=100,
+            height=24
+        )
+        self.log_menu.set("All")
+        
+        # Problems found in the output, shown once there are any
+        self.problems_btn = ctk.CTkButton(
+            self.header,
+            text="✗ 0",
+            width=60,
+            height=24,
+            fg_color="transparent",
+            border_width=1,
+            command=self._toggle_problems
+        )
+        self.problems_panel = ProblemsPanel(
             self,
-            font=("Consolas", 11),
-            fg_color="#1a1a1a",
-            text_color="#e0e0e0",
-            wrap="word"
+            on_select=self._jump_to_problem,
+            on_close=self._toggle_problems
         )
+        
+        # Terminal output area
+        if get_setting("output_view") == "virtual":
+            # Draws only the visible rows: stays fast with millions of lines
+            self.output = VirtualOutput(
+                self,
+                font=("Consolas", 11),
+                fg_color="#1a1a1a",
+                text_color="#e0e0e0"
+            )
+        else:
+            self.output = ctk.CTkTextbox(
+                self,
+                font=("Consolas", 11),
+                fg_color="#1a1a1a",
+                text_color="#e0e0e0",
+                wrap="word"
+            )
         self.output.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
+        self.output.tag_config("repeat", foreground="#9E9E9E")
+        self.output.tag_config("problem", background="#5c2b2b")
         self.output.configure(state="disabled")
     
     def _poll_output(self):
         """Poll the output queue and update the display."""
         if not self.winfo_exists():
             return
-            
+        
+        drained = self._drain_output(self._drain_max_lines)
+        if self.problems is not None and self.problems.changed:
+            self._refresh_problems()
+        
+        # Schedule next poll (sooner if we're still behind)
+        if self.winfo_exists():
+            self.after(10 if drained >= self._drain_max_lines else 50, self._poll_output)
+    
+    def _drain_output(self, max_lines: int) -> int:
+        """Move up to max_lines queued lines into the widget. Returns lines moved."""
+        depth = self.output_queue.qsize()
+        batch = []
+        start = time.perf_counter()
+        taken = 0
         try:
-            while True:
-                line = self.output_queue.get_nowait()
-                self._append_text(line)
+            # Bounded per tick so one chatty tab can't stall the UI
+            while taken < max_lines:
+                item = self.output_queue.get_nowait()
+                kind = type(item)
+                if kind is _ShownOffset:
+                    item[0].shown_offset = item[1]
+                    continue
+                taken += 1
+                if kind is _LogLine:
+                    line, record, shown = item
+                    display = self._format_log_line(line, record)
+                    if display is not None:
+                        batch.append(display[shown:] + "\n")
+                    continue
+                batch.append(item)
         except queue.Empty:
             pass
         
-        # Schedule next poll
-        if self.winfo_exists():
-            self.after(50, self._poll_output)
+        with self._dropped_lock:
+            dropped, self._dropped_lines = self._dropped_lines, 0
+            if dropped and self._overflow_log:
+                try:
+                    self._overflow_log.flush()  # The note must point at a complete file
+                except OSError:
+                    pass
+            overflow_path = self._overflow_path
+        if dropped:
+            batch.append(f"… {dropped:,} lines elided, see {overflow_path}\n")
+        
+        if batch:
+            text = "".join(batch)
+            if self._log_held is not None:
+                self._log_held.append(text)  # Goes after the older lines being re-formatted
+                text = ""
+            # One widget insert per tick instead of one per line
+            self._write_output(self._folder.feed(text))
+            self.metrics.lines_folded = self._folder.folded
+        self.metrics.record_drain(depth, taken, (time.perf_counter() - start) * 1000)
+        return taken
+    
+    def _log_items(self, text: str) -> Optional[list]:
+        """Parse and index complete lines for the log view (reader thread).
+
+        Returns the queue items for ``text``, or None while the tab isn't
+        showing JSON logs (the text is then queued as is).
+        """
+        with self._log_lock:
+            if self.log_index is None:
+                seen = self._log_detector.partial  # Already queued as plain text
+                if not self._log_detector.feed(text):
+                    return None
+                self.log_index = LogIndex(get_setting("json_log_max_lines"),
+                                          int(get_setting("json_log_max_mb") * 1024 * 1024))
+                self._log_partial, self._log_partial_shown = seen, len(seen)
+                try:
+                    self.after(0, lambda: self.log_menu.pack(side="right", padx=2))
+                except Exception:
+                    pass
+            lines = (self._log_partial + text).split("\n")
+            partial = lines.pop()
+            shown = self._log_partial_shown
+            items = []
+            for line in lines:
+                record = parse_json_line(line)
+                self.log_index.add(line, record)
+                items.append(_LogLine((line, record, shown)))
+                shown = 0
+            self._log_partial = partial
+            # Show plain partial lines (prompts) now; hold back ones that may be JSON
+            if partial[shown:] and self._log_view is None and not partial.lstrip().startswith("{"):
+                items.append(partial[shown:])
+                shown = len(partial)
+            self._log_partial_shown = shown
+        return items
+    
+    def _format_log_line(self, line: str, record: Optional[dict]) -> Optional[str]:
+        """A line as the current log view shows it (None if filtered out)."""
+        view = self._log_view
+        if view == "raw":
+            return line
+        if view is None:
+            return display_line(line, record)
+        min_level, field = view
+        if record is None or level_code(record) < min_level:
+            return None
+        if field:
+            key, value = field
+            if key not in record or field_text(record[key]) != value:
+                return None
+        return display_line(line, record)
+    
+    def _on_log_view(self, choice: str):
+        """Log filter menu: All, Raw, a minimum level, or a key=value field."""
+        if choice == "All":
+            view = None
+        elif choice == "Raw":
+            view = "raw"
+        elif choice == "Field…":
+            dialog = ctk.CTkInputDialog(
+                text="Show log lines where a field has a value (key=value):",
+                title="Filter Logs"
+            )
+            answer = dialog.get_input()
+            if not answer or "=" not in answer:
+                self.log_menu.set(self._log_view_label())
+                return
+            key, value = (part.strip() for part in answer.split("=", 1))
+            view = (0, (key, value))
+        else:
+            view = (LEVELS.index(choice[2:].lower()) + 1, None)
+        self.set_log_view(view)
+        self.log_menu.set(self._log_view_label())
+    
+    def _log_view_label(self) -> str:
+        view = self._log_view
+        if view is None:
+            return "All"
+        if view == "raw":
+            return "Raw"
+        min_level, field = view
+        return f"{field[0]}={field[1]}" if field else f"≥ {LEVELS[min_level - 1].capitalize()}"
+    
+    def set_log_view(self, view):
+        """Redisplay retained lines for a log view, using the index (no re-scan).
+
+        Lines are re-formatted LOG_VIEW_BATCH per tick; output arriving
+        meanwhile is held and shown after them.
+        """
+        if self.log_index is None:
+            return
+        self._log_view = view
+        index = self.log_index
+        limit = get_setting("json_view_max_lines")
+        with self._log_lock:
+            retained = len(index)
+            if view is None or view == "raw":
+                total = retained
+                numbers = range(index.dropped + max(0, total - limit), index.dropped + total)
+            else:
+                matches = index.matches(*view)
+                total = len(matches)
+                numbers = [number + index.dropped for number in matches[-limit:]]
+        note = f"[{self._log_view_label()}: {total:,} of {retained:,} lines"
+        if total > limit:
+            note += f", showing the last {limit:,}"
+        self._clear_output()
+        self._append_text(note + "]\n")
+        self._log_render_seq += 1
+        self._log_held = []
+        self._render_log_lines(numbers, 0, self._log_render_seq)
+    
+    def _render_log_lines(self, numbers, start: int, seq: int):
+        """Show the next batch of a view switch (``numbers`` count dropped lines too)."""
+        if seq != self._log_render_seq or not self.winfo_exists():
+            return
+        index, view = self.log_index, self._log_view
+        end = min(len(numbers), start + LOG_VIEW_BATCH)
+        with self._log_lock:
+            raws = [index.lines.line(number - index.dropped) for number in numbers[start:end]
+                    if number >= index.dropped]  # Older ones were compacted away since the switch began
+        lines = []
+        for raw in raws:
+            record = parse_json_line(raw) if view != "raw" else None
+            lines.append(display_line(raw, record) + "\n")
+        if lines:
+            self._append_text("".join(lines))
+        if end < len(numbers):
+            self.after(1, lambda: self._render_log_lines(numbers, end, seq))
+            return
+        held, self._log_held = self._log_held, None
+        if held:
+            self._write_output(self._folder.feed("".join(held)))
     
     def _append_text(self, text: str):
         """Append text to the output widget."""
-        if not self.winfo_exists():
+        self._folder.reset()
+        self._write_output([("text", text)])
+    
+    def _write_output(self, ops: list):
+        """Apply RepeatFolder operations to the output widget."""
+        if not self.winfo_exists() or not ops:
             return
+        self._output_version += 1
+        start = time.perf_counter()
         self.output.configure(state="normal")
-        self.output.insert("end", text)
+        for op, value in ops:
+            if op == "text":
+                if "\r" in value:
+                    value = self._redraw_open_line(value)
+                self.output.insert("end", value)
+                self._fold_len = 0
+            else:
+                self._set_repeat_count(value)
         self.output.see("end")
         self.output.configure(state="disabled")
+        self.metrics.record_insert((time.perf_counter() - start) * 1000)
+    
+    def _redraw_open_line(self, text: str) -> str:
+        """Apply "\r" (replace the open last line) marks from TerminalTextFilter.
+
+        Frames within ``text`` collapse here; only a frame replacing a line
+        already in the widget deletes from it. Returns the text to insert.
+        """
+        pieces = text.split("\r")
+        text = pieces[0]
+        for piece in pieces[1:]:
+            if "\n" in text:
+                text = text[:text.rindex("\n") + 1] + piece
+            else:
+                self.output.delete("end-1c linestart", "end-1c")
+                text = piece
+        return text
+    
+    def _set_repeat_count(self, count: int):
+        """Show or update the ×N counter at the end of the last line, in place."""
+        counter = f"  ×{count}"
+        # "end-2c" is the last line's newline (Tk keeps one more after it)
+        if self._fold_len:
+            self.output.delete(f"end-{self._fold_len + 2}c", "end-2c")
+        self.output.insert("end-2c", counter, "repeat")
+        self._fold_len = len(counter)
     
     def _read_output(self, pipe, is_error=False):
         """Read output from a pipe in a separate thread."""
         try:
             for line in iter(pipe.readline, ''):
                 if line:
-                    self.output_queue.put(line)
+                    self._handle_output(line)
             pipe.close()
         except Exception as e:
-            self.output_queue.put(f"\n[Error reading output: {e}]\n")
+            self._enqueue_output(f"\n[Error reading output: {e}]\n")
+    
+    def _read_pty(self, fd: int):
+        """Read raw output from a pseudo-terminal master in a separate thread."""
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        text_filter = TerminalTextFilter()
+        try:
+            while True:
+                try:
+                    data = os.read(fd, 65536)
+                except OSError:
+                    break  # EIO once the child side is closed
+                if not data:
+                    break
+                raw = decoder.decode(data)
+                self._handle_output(text_filter.feed(raw), raw)
+        except Exception as e:
+            self._enqueue_output(f"\n[Error reading output: {e}]\n")
+        finally:
+            if self._pty_fd == fd:
+                self._pty_fd = None
+            os.close(fd)
+    
+    def _handle_output(self, text: str, raw: str = None):
+        """Route output read from the child (reader thread).
+
+        ``raw`` is the chunk before TerminalTextFilter (PTY reads); the
+        recorder keeps that, and replay filters it again.
+        """
+        recorder = self.recorder
+        if recorder and (raw or text):
+            recorder.write(text if raw is None else raw)
+        if not text:
+            return
+        self.metrics.record_input(text)
+        if self.problems is not None:
+            self.problems.feed(text)
+        self._publish_output(text)
+        items = self._log_items(text) if self._json_logs else None
+        if items is None:
+            self._enqueue_output(text)
+            return
+        for item in items:
+            self._enqueue_item(item)
+    
+    def add_output_listener(self, callback: Callable):
+        """Receive raw output chunks as they are read (called on the reader thread)."""
+        self._output_listeners.append(callback)
+    
+    def remove_output_listener(self, callback: Callable):
+        try:
+            self._output_listeners.remove(callback)
+        except ValueError:
+            pass
+    
+    def _publish_output(self, text: str):
+        for callback in list(self._output_listeners):
+            try:
+                callback(text)
+            except Exception:
+                pass
+    
+    def _enqueue_output(self, text: str):
+        """Queue output for display, one line (or piece of a long line) per item.
+
+        PTY and detached reads arrive in chunks of up to 64 KB; splitting them
+        keeps the output_queue_max bound meaningful.
+        """
+        if len(text) <= QUEUE_ITEM_MAX_CHARS and "\n" not in text[:-1]:
+            self._enqueue_item(text)
+            return
+        start = 0
+        while start < len(text) and not self._closed:
+            end = text.find("\n", start, start + QUEUE_ITEM_MAX_CHARS)
+            end = end + 1 if end != -1 else min(len(text), start + QUEUE_ITEM_MAX_CHARS)
+            self._enqueue_item(text[start:end])
+            start = end
+    
+    def _enqueue_mark(self, mark):
+        """Queue a marker behind the output; dropped if the queue is full in drop mode."""
+        if self.overflow_policy == "drop":
+            try:
+                self.output_queue.put_nowait(mark)
+            except queue.Full:
+                pass  # A later mark covers it
+        else:
+            self._enqueue_item(mark)
+    
+    def _enqueue_item(self, line: str):
+        """Queue one item, applying the overflow policy when full."""
+        if self.overflow_policy == "drop":
+            try:
+                self.output_queue.put_nowait(line)
+            except queue.Full:
+                self._log_dropped(line if type(line) is str else line[0] + "\n")
+            return
+        # Block: stop reading so the pipe fills and the child waits for us
+        while not self._closed:
+            try:
+                self.output_queue.put(line, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+    
+    def _log_dropped(self, line: str):
+        """Write a line that didn't fit in the queue to the run's overflow log (reader thread)."""
+        with self._dropped_lock:
+            if self._closed:
+                return
+            self._dropped_lines += 1
+            try:
+                if self._overflow_log is None:
+                    os.makedirs(OVERFLOW_LOG_DIR, exist_ok=True)
+                    # One file per run: tab ids repeat across runs and sessions
+                    name = f"{self.tab_id}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{self._run_seq}-overflow.log"
+                    self._overflow_path = os.path.join(OVERFLOW_LOG_DIR, name)
+                    self._overflow_log = open(self._overflow_path, "w", encoding="utf-8")
+                self._overflow_log.write(line)
+            except OSError:
+                pass
+    
+    def _close_overflow_log(self):
+        """Finish the current run's overflow log; the next drop starts a new one."""
+        with self._dropped_lock:
+            if self._overflow_log:
+                try:
+                    self._overflow_log.close()
+                except OSError:
+                    pass
+                self._overflow_log = None
+    
+    def set_overflow_policy(self, policy: str):
+        """Choose what happens when output arrives faster than it can be shown."""
+        if policy in OVERFLOW_POLICIES:
+            self.overflow_policy = policy
+    
+    def destroy(self):
+        """Release reader threads blocked on a full queue, then destroy the tab."""
+        self._closed = True
+        HEAVY.cancel(self.tab_id)
+        HEAVY.release(self.tab_id)
+        if self.replayer:
+            self.replayer.stop()
+        if self.recorder:
+            self.recorder.close()
+        if self._shell:
+            self._shell.close()
+            self._shell = None
+        self._close_overflow_log()
+        super().destroy()
     
     def _monitor_process(self):
         """Monitor process and update status when it ends."""
         # Capture process in local variable to avoid race conditions
         process = self.process
+        reader = self._reader_thread
         if process:
-            process.wait()
-            exit_code = process.returncode
+            exit_code, cpu, peak_kb = wait_with_usage(process)
+            usage = (time.monotonic(), cpu, peak_kb)
+            # Let the reader queue the tail of the output before we report the exit
+            # (bounded: a background grandchild may keep the pipe open)
+            if reader:
+                reader.join(timeout=2)
+            
+            # A restart already replaced this process; leave the new one alone
+            if self.process is not None and self.process is not process:
+                return
             
             self.is_running = False
             self.process = None
             
             # Update status on main thread
             try:
-                self.after(0, lambda: self._on_process_complete(exit_code))
+                self.after(0, lambda seq=self._run_seq: self._on_process_complete(exit_code, seq, usage))
             except Exception:
                 pass
     
+    def is_busy(self) -> bool:
+        """Running, or a run is queued or about to start (read from other threads)."""
+        return self.is_running or self._queued or self._starting or self._checking
+
     def _on_action_click(self):
         """Handle action button click (Stop/Restart)."""
-        if self.is_running:
+        if self._queued:
+            self._cancel_queued()
+        elif self.replayer:
+            self.replayer.stop()
+        elif self.is_running:
             self.stop_process()
         else:
             self.restart_process()
 
-    def _on_process_complete(self, exit_code: int):
-        """Handle process completion."""
+    def _on_process_complete(self, exit_code: int, run_seq: int = None, usage: tuple = None):
+        """Handle process completion. ``usage`` is (ended monotonic, cpu_s, peak_kb)."""
         if not self.winfo_exists():
             return
+        if run_seq is not None and run_seq != self._run_seq:
+            return  # A newer run has started since; its own completion will follow
+        if self._stop_requested and exit_code == 0:
+            exit_code = 130  # Stopped by the user, even if what was left of it exited cleanly
+        cache_run, self._cache_run = self._cache_run, None
+        if cache_run and exit_code == 0:
+            # Fingerprint off the Tk thread, and only then free the heavy slot:
+            # a duplicate queued for it is then skipped instead of re-run
+            threading.Thread(target=self._record_success, args=(*cache_run, self._run_seq), daemon=True).start()
+        else:
+            if cache_run:
+                SKIP_CACHE.forget(*cache_run[:2])  # Outputs may be half-written
+            HEAVY.release(self.tab_id)
+        
+        # Show remaining output before the exit message
+        self._drain_output(self.output_queue.maxsize or self._drain_max_lines)
 
         # Change button to Restart
         self.action_btn.configure(
@@ -149,27 +738,105 @@ class TerminalTab(ctk.CTkFrame):
         if exit_code == 0:
             self.set_status("✓ Completed", "#4CAF50")
             self._append_text(f"\n[Process completed successfully]\n")
-        elif exit_code == -15 or exit_code == 1:  # SIGTERM or generic error
+        elif exit_code in (-15, 1, 130):  # SIGTERM, generic error or Ctrl+C
             self.set_status("■ Stopped", "#FF9800")
         else:
             self.set_status(f"✗ Exit: {exit_code}", "#f44336")
             self._append_text(f"\n[Process exited with code {exit_code}]\n")
+        self._record_run(exit_code, usage or (time.monotonic(), None, None))
         
         if self.on_process_end:
             self.on_process_end(self.tab_id)
     
-    def run_command(self, command: str, cwd: str = None):
-        """Run a command and display output."""
+    def _record_success(self, project: str, command: str, spec: dict, run_seq: int):
+        """Store the inputs' fingerprint after a successful run (worker thread)."""
+        try:
+            SKIP_CACHE.record_success(project, command, spec)
+        except Exception as e:
+            print(f"Error recording inputs: {e}")
+        try:
+            self.after(0, lambda: self._run_seq == run_seq and HEAVY.release(self.tab_id))
+        except Exception:
+            pass  # Tab closed meanwhile: destroy() released the slot
+    
+    def _record_run(self, exit_code: int, usage: tuple):
+        """Show the run's duration badge and store it; flag runs much slower than usual."""
+        started, self._run_started = self._run_started, None
+        if not started:
+            return
+        wall_start, mono_start, project, command = started
+        ended, cpu, peak_kb = usage
+        wall = max(0.0, ended - mono_start)
+        parts = [f"⏱ {format_duration(wall)}"]
+        if cpu is not None:
+            parts.append(f"cpu {format_duration(cpu)}")
+        if peak_kb:
+            parts.append(f"{peak_kb / 1024:.0f} MB")
+        regression = None
+        if get_setting("run_history"):
+            if exit_code == 0:
+                regression = HISTORY.check_regression(
+                    project, command, wall,
+                    get_setting("regression_window"),
+                    get_setting("regression_factor")
+                )
+            HISTORY.record(project, command, wall_start, wall, cpu, peak_kb, exit_code, get_setting("run_history_max"))
+        if regression:
+            ratio, median, count = regression
+            parts.append(f"▲{ratio:.1f}×")
+            self._append_text(
+                f"[⚠ Slow run: {command} took {ratio:.1f}× its {count}-run median "
+                f"({format_duration(wall)} vs {format_duration(median)})]\n"
+            )
+        self.duration_label.configure(
+            text="  ".join(parts),
+            text_color="#FF9800" if regression else "#9E9E9E"
+        )
+    
+    def run_command(self, command: str, cwd: str = None, use_pty: bool = None, force: bool = False):
+        """Run a command and display output.
+
+        Commands with declared inputs are skipped while those are unchanged
+        since their last successful run, unless ``force`` is set.
+        """
         if self.is_running:
             self._append_text("\n[Process already running]\n")
             return False
+        if self.replayer:
+            self._append_text("\n[Replay in progress]\n")
+            return False
+        if self._checking and not force:
+            self._append_text("\n[Checking inputs of the previous command]\n")
+            return False
+        
+        cache_spec = resolve_cache_spec(command) if get_setting("skip_cache") else None
+        if cache_spec and not force:
+            self._check_unchanged(command, cwd, use_pty, cache_spec)
+            return True
+        
+        limits = resolve_limits(command)
+        if limits.get("heavy") and not self._acquire_heavy_slot(command, cwd, use_pty):
+            return True
         
         # Store for restart
         self.last_cmd = command
         self.last_cwd = cwd
+        self._run_seq += 1
+        self._stop_requested = False
+        self._close_overflow_log()
+        project = os.path.abspath(cwd or os.getcwd())
+        self._run_started = (time.time(), time.monotonic(), project, command)
+        self._cache_run = (project, command, cache_spec) if cache_spec else None
+        self.duration_label.configure(text="")
+        if self.problems is not None:
+            self.problems.reset()
         
         self._append_text(f"\n$ {command}\n")
         self._append_text("-" * 50 + "\n")
+        if self.recorder:
+            self.recorder.write(f"\n$ {command}\n" + "-" * 50 + "\n")
+        if describe_limits(limits):
+            self._append_text(f"[Limits: {describe_limits(limits)}]\n")
         self.set_status("● Running...", "#2196F3")
         
         # Change button to Stop
@@ -180,29 +847,28 @@ class TerminalTab(ctk.CTkFrame):
             state="normal"
         )
         
+        if use_pty is None:
+            use_pty = self.use_pty
+        
         try:
-            self.process = subprocess.Popen(
-                command,
-                shell=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                stdin=subprocess.PIPE,
-                text=True,
-                encoding='utf-8',
-                errors='replace',  # Replace invalid characters instead of crashing
-                bufsize=1,
-                cwd=cwd,
-                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
-            )
+            if self.persistent_shell:
+                if any(key != "heavy" for key in limits):
+                    self._append_text("[Resource limits are not applied in persistent shell mode]\n")
+                self._run_in_shell(command, cwd)
+                self.is_running = True
+                return True
             
-            self.is_running = True
+            if self.detached:
+                self._follow_detached(start_detached(command, cwd, self.tab_name, limits))
+                self.is_running = True
+                return True
             
-            # Start output reader thread
-            threading.Thread(
-                target=self._read_output,
-                args=(self.process.stdout,),
-                daemon=True
-            ).start()
+            if use_pty and pty is not None:
+                self._start_pty_process(command, cwd, limits)
+            else:
+                self._start_pipe_process(command, cwd, limits)
+            
+            self.is_running = True
             
             # Start process monitor thread
             threading.Thread(
@@ -214,27 +880,371 @@ class TerminalTab(ctk.CTkFrame):
             
         except Exception as e:
             self._append_text(f"\n[Error starting process: {e}]\n")
+            HEAVY.release(self.tab_id)
+            self._run_started = None
+            self._cache_run = None
             self.set_status("✗ Error", "#f44336")
             self.action_btn.configure(state="disabled") # Disable if failed to start
             return False
             
+    def _check_unchanged(self, command: str, cwd: str, use_pty: bool, spec: dict):
+        """Fingerprint the command's inputs on a worker thread, then skip or run it."""
+        project = os.path.abspath(cwd or os.getcwd())
+        handoff = self._starting  # Started from the heavy queue: pass the slot on if skipped
+        self._checking = True
+        self.set_status("⏳ Checking inputs...", "#9E9E9E")
+        
+        def check():
+            try:
+                reason = SKIP_CACHE.check(project, command, spec)
+            except Exception as e:
+                print(f"Error checking inputs: {e}")
+                reason = None
+            try:
+                self.after(0, lambda: self._on_inputs_checked(command, cwd, use_pty, reason, handoff))
+            except Exception:
+                pass  # Tab closed meanwhile
+        
+        threading.Thread(target=check, daemon=True).start()
+    
+    def _on_inputs_checked(self, command: str, cwd: str, use_pty: bool, reason: Optional[str], handoff: bool):
+        if self._closed or not self.winfo_exists():
+            if handoff:
+                HEAVY.start_next(os.path.abspath(cwd or os.getcwd()))
+            return
+        try:
+            if self.is_running:
+                return  # Restarted (forced) while checking
+            if reason:
+                self._skip_unchanged(command, cwd, reason)
+                if handoff:
+                    HEAVY.start_next(os.path.abspath(cwd or os.getcwd()))
+            else:
+                self.run_command(command, cwd, use_pty, force=True)
+        finally:
+            self._checking = False  # Only now, so followers never see an idle gap
+    
+    def _skip_unchanged(self, command: str, cwd: str, reason: str):
+        """Show a skipped run: the command's inputs haven't changed since it last succeeded."""
+        self.last_cmd = command
+        self.last_cwd = cwd
+        notice = f"\n$ {command}\n[Skipped: {reason}. Restart to run it anyway]\n"
+        self._append_text(notice)
+        self._publish_output(notice)  # Followers (control API) see why nothing ran
+        self.set_status("✓ Up to date", "#4CAF50")
+        self.action_btn.configure(
+            text="🔄 Restart",
+            fg_color="#2196F3",
+            hover_color="#1976D2",
+            state="normal"
+        )
+    
+    def _acquire_heavy_slot(self, command: str, cwd: str, use_pty: bool) -> bool:
+        """Take a heavy-command slot in the project, or queue this run until one frees up."""
+        project = os.path.abspath(cwd or os.getcwd())
+        if HEAVY.acquire(project, self.tab_id, get_setting("max_heavy_per_project")):
+            return True
+        self._queued = True
+        HEAVY.wait(project, self.tab_id, lambda: self._start_queued(project, command, cwd, use_pty))
+        self._append_text(f"\n[Queued: {command} waits for another heavy command in this project]\n")
+        self.set_status("⏳ Queued", "#9E9E9E")
+        self.action_btn.configure(
+            text="⏹ Cancel",
+            fg_color="#f44336",
+            hover_color="#d32f2f",
+            state="normal"
+        )
+        return False
+    
+    def _start_queued(self, project: str, command: str, cwd: str, use_pty: bool):
+        """A heavy slot freed up: run the queued command (or pass the slot on)."""
+        if self._closed or not self.winfo_exists() or self.is_running:
+            self._queued = False
+            HEAVY.start_next(project)
+            return
+        self._starting = True  # Set first: followers never see an idle gap
+        self._queued = False
+        try:
+            self.run_command(command, cwd, use_pty)
+        finally:
+            self._starting = False
+    
+    def _cancel_queued(self):
+        HEAVY.cancel(self.tab_id)
+        self._queued = False
+        self._append_text("[Queued command cancelled]\n")
+        self.set_status("■ Stopped", "#FF9800")
+        self.action_btn.configure(
+            text="🔄 Restart",
+            fg_color="#2196F3",
+            hover_color="#1976D2",
+            state="normal"
+        )
+    
+    def _start_pipe_process(self, command: str, cwd: str = None, limits: dict = None):
+        """Start a command with stdout/stdin connected through pipes."""
+        self._own_session = False
+        args, shell, env = prepare_launch(command, cwd)
+        self.process = subprocess.Popen(
+            args,
+            shell=shell,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+            errors='replace',  # Replace invalid characters instead of crashing
+            bufsize=1,
+            cwd=cwd,
+            preexec_fn=make_preexec(limits),
+            creationflags=(subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0) | priority_creationflags(limits or {})
+        )
+        
+        # Start output reader thread
+        self._reader_thread = threading.Thread(
+            target=self._read_output,
+            args=(self.process.stdout,),
+            daemon=True
+        )
+        self._reader_thread.start()
+    
+    def _start_pty_process(self, command: str, cwd: str = None, limits: dict = None):
+        """Start a command on a pseudo-terminal so it line-buffers and can prompt."""
+        master_fd, slave_fd = pty.openpty()
+        try:
+            rows, cols = PTY_SIZE
+            fcntl.ioctl(slave_fd, termios.TIOCSWINSZ, struct.pack("HHHH", rows, cols, 0, 0))
+            args, shell, env = prepare_launch(command, cwd)
+            env = dict(env or os.environ)
+            env.setdefault("TERM", "xterm-256color")
+            env["COLUMNS"] = str(cols)
+            self.process = subprocess.Popen(
+                args,
+                shell=shell,
+                stdin=slave_fd,
+                stdout=slave_fd,
+                stderr=slave_fd,
+                cwd=cwd,
+                env=env,
+                start_new_session=True,
+                # Make the pty the controlling terminal (setsid already ran)
+                preexec_fn=make_preexec(limits, then=lambda: fcntl.ioctl(0, termios.TIOCSCTTY, 0))
+            )
+        except Exception:
+            os.close(master_fd)
+            raise
+        finally:
+            os.close(slave_fd)
+        
+        self._pty_fd = master_fd
+        self._own_session = True
+        self._reader_thread = threading.Thread(
+            target=self._read_pty,
+            args=(master_fd,),
+            daemon=True
+        )
+        self._reader_thread.start()
+    
+    def _follow_detached(self, run: DetachedRun):
+        """Show a detached run's output by tailing its log file."""
+        self.detached_run = run
+        self.process = run
+        self._own_session = True  # stop_process signals the supervisor's group
+        self._reader_thread = threading.Thread(
+            target=self._tail_detached,
+            args=(run,),
+            daemon=True
+        )
+        self._reader_thread.start()
+    
+    def _tail_detached(self, run: DetachedRun):
+        """Follow the log until the run ends (reader and monitor in one thread)."""
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        try:
+            with open(run.log_path, "rb") as log:
+                log.seek(run.offset)
+                while not self._closed:
+                    # Checked before reading so output written just before exit isn't missed
+                    finished = not run.is_alive()
+                    data = log.read(65536)
+                    if data:
+                        run.offset += len(data)
+                        text = decoder.decode(data)
+                        if text:
+                            self._handle_output(text)
+                            # Bytes still in the decoder aren't part of the text yet
+                            self._enqueue_mark(_ShownOffset((run, run.offset - len(decoder.getstate()[0]))))
+                    elif finished:
+                        break
+                    else:
+                        time.sleep(0.1)
+        except OSError as e:
+            self._enqueue_output(f"\n[Error reading output: {e}]\n")
+        if self._closed:
+            return  # Closing: the run keeps going and is re-adopted on the next start
+        
+        result = run.result()
+        stopped = self.process is not run
+        if result is None:
+            if not stopped:
+                self._enqueue_output("\n[Supervisor ended without recording an exit code]\n")
+            result = {"exit_code": -15 if stopped else -1, "ended": time.time()}
+        run.forget()
+        if self.detached_run is run:
+            self.detached_run = None
+        # A restart already replaced this run; leave the new one alone
+        if self.process is not None and self.process is not run:
+            return
+        self.is_running = False
+        self.process = None
+        exit_code = result["exit_code"]
+        # The run may have ended while the app was closed: convert its end time
+        usage = (time.monotonic() - (time.time() - result["ended"]), result.get("cpu"), result.get("peak_kb"))
+        try:
+            self.after(0, lambda seq=self._run_seq: self._on_process_complete(exit_code, seq, usage))
+        except Exception:
+            pass
+    
+    def adopt_detached(self, entry: dict, offset: int = 0):
+        """Resume following a detached run started before the app restarted."""
+        run = DetachedRun(entry)
+        # Don't replay more than a session's worth of output that piled up meanwhile
+        try:
+            size = os.path.getsize(run.log_path)
+        except OSError:
+            size = 0
+        run.offset = run.shown_offset = max(offset, size - get_setting("session_scrollback_kb") * 1024, 0)
+        if run.offset > offset:
+            self._append_text(f"[… {(run.offset - offset) // 1024:,} KB of output skipped]\n")
+        command, cwd, started = entry["command"], entry["cwd"], entry["started"]
+        self.last_cmd = command
+        self.last_cwd = cwd
+        self._run_seq += 1
+        self._stop_requested = False
+        project = os.path.abspath(cwd or os.getcwd())
+        self._run_started = (started, time.monotonic() - (time.time() - started), project, command)
+        self._append_text(f"[Reattached: {command} (pid {entry['pid']})]\n")
+        self.set_status("● Running...", "#2196F3")
+        self.action_btn.configure(
+            text="⏹ Stop",
+            fg_color="#f44336",
+            hover_color="#d32f2f",
+            state="normal"
+        )
+        self.is_running = True
+        self._follow_detached(run)
+    
+    def _run_in_shell(self, command: str, cwd: str = None):
+        """Send a command to this tab's long-lived shell, starting it if needed."""
+        if self._shell and self._shell.is_alive() and not self._shell_idle.wait(0.5):
+            # A stopped command is still running: don't queue behind it
+            self._shell.close()
+            self._shell = None
+            self._append_text("[Previous command still running: started a fresh shell]\n")
+        if not (self._shell and self._shell.is_alive()):
+            session = ShellSession(cwd=cwd, env=get_project_env(cwd), on_output=self._handle_output)
+            # Bind callbacks to this session so a replaced shell can't report into the new one
+            session.on_done = lambda run_id, code: self._on_shell_done(session, run_id, code)
+            session.on_exit = lambda code: self._on_shell_exit(session, code)
+            self._shell = session
+            session.start()
+            self._shell_cwd = cwd
+        # Only cd when the tab moves to another directory, so a manual `cd` sticks
+        target = cwd if cwd and cwd != self._shell_cwd else None
+        self._shell_cwd = cwd or self._shell_cwd
+        self._own_session = False
+        self.process = self._shell.process
+        self._shell_idle.clear()
+        self._shell_run_id = self._shell.run(command, target)
+        self._shell_pending = self._shell_run_id
+    
+    def _on_shell_done(self, session: ShellSession, run_id: int, exit_code: int):
+        """Sentinel seen for a shell command (reader thread)."""
+        if session is not self._shell or run_id != self._shell_run_id:
+            return  # Finished after being stopped and superseded by a newer run
+        self._shell_idle.set()
+        self._shell_pending = None
+        self.is_running = False
+        self.process = None
+        try:
+            self.after(0, lambda seq=self._run_seq: self._on_process_complete(exit_code, seq))
+        except Exception:
+            pass
+    
+    def _on_shell_exit(self, session: ShellSession, exit_code: int):
+        """The shell itself exited (e.g. `exit` or killed); the next run starts a new one."""
+        if session is not self._shell:
+            return
+        self._shell_idle.set()
+        if self._shell_pending is None:
+            return
+        self._shell_pending = None
+        self.is_running = False
+        self.process = None
+        try:
+            self.after(0, lambda seq=self._run_seq: self._on_process_complete(exit_code, seq))
+        except Exception:
+            pass
+    
+    def _kill_stuck_shell(self, run_id: int):
+        """Escalate when a command ignored SIGINT: drop the whole shell session."""
+        if self._shell and self._shell_run_id == run_id and not self._shell_idle.is_set():
+            self._shell_pending = None  # Already reported as stopped
+            self._shell.close()
+    
+    def send_input(self, text: str) -> bool:
+        """Send keyboard input to the running process."""
+        process = self.process
+        if not process or not self.is_running:
+            return False
+        try:
+            if self._pty_fd is not None:
+                # Raw-mode prompts expect Enter as CR; the tty maps it back in cooked mode
+                os.write(self._pty_fd, text.replace("\n", "\r").encode("utf-8"))
+            elif process.stdin:
+                process.stdin.write(text)
+                process.stdin.flush()
+                # Pipes don't echo, so show what was typed
+                self._append_text(text)
+            else:
+                self._append_text("\n[This process does not take input]\n")
+                return False
+            return True
+        except (OSError, ValueError) as e:
+            self._append_text(f"\n[Error sending input: {e}]\n")
+            return False
+    
     def restart_process(self):
         """Restart the last command."""
         if hasattr(self, 'last_cmd') and self.last_cmd:
+            if self.is_running:
+                self.stop_process()
             self.clear()
-            self.run_command(self.last_cmd, getattr(self, 'last_cwd', None))
+            self.run_command(self.last_cmd, getattr(self, 'last_cwd', None), force=True)
 
     def stop_process(self):
         """Stop the running process."""
+        if self._queued:
+            self._cancel_queued()
+            return
         if self.process and self.is_running:
+            self._stop_requested = True
             try:
-                if os.name == 'nt':
+                if self._shell and self.process is self._shell.process:
+                    # Interrupt the command but keep the shell (and its state) alive
+                    self._shell.interrupt()
+                    self.after(3000, lambda rid=self._shell_run_id: self._kill_stuck_shell(rid))
+                elif os.name == 'nt':
                     # Windows: Kill process tree forcefully
                     subprocess.run(
                         f"taskkill /PID {self.process.pid} /T /F", 
                         shell=True,
                         creationflags=subprocess.CREATE_NO_WINDOW
                     )
+                elif self._own_session:
+                    # Own session: signal the whole group, not just the shell
+                    os.killpg(self.process.pid, signal.SIGTERM)
                 else:
                     self.process.terminate()
                 
@@ -247,6 +1257,218 @@ class TerminalTab(ctk.CTkFrame):
                 # Let _monitor_process handle UI update via _on_process_complete
                 self.set_status("■ Stopped", "#FF9800")
     
+    def _on_watch_click(self):
+        """Toggle restart-on-change for this tab."""
+        if self.watcher:
+            self.stop_watch()
+            return
+        if not getattr(self, 'last_cmd', None):
+            self._append_text("\n[Run a command before enabling watch mode]\n")
+            return
+        dialog = ctk.CTkInputDialog(
+            text="Restart when these files change\n(comma-separated globs, empty = all):",
+            title="Watch Mode"
+        )
+        globs = dialog.get_input()
+        if globs is None:
+            return
+        self.start_watch([g.strip() for g in globs.split(",") if g.strip()])
+    
+    def start_watch(self, include: list = None, ignore: list = None):
+        """Restart the last command whenever matching files change."""
+        self.stop_watch()
+        root = getattr(self, 'last_cwd', None) or os.getcwd()
+        if ignore is None:
+            ignore = get_setting("watch_ignore")
+        self.watch_include = include or []
+        self.watcher = FileWatcher(
+            root,
+            on_change=self._on_watched_change,
+            include=self.watch_include,
+            ignore=ignore,
+            debounce=get_setting("watch_debounce_ms") / 1000
+        )
+        self.watcher.start()
+        self.watch_btn.configure(text="👁 Watching", fg_color="#7B1FA2")
+        patterns = ", ".join(self.watch_include) or "**"
+        self._append_text(f"\n[Watching {patterns} in {root}]\n")
+    
+    def stop_watch(self):
+        """Disable restart-on-change."""
+        if self.watcher:
+            self.watcher.stop()
+            self.watcher = None
+        if self.winfo_exists():
+            self.watch_btn.configure(text="👁 Watch", fg_color="transparent")
+    
+    def _on_watched_change(self):
+        """Called from the watcher thread after a burst of changes."""
+        try:
+            self.after(0, self._restart_on_change)
+        except Exception:
+            pass
+    
+    def _restart_on_change(self):
+        if not self.winfo_exists() or not self.watcher:
+            return
+        self.restart_process()
+        self._append_text("[Restarted: files changed]\n")
+    
+    def _on_record_click(self):
+        """Start or stop recording this tab's output."""
+        if self.recorder:
+            self.stop_recording()
+        else:
+            self.start_recording()
+
+    def start_recording(self, path=None) -> bool:
+        """Append every output chunk, with its time, to a .cast file."""
+        if self.recorder:
+            return False
+        path = path or recording_path(self.tab_name)
+        try:
+            self.recorder = Recorder(path, getattr(self, 'last_cmd', None) or "", self.tab_name, PTY_SIZE,
+                                     on_error=self._on_recording_error, mode=self._output_mode())
+        except OSError as e:
+            self._append_text(f"\n[Error starting recording: {e}]\n")
+            return False
+        self.record_btn.configure(text="⏺ Recording", fg_color="#f44336")
+        return True
+
+    def _output_mode(self) -> str:
+        """"pty" if the running (or next) command's output comes from a PTY, else "pipe"."""
+        if self.is_running:
+            return "pty" if self._pty_fd is not None else "pipe"
+        if self.persistent_shell or self.detached or not self.use_pty:
+            return "pipe"
+        return "pty"
+
+    def stop_recording(self):
+        recorder, self.recorder = self.recorder, None
+        if not recorder:
+            return
+        recorder.close()
+        self.record_btn.configure(text="⏺ Rec", fg_color="transparent")
+        if recorder.error:
+            self._append_text(f"\n[Recording stopped: {recorder.error}. "
+                              f"{recorder.events:,} chunks were saved to {recorder.path}]\n")
+        else:
+            self._append_text(f"\n[Recorded {recorder.events:,} chunks ({recorder.bytes / 1024:,.0f} KB) to {recorder.path}]\n")
+
+    def _on_recording_error(self, error: OSError):
+        """A recording write failed (reader thread): stop it and say why."""
+        print(f"Error writing recording: {error}")
+        try:
+            self.after(0, self.stop_recording)
+        except Exception:
+            pass
+
+    def replay(self, path, speed: float = 1.0) -> bool:
+        """Play a recording's output into this tab, through the same path as a process's output."""
+        if self.is_running or self.replayer:
+            self._append_text("\n[Process already running]\n")
+            return False
+        try:
+            self.replayer = Replayer(path, self._handle_output, speed, self._on_replay_done)
+            if cast_mode(self.replayer.header) == "pty":
+                text_filter = TerminalTextFilter()  # PTY recordings hold the raw output
+                self.replayer.sink = lambda raw: self._handle_output(text_filter.feed(raw), raw)
+        except (OSError, ValueError) as e:
+            self._append_text(f"\n[Error opening recording: {e}]\n")
+            return False
+        if self.problems is not None:
+            self.problems.reset()
+        command = self.replayer.header.get("command")
+        self._append_text(f"\n▶ Replaying {os.path.basename(path)}\n")
+        if command:
+            self._append_text(f"$ {command}\n")
+        self._append_text("-" * 50 + "\n")
+        label = next((key for key, value in REPLAY_SPEEDS.items() if value == speed), f"{speed:g}×")
+        self.replay_menu.set(label)
+        self.replay_menu.pack(side="right", padx=2, before=self.record_btn)
+        self.set_status(f"▶ Replaying {label}", "#2196F3")
+        self.action_btn.configure(
+            text="⏹ Stop",
+            fg_color="#f44336",
+            hover_color="#d32f2f",
+            state="normal"
+        )
+        self.replayer.start()
+        return True
+
+    def _on_replay_speed(self, choice: str):
+        if self.replayer:
+            self.replayer.set_speed(REPLAY_SPEEDS[choice])
+            self.set_status(f"▶ Replaying {choice}", "#2196F3")
+
+    def _on_replay_done(self, events: int, elapsed: float, stopped: bool):
+        """Called on the replay thread."""
+        try:
+            self.after(0, lambda: self._finish_replay(events, elapsed, stopped))
+        except Exception:
+            pass
+
+    def _finish_replay(self, events: int, elapsed: float, stopped: bool):
+        if not self.winfo_exists():
+            return
+        if not self.output_queue.empty():
+            # _poll_output shows the rest in its usual batches; report after it
+            self.after(50, lambda: self._finish_replay(events, elapsed, stopped))
+            return
+        self.replayer = None
+        self.replay_menu.pack_forget()
+        self._append_text(f"\n[Replayed {events:,} chunks in {format_duration(elapsed)}]\n")
+        if stopped:
+            self.set_status("■ Stopped", "#FF9800")
+        else:
+            self.set_status("✓ Replayed", "#4CAF50")
+        if getattr(self, 'last_cmd', None):
+            self.action_btn.configure(
+                text="🔄 Restart",
+                fg_color="#2196F3",
+                hover_color="#1976D2",
+                state="normal"
+            )
+        else:
+            self.action_btn.configure(state="disabled")
+
+    def _refresh_problems(self):
+        problems = self.problems.snapshot()
+        if not problems:
+            self.problems_btn.pack_forget()
+            if self._problems_visible:
+                self._toggle_problems()
+            return
+        errors = sum(1 for p in problems if p["severity"] == "error")
+        self.problems_btn.configure(
+            text=f"✗ {errors}" if errors else f"⚠ {len(problems)}",
+            text_color="#f44336" if errors else "#FF9800"
+        )
+        self.problems_btn.pack(side="right", padx=2)
+        if self._problems_visible:
+            self.problems_panel.show(problems)
+    
+    def _toggle_problems(self):
+        """Show or hide the problems panel under the output."""
+        self._problems_visible = not self._problems_visible
+        if self._problems_visible:
+            self.problems_panel.grid(row=2, column=0, sticky="ew", padx=5, pady=(0, 5))
+            self.problems_panel.show(self.problems.snapshot())
+        else:
+            self.problems_panel.grid_remove()
+    
+    def _jump_to_problem(self, problem: dict):
+        """Scroll the output to the line a problem was found on (latest occurrence)."""
+        anchor = problem["anchor"]
+        index = self.output.search(anchor, "end", backwards=True, exact=True) if anchor else ""
+        if not index:
+            self.problems_panel.set_note("Line is no longer in the output")
+            return
+        self.problems_panel.set_note("")
+        self.output.tag_remove("problem", "1.0", "end")
+        self.output.tag_add("problem", f"{index} linestart", f"{index} lineend")
+        self.output.see(index)
+    
     def set_status(self, text: str, color: str = "#4CAF50"):
         """Update the status label."""
         if self.winfo_exists():
@@ -254,10 +1476,83 @@ class TerminalTab(ctk.CTkFrame):
     
     def clear(self):
         """Clear the terminal output."""
+        self._pending_history = None
+        if self.problems is not None:
+            self.problems.reset()
+        if self.log_index is not None:
+            with self._log_lock:
+                self.log_index.clear()
+                self._log_partial = ""
+                self._log_partial_shown = 0
+            self._log_render_seq += 1  # Cancel a view switch in progress
+            self._log_held = None
+        self._clear_output()
+    
+    def _clear_output(self):
+        """Empty the widget (retained log lines are kept)."""
+        self._output_version += 1
+        self._folder.reset()
+        self._fold_len = 0
         if self.winfo_exists():
             self.output.configure(state="normal")
             self.output.delete("1.0", "end")
             self.output.configure(state="disabled")
+    
+    def get_session_state(self, max_kb: int) -> dict:
+        """Snapshot command, cwd and compressed scrollback for session saving."""
+        version, blob = self._session_cache
+        if version != self._output_version:
+            # Only read the tail from Tk instead of copying the whole buffer
+            text = self.output.get(f"end-{max_kb * 1024}c", "end-1c")
+            if self._pending_history is not None:
+                # Never displayed since restore: the widget only holds what came
+                # since, which goes after the restored history (as it will on screen)
+                blob = self._pending_history
+                if text:
+                    history = decompress_scrollback(blob)
+                    blob = compress_scrollback(history + RESTORED_NOTE + text if history else text, max_kb)
+            else:
+                blob = compress_scrollback(text, max_kb) if text else ""
+            self._session_cache = (self._output_version, blob)
+        return {
+            "name": self.tab_name,
+            "last_cmd": getattr(self, 'last_cmd', None),
+            "last_cwd": getattr(self, 'last_cwd', None),
+            "scrollback": blob,
+            "run_id": self.detached_run.run_id if self.detached_run else None,
+            # Not .offset: text read but still queued isn't in the scrollback yet
+            "log_offset": self.detached_run.shown_offset if self.detached_run else 0,
+        }
+    
+    def restore_state(self, state: dict):
+        """Restore a saved tab without running it; history loads on first display."""
+        self.last_cmd = state.get("last_cmd")
+        self.last_cwd = state.get("last_cwd")
+        self._pending_history = state.get("scrollback") or None
+        self._session_cache = (self._output_version, self._pending_history or "")
+        if state.get("run_id"):
+            self.restored_run = (state["run_id"], state.get("log_offset", 0))
+        if self.last_cmd:
+            self.set_status("↺ Restored", "#9E9E9E")
+            self.action_btn.configure(
+                text="🔄 Restart",
+                fg_color="#2196F3",
+                hover_color="#1976D2",
+                state="normal"
+            )
+    
+    def load_pending_history(self):
+        """Decompress restored scrollback the first time the tab is shown."""
+        blob = self._pending_history
+        if blob is None:
+            return
+        self._pending_history = None
+        text = decompress_scrollback(blob)
+        if text and self.winfo_exists():
+            self.output.configure(state="normal")
+            self.output.insert("1.0", text + RESTORED_NOTE)
+            self.output.see("end")
+            self.output.configure(state="disabled")
 
 
 class TabbedTerminalWidget(ctk.CTkFrame):
@@ -295,6 +1590,17 @@ class TabbedTerminalWidget(ctk.CTkFrame):
         )
         self.add_tab_btn.pack(side="right")
         
+        self.replay_btn = ctk.CTkButton(
+            self.tab_bar,
+            text="▶ Replay",
+            width=70,
+            height=28,
+            fg_color="transparent",
+            border_width=1,
+            command=self._choose_replay
+        )
+        self.replay_btn.pack(side="right", padx=(0, 5))
+        
         # Tab content area
         self.content_frame = ctk.CTkFrame(self, fg_color="transparent")
         self.content_frame.grid(row=1, column=0, sticky="nsew")
@@ -368,6 +1674,7 @@ class TabbedTerminalWidget(ctk.CTkFrame):
         
         self.current_tab_id = tab_id
         if tab_id in self.tabs:
+            self.tabs[tab_id].load_pending_history()
             self.tabs[tab_id].grid()
             # Update button style
             btn_frame = self.tab_buttons.get(tab_id)
@@ -383,12 +1690,16 @@ class TabbedTerminalWidget(ctk.CTkFrame):
         
         # Stop any running process
         tab = self.tabs[tab_id]
+        tab.stop_watch()
         if tab.is_running:
             tab.stop_process()
+        if tab.detached_run:
+            tab.detached_run.forget()
         
         # Remove tab
         tab.destroy()
         del self.tabs[tab_id]
+        METRICS.unregister(tab_id)
         
         # Remove button
         if tab_id in self.tab_buttons:
@@ -405,6 +1716,23 @@ class TabbedTerminalWidget(ctk.CTkFrame):
         name = f"Terminal {self.tab_counter + 1}"
         self._create_tab(name, select=True)
     
+    def _choose_replay(self):
+        """Pick a recording and replay it in a new tab."""
+        path = filedialog.askopenfilename(
+            title="Replay Recording",
+            initialdir=RECORDINGS_DIR if RECORDINGS_DIR.is_dir() else None,
+            filetypes=[("Recordings", "*.cast"), ("All files", "*.*")]
+        )
+        if path:
+            self.replay_in_new_tab(path)
+    
+    def replay_in_new_tab(self, path, speed: float = 1.0) -> str:
+        """Replay a recording in a new tab at ``speed`` (0 = as fast as possible)."""
+        name = os.path.basename(str(path)).removesuffix(".cast")
+        tab_id = self._create_tab(f"▶ {name}"[:20], select=True)
+        self.tabs[tab_id].replay(path, speed)
+        return tab_id
+    
     def run_command_in_new_tab(self, command: str, name: str = None, cwd: str = None):
         """Run a command in a new dedicated tab."""
         tab_name = name or command[:20]
@@ -431,3 +1759,46 @@ class TabbedTerminalWidget(ctk.CTkFrame):
         if tab:
             tab.clear()
             tab._append_text(f"📁 Project: {path}\n")
+    
+    def get_session_state(self, max_kb: int) -> dict:
+        """Collect all tabs for session saving."""
+        tab_ids = list(self.tabs.keys())
+        return {
+            "tabs": [self.tabs[tid].get_session_state(max_kb) for tid in tab_ids],
+            "current": tab_ids.index(self.current_tab_id) if self.current_tab_id in tab_ids else 0,
+        }
+    
+    def restore_session(self, state: dict):
+        """Recreate saved tabs. The first saved tab is restored into the Main tab."""
+        saved_tabs = state.get("tabs") or []
+        tab_ids = []
+        for i, tab_state in enumerate(saved_tabs):
+            if i == 0 and self.current_tab_id in self.tabs:
+                tab_id = self.current_tab_id
+            else:
+                tab_id = self._create_tab(tab_state.get("name") or f"Terminal {self.tab_counter + 1}", select=False)
+            self.tabs[tab_id].restore_state(tab_state)
+            tab_ids.append(tab_id)
+        
+        current = state.get("current", 0)
+        if tab_ids:
+            # Selecting decompresses only this tab's history
+            self._select_tab(tab_ids[current] if 0 <= current < len(tab_ids) else tab_ids[0])
+    
+    def adopt_detached_runs(self):
+        """Reattach detached runs that outlived the previous app instance.
+
+        Runs go back into the restored tab they belonged to, resuming at the
+        saved log offset; the rest get new tabs.
+        """
+        runs = load_registry()
+        remove_stale_dirs(runs)
+        for tab in list(self.tabs.values()):
+            run_id, offset = tab.restored_run or (None, 0)
+            tab.restored_run = None
+            entry = runs.pop(run_id, None)
+            if entry:
+                tab.adopt_detached(entry, offset)
+        for entry in runs.values():
+            tab_id = self._create_tab(entry.get("name") or f"Terminal {self.tab_counter + 1}", select=False)
+            self.tabs[tab_id].adopt_detached(entry)
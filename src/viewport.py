@@ -0,0 +1,294 @@
+"""Virtualized output view: a compact line store with only the visible rows drawn."""
+
+import bisect
+from array import array
+
+import customtkinter as ctk
+
+
+class LineStore:
+    """Append-only text kept as UTF-8 bytes plus an array of line offsets.
+
+    Line lookup is O(1) and appending is amortized O(1), at roughly one byte
+    per character plus eight per line instead of one Python object per line.
+    The last line is kept apart as a str while it is still open.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self._data = bytearray()
+        self._offsets = array("Q", [0])  # Start of each complete line, then the end
+        self._tail = ""
+        self.chars = 0
+
+    def __len__(self) -> int:
+        """Number of lines, counting the open last line (possibly empty)."""
+        return len(self._offsets)
+
+    def size(self) -> int:
+        """Bytes held for the text and line offsets."""
+        return len(self._data) + self._offsets.itemsize * len(self._offsets) + len(self._tail)
+
+    def line(self, index: int, limit: int = None) -> str:
+        """Text of a line without its newline, optionally only the first ``limit`` chars."""
+        if index >= len(self._offsets) - 1:
+            return self._tail[:limit] if limit else self._tail
+        start, end = self._offsets[index], self._offsets[index + 1] - 1
+        if limit and end - start > limit * 4:
+            # Decode just enough bytes (UTF-8 is at most 4 per char)
+            return self._data[start:start + limit * 4].decode("utf-8", "ignore")[:limit]
+        text = self._data[start:end].decode("utf-8", "surrogatepass")
+        return text[:limit] if limit else text
+
+    def append(self, text: str):
+        self.chars += len(text)
+        if "\n" not in text:
+            self._tail += text
+            return
+        lines = text.split("\n")
+        lines[0] = self._tail + lines[0]
+        self._tail = lines.pop()
+        for line in lines:
+            self._data += line.encode("utf-8", "surrogatepass")
+            self._data += b"\n"
+            self._offsets.append(len(self._data))
+
+    def append_line(self, line: str):
+        """Append one complete line (no newline inside, none open): the fast path."""
+        if self._tail:
+            self.append(line + "\n")
+            return
+        self.chars += len(line) + 1
+        self._data += line.encode("utf-8", "surrogatepass")
+        self._data += b"\n"
+        self._offsets.append(len(self._data))
+
+    def pop_chars(self, count: int) -> str:
+        """Remove and return the last ``count`` characters."""
+        parts = []
+        while count > 0 and (self._tail or len(self._offsets) > 1):
+            if not self._tail:
+                # Reopen the last complete line; its newline is removed first
+                start = self._offsets[-2]
+                self._tail = self._data[start:].decode("utf-8", "surrogatepass")
+                del self._data[start:]
+                self._offsets.pop()
+            take = min(count, len(self._tail))
+            parts.append(self._tail[len(self._tail) - take:])
+            self._tail = self._tail[:len(self._tail) - take]
+            count -= take
+        removed = "".join(reversed(parts))
+        self.chars -= len(removed)
+        return removed
+
+    def find_lines(self, needle: str):
+        """Yield numbers of complete lines containing ``needle`` (searches the raw bytes)."""
+        pattern = needle.encode("utf-8", "surrogatepass")
+        data, offsets = self._data, self._offsets
+        pos = data.find(pattern)
+        while pos != -1:
+            number = bisect.bisect_right(offsets, pos) - 1
+            yield number
+            pos = data.find(pattern, offsets[number + 1])
+
+    def drop_lines(self, count: int):
+        """Discard the first ``count`` complete lines."""
+        count = min(count, len(self._offsets) - 1)
+        if count <= 0:
+            return
+        cut = self._offsets[count]
+        self.chars -= len(self._data[:cut].decode("utf-8", "surrogatepass"))
+        del self._data[:cut]
+        self._offsets = array("Q", (offset - cut for offset in self._offsets[count:]))
+
+    def tail_text(self, count: int) -> str:
+        """The last ``count`` characters, reading only as many lines as needed."""
+        if count <= 0:
+            return ""
+        parts = [self._tail]
+        seen = len(self._tail)
+        index = len(self._offsets) - 2
+        while seen < count and index >= 0:
+            start, end = self._offsets[index], self._offsets[index + 1]
+            line = self._data[start:end].decode("utf-8", "surrogatepass")
+            parts.append(line)
+            seen += len(line)
+            index -= 1
+        return "".join(reversed(parts))[-count:]
+
+    def text(self) -> str:
+        return self._data.decode("utf-8", "surrogatepass") + self._tail
+
+
+class VirtualOutput(ctk.CTkFrame):
+    """Read-only output view that only renders the rows on screen.
+
+    Mirrors the subset of the CTkTextbox API TerminalTab uses (``insert``,
+    ``delete``, ``get`` and ``see`` with "1.0", "end" and "end-Nc" indices),
+    so appending and scrolling cost the same with 100 or 10M lines of
+    history. Selection only covers the visible rows.
+    """
+
+    SCROLL_LINES = 3
+    MAX_ROW_CHARS = 2000  # Rows are not wrapped; longer lines are cut when drawn
+
+    def __init__(self, master, font=("Consolas", 11), **kwargs):
+        super().__init__(master, fg_color="transparent")
+        self.store = LineStore()
+        self._top = 0
+        self._rows = 60            # Rows rendered; re-estimated on resize
+        self._follow = True        # Stick to the bottom as output arrives
+        self._redraw_pending = False
+
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self._text = ctk.CTkTextbox(self, font=font, wrap="none", activate_scrollbars=False, **kwargs)
+        self._text.grid(row=0, column=0, sticky="nsew")
+        self._text.configure(state="disabled")
+
+        self._scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self._scrollbar.grid(row=0, column=1, sticky="ns")
+
+        self._text.bind("<Configure>", self._on_resize)
+        self._text.bind("<MouseWheel>", self._on_wheel)
+        self._text.bind("<Button-4>", lambda e: self._scroll(-self.SCROLL_LINES))
+        self._text.bind("<Button-5>", lambda e: self._scroll(self.SCROLL_LINES))
+
+    # --- CTkTextbox-compatible API ---
+
+    def configure(self, **kwargs):
+        kwargs.pop("state", None)  # Always read-only
+        if kwargs:
+            super().configure(**kwargs)
+
+    def tag_config(self, tag, **kwargs):
+        pass  # Rows are redrawn as plain text
+
+    def _offset(self, index: str) -> int:
+        """Character offset for "1.0", "end", "end-Nc" or "end-1c linestart" (Tk's final newline is implicit)."""
+        if index in ("1.0", "0.0"):
+            return 0
+        if index == "end":
+            return self.store.chars
+        if index == "end-1c linestart":
+            return self.store.chars - len(self.store.line(len(self.store) - 1))
+        if index.startswith("end-") and index.endswith("c"):
+            return min(self.store.chars, max(0, self.store.chars + 1 - int(index[4:-1])))
+        raise ValueError(f"unsupported index: {index}")
+
+    def insert(self, index: str, text: str, *tags):
+        pos = self._offset(index)
+        if pos == self.store.chars:
+            self.store.append(text)
+        else:
+            rest = self.store.pop_chars(self.store.chars - pos)
+            self.store.append(text)
+            self.store.append(rest)
+        self._schedule_redraw()
+
+    def delete(self, start: str, end: str = None):
+        first = self._offset(start)
+        last = self._offset(end) if end else first + 1
+        if first == 0 and last >= self.store.chars:
+            self.store.clear()
+            self._top = 0
+        elif last > first:
+            rest = self.store.pop_chars(self.store.chars - first)
+            self.store.append(rest[last - first:])
+        self._schedule_redraw()
+
+    def get(self, start: str = "1.0", end: str = "end") -> str:
+        first, last = self._offset(start), self._offset(end)
+        if first == 0 and last >= self.store.chars:
+            return self.store.text()
+        return self.store.tail_text(self.store.chars - first)[:last - first]
+
+    def see(self, index: str):
+        if index == "end":
+            self._follow = True
+        else:
+            # "line.col": bring that line into view, a few rows from the top
+            line = int(index.split(".")[0]) - 1
+            self._top = min(max(0, line - 3), self._max_top())
+            self._follow = self._top >= self._max_top()
+        self._schedule_redraw()
+
+    def search(self, pattern: str, index: str, backwards: bool = False, **kwargs) -> str:
+        """"line.col" of the last (or first) line containing ``pattern``, or ""."""
+        found = None
+        for number in self.store.find_lines(pattern):
+            found = number
+            if not backwards:
+                break
+        if found is None:
+            return ""
+        return f"{found + 1}.{self.store.line(found).find(pattern)}"
+
+    def tag_add(self, tag, start, end=None):
+        pass
+
+    def tag_remove(self, tag, start, end=None):
+        pass
+
+    # --- Scrolling and drawing ---
+
+    def _schedule_redraw(self):
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.after_idle(self._redraw)
+
+    def _max_top(self) -> int:
+        return max(0, len(self.store) - self._rows)
+
+    def _scroll(self, lines: int):
+        top = self._max_top() if self._follow else self._top
+        self._top = min(max(0, top + lines), self._max_top())
+        self._follow = self._top >= self._max_top()
+        self._schedule_redraw()
+        return "break"
+
+    def _on_wheel(self, event):
+        if event.delta:
+            step = -int(event.delta / 120) or (-1 if event.delta > 0 else 1)
+            return self._scroll(step * self.SCROLL_LINES)
+        return "break"
+
+    def _on_scrollbar(self, *args):
+        total = len(self.store)
+        if args[0] == "moveto":
+            self._top = int(float(args[1]) * total)
+        elif args[0] == "scroll":
+            step = int(args[1])
+            self._top = (self._max_top() if self._follow else self._top) + (
+                step * self._rows if args[2] == "pages" else step
+            )
+        self._top = min(max(0, self._top), self._max_top())
+        self._follow = self._top >= self._max_top()
+        self._schedule_redraw()
+
+    def _on_resize(self, event):
+        # Over-estimate (lines are at least ~12px); the inner text clips the rest
+        rows = max(10, event.height // 12 + 2)
+        if rows != self._rows:
+            self._rows = rows
+            self._schedule_redraw()
+
+    def _redraw(self):
+        self._redraw_pending = False
+        if not self.winfo_exists():
+            return
+        total = len(self.store)
+        if self._follow:
+            self._top = self._max_top()
+        top = min(self._top, self._max_top())
+        rows = [self.store.line(i, self.MAX_ROW_CHARS) for i in range(top, min(total, top + self._rows))]
+        self._text.configure(state="normal")
+        self._text.delete("1.0", "end")
+        self._text.insert("end", "\n".join(rows))
+        if self._follow:
+            self._text.see("end")
+        self._text.configure(state="disabled")
+        self._scrollbar.set(top / total, min(1.0, (top + self._rows) / total))
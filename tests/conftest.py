@@ -0,0 +1,42 @@
+"""Run the widget tests on the benchmarks' headless Tk stand-in when customtkinter is missing."""
+
+import sys
+import time
+
+import pytest
+
+try:
+    import customtkinter  # noqa: F401
+except ImportError:
+    from benchmarks import headless_tk
+
+    sys.modules["customtkinter"] = headless_tk
+
+
+@pytest.fixture
+def tk_root():
+    """A Tk root (the headless stand-in here), destroyed after the test."""
+    import customtkinter as ctk
+
+    try:
+        root = ctk.CTk()
+    except Exception as e:  # Real Tk without a display
+        pytest.skip(f"no display: {e}")
+    yield root
+    root.destroy()
+
+
+@pytest.fixture
+def pump(tk_root):
+    """pump(until, timeout): run Tk events until ``until()`` is true; returns whether it became true."""
+
+    def run(until, timeout: float = 5.0) -> bool:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            tk_root.update()
+            if until():
+                return True
+            time.sleep(0.01)
+        return False
+
+    return run
@@ -0,0 +1,37 @@
+"""Tests for ANSI stripping and carriage-return handling."""
+
+from src.ansi import TerminalTextFilter, strip_ansi
+
+
+def test_strip_ansi():
+    assert strip_ansi("\x1b[31mred\x1b[0m") == "red"
+
+
+def test_escape_split_across_reads():
+    f = TerminalTextFilter()
+    assert f.feed("a\x1b[3") == "a"
+    assert f.feed("1mb\n") == "b\n"
+
+
+def test_redraw_within_one_chunk():
+    f = TerminalTextFilter()
+    assert f.feed("\r 10%|#\r 20%|##\r100%|####|\n") == "100%|####|\n"
+
+
+def test_redraw_one_frame_per_chunk():
+    f = TerminalTextFilter()
+    out = [f.feed(chunk) for chunk in ["\r 10%|#", "\r 20%|##", "\r100%|####|\n", "done\n"]]
+    # Later frames replace the open line instead of piling onto it
+    assert out == [" 10%|#", "\r 20%|##", "\r100%|####|\n", "done\n"]
+
+
+def test_trailing_carriage_return():
+    f = TerminalTextFilter()
+    out = [f.feed(chunk) for chunk in ["a 10%\r", "a 20%\r", "\n"]]
+    assert out == ["a 10%", "\ra 20%", "\n"]
+
+
+def test_crlf_is_a_plain_newline():
+    f = TerminalTextFilter()
+    assert f.feed("one\r\ntwo\r") == "one\ntwo"
+    assert f.feed("\nthree\n") == "\nthree\n"
@@ -0,0 +1,24 @@
+"""Tests for the main window's session autosave scheduling."""
+
+import pytest
+
+from src import app
+
+
+class _Window:
+    def __init__(self):
+        self.scheduled = []
+
+    def _autosave_session(self):
+        pass
+
+    def after(self, ms, callback):
+        self.scheduled.append(ms)
+
+
+@pytest.mark.parametrize("value, expected", [(60, [60000]), (0.5, [500]), (0, []), (-5, []), ("soon", [])])
+def test_autosave_interval(monkeypatch, value, expected):
+    monkeypatch.setattr(app, "get_setting", lambda key: value)
+    window = _Window()
+    app.TerminalManagerApp._schedule_autosave(window)
+    assert window.scheduled == expected
@@ -0,0 +1,83 @@
+"""Tests for the control API's token check and control file."""
+
+import json
+import os
+import stat
+import sys
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src import control_server
+from src.control_server import TOKEN_HEADER, ControlServer, read_control_file, send_to_running_instance
+
+
+class _Terminal:
+    """Stands in for TabbedTerminalWidget: ``after`` runs callbacks on timer threads."""
+
+    tabs = {}
+    current_project = None
+
+    def winfo_exists(self):
+        return True
+
+    def after(self, ms, callback):
+        timer = threading.Timer(ms / 1000, callback)
+        timer.daemon = True
+        timer.start()
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setattr(control_server, "CONTROL_FILE", tmp_path / "control.json")
+    opened = []
+    server = ControlServer(_Terminal(), open_handler=lambda body: opened.append(body) or {"ok": True})
+    server.start()
+    server.opened = opened
+    yield server
+    server.stop()
+
+
+def _request(server, path, token=None, body=None):
+    headers = {TOKEN_HEADER: token} if token is not None else {}
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(f"http://127.0.0.1:{server.port}{path}", data=data, headers=headers)
+    try:
+        with urllib.request.urlopen(req, timeout=5) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+@pytest.mark.parametrize("token", [None, "", "wrong", "x" * 200])
+def test_requests_without_the_token_are_refused(server, token):
+    assert _request(server, "/ping", token) == (403, {"error": "invalid token"})
+    assert _request(server, "/open", token, {"project": "/tmp"})[0] == 403
+    assert server.opened == []
+
+
+def test_requests_with_the_token(server):
+    status, payload = _request(server, "/ping", server.token)
+    assert status == 200 and payload["pid"] == os.getpid()
+    assert _request(server, "/tabs", server.token) == (200, [])
+    assert _request(server, "/nope", server.token)[0] == 404
+    assert _request(server, "/tabs/missing/stop", server.token, {})[0] == 404
+
+
+def test_control_file_and_second_launch(server):
+    info = read_control_file()
+    assert info == {"port": server.port, "token": server.token, "pid": os.getpid()}
+    if sys.platform != "win32":
+        assert stat.S_IMODE(os.stat(control_server.CONTROL_FILE).st_mode) == 0o600
+    assert send_to_running_instance({"project": "/tmp/app"})
+    assert server.opened == [{"project": "/tmp/app"}]
+
+
+def test_stop_removes_only_its_own_control_file(server):
+    other = {"port": 1, "token": "someone else's", "pid": 1}
+    control_server.CONTROL_FILE.write_text(json.dumps(other))
+    server.stop()
+    assert read_control_file() == other
+    assert not send_to_running_instance({"project": "/tmp/app"})
@@ -0,0 +1,68 @@
+"""Tests for detached runs and reattaching them to a tab."""
+
+import os
+import signal
+import time
+
+import pytest
+
+from src import detached, terminal
+from src.detached import DetachedRun, start_detached
+from src.run_history import RunHistory
+
+pytestmark = pytest.mark.skipif(os.name == "nt" or not detached.supported(), reason="POSIX supervisor only")
+
+
+@pytest.fixture
+def runs_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(detached, "RUNS_DIR", tmp_path / "runs")
+    monkeypatch.setattr(detached, "REGISTRY_FILE", tmp_path / "runs" / "registry.json")
+    monkeypatch.setattr(terminal, "HISTORY", RunHistory(tmp_path / "history.json"))
+    return tmp_path / "runs"
+
+
+def _kill(run: DetachedRun):
+    try:
+        os.killpg(run.pid, signal.SIGKILL)
+    except OSError:
+        pass
+
+
+def test_reattach_keeps_output_still_queued_at_snapshot(tk_root, pump, runs_dir, tmp_path):
+    run = start_detached("echo tick 1; sleep 0.5; echo tick 2; sleep 30", str(tmp_path), "t")
+    try:
+        tab = terminal.TerminalTab(tk_root, "a", "a")
+        tab.is_running = True
+        tab._follow_detached(run)
+        assert pump(lambda: "tick 1\n" in tab.output.get("1.0", "end"))
+
+        # Let the reader queue "tick 2" without the Tk loop showing it
+        deadline = time.monotonic() + 5
+        while run.offset < len("tick 1\ntick 2\n") and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert "tick 2\n" not in tab.output.get("1.0", "end")
+        state = tab.get_session_state(256)
+        tab.destroy()
+
+        restored = terminal.TerminalTab(tk_root, "b", "b")
+        restored.restore_state(state)
+        restored.load_pending_history()
+        restored.adopt_detached(run.entry, state["log_offset"])
+        assert pump(lambda: "tick 2\n" in restored.output.get("1.0", "end"))
+        assert restored.output.get("1.0", "end").count("tick 1\n") == 1
+        restored.destroy()
+    finally:
+        _kill(run)
+
+
+def test_forget_waits_for_the_supervisor(runs_dir, tmp_path):
+    run = start_detached("trap 'sleep 0.5; exit 3' TERM; sleep 30 & wait", str(tmp_path), "t")
+    time.sleep(0.3)
+    os.killpg(run.pid, signal.SIGTERM)
+    run.forget()
+    assert run.dir.exists()  # The supervisor still has to write exit.json
+    deadline = time.monotonic() + 5
+    while run.dir.exists() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not run.dir.exists()
+    assert run.run_id not in detached.load_registry()
@@ -0,0 +1,72 @@
+"""Tests for the file watcher's glob filter and its backends."""
+
+import sys
+import threading
+import time
+
+import pytest
+
+from src.file_watcher import FileWatcher, PathFilter, glob_to_regex
+
+
+@pytest.mark.parametrize("pattern, path, matched", [
+    ("src/**/*.ts", "src/a.ts", True),
+    ("src/**/*.ts", "src/lib/deep/a.ts", True),
+    ("src/**/*.ts", "test/a.ts", False),
+    ("*.py", "app.py", True),
+    ("*.py", "pkg/app.py", False),
+    ("./config/?.yml", "config/a.yml", True),
+    ("**", "anything/at/all", True),
+    ("a.b", "axb", False),
+])
+def test_glob_to_regex(pattern, path, matched):
+    assert bool(glob_to_regex(pattern).match(path)) is matched
+
+
+def test_path_filter():
+    path_filter = PathFilter(["src/**/*.py", "setup.cfg"], ["__pycache__", "src/generated/*"])
+    assert path_filter.matches("src/app/main.py")
+    assert path_filter.matches("setup.cfg")
+    assert not path_filter.matches("src/app/__pycache__/main.py")
+    assert not path_filter.matches("src/generated/models.py")
+    assert not path_filter.matches("docs/conf.py")
+    assert path_filter.may_contain("src") and path_filter.may_contain("src/app")
+    assert not path_filter.may_contain("docs")
+    assert not path_filter.may_contain("src/app/__pycache__")
+    assert PathFilter().matches("any/file.txt")
+
+
+def _backends():
+    backends = ["poll"]
+    if sys.platform.startswith("linux"):
+        backends.append("inotify")
+    return backends
+
+
+@pytest.mark.parametrize("backend", _backends())
+def test_a_burst_of_changes_fires_once(tmp_path, backend):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "node_modules").mkdir()
+    fired = []
+    event = threading.Event()
+    watcher = FileWatcher(str(tmp_path), lambda: (fired.append(1), event.set()), include=["src/**"],
+                          debounce=0.2, poll_interval=0.1, use_inotify=backend == "inotify")
+    watcher.start()
+    try:
+        deadline = time.monotonic() + 5
+        while watcher.mode is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert watcher.mode == backend
+        time.sleep(0.2)  # Let the polling backend take its first snapshot
+        (tmp_path / "node_modules" / "x.js").write_text("ignored")
+        (tmp_path / "README.md").write_text("not included")
+        time.sleep(0.5)
+        assert not fired
+
+        for i in range(5):
+            (tmp_path / "src" / f"f{i}.py").write_text(str(i))
+        assert event.wait(5)
+        time.sleep(0.5)
+        assert fired == [1]
+    finally:
+        watcher.stop()
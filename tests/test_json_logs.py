@@ -0,0 +1,82 @@
+"""Tests for JSON log detection, rendering and the filter index."""
+
+import json
+
+from src.json_logs import LogDetector, LogIndex, display_line, parse_json_line
+
+
+def _record(i, level="info", **fields):
+    return json.dumps({"time": "2024-01-01T10:00:00.000Z", "level": level, "msg": f"m{i}", **fields})
+
+
+def test_detector_needs_consecutive_log_records():
+    detector = LogDetector(3)
+    assert not detector.feed("{}\n" + '{"a": 1}\n' * 5)
+    assert not detector.feed(_record(1) + "\n" + _record(2) + "\nplain text\n")
+    assert not detector.feed(_record(3) + "\n" + _record(4) + "\n" + _record(5))  # Last line incomplete
+    assert detector.feed("\n")
+
+
+def test_blank_lines_keep_the_streak():
+    detector = LogDetector(2)
+    assert detector.feed(_record(1) + "\n\n" + _record(2) + "\n")
+
+
+def test_display_line_keeps_non_log_objects():
+    assert display_line("{}", parse_json_line("{}")) == "{}"
+    assert display_line('{"a": 1}', {"a": 1}) == '{"a": 1}'
+    assert display_line("plain", None) == "plain"
+    assert display_line(_record(1), parse_json_line(_record(1))) == "10:00:00.000 INFO  m1"
+
+
+def _fill(index, count, **fields):
+    for i in range(count):
+        line = _record(i, level="error" if i % 2 else "info", **fields)
+        index.add(line, parse_json_line(line))
+
+
+def test_compaction_keeps_numbers_and_postings_consistent():
+    index = LogIndex(max_lines=100)
+    _fill(index, 250, service="api")
+    assert len(index) <= 100
+    assert index.dropped + len(index) == 250
+    errors = index.matches(5)
+    assert errors and all(index.levels[n] == 5 for n in errors)
+    for number in index.matches(0, ("service", "api")):
+        assert parse_json_line(index.lines.line(number))["msg"] == f"m{number + index.dropped}"
+
+
+def test_byte_cap_drops_oldest_lines():
+    line = _record(0)
+    index = LogIndex(max_bytes=len(line) * 50)
+    _fill(index, 200)
+    assert index.lines.size() <= len(line) * 60
+    assert index.dropped > 0
+    assert parse_json_line(index.lines.line(len(index) - 1))["msg"] == "m199"
+
+
+def test_unindexed_field_matches_escaped_values():
+    index = LogIndex()
+    for i in range(300):  # Past MAX_FIELD_VALUES distinct values
+        line = json.dumps({"level": "info", "path": f"/a/{i}"}).replace("/", "\\/")
+        index.add(line, parse_json_line(line))
+    assert "path" in index.unindexed_keys
+    assert index.matches(0, ("path", "/a/7")) == [7]
+
+
+def test_tab_switches_only_after_log_records(tk_root, pump):
+    from src.terminal import TerminalTab
+
+    tab = TerminalTab(tk_root, "a", "a")
+    tab._json_logs = True
+    tab._handle_output("{}\n" + '{"config": true}\n')
+    assert pump(lambda: '{"config": true}\n' in tab.output.get("1.0", "end"))
+    assert tab.log_index is None
+
+    tab._handle_output("".join(_record(i) + "\n" for i in range(3)) + _record(3, level="error") + "\n")
+    assert pump(lambda: "ERROR m3" in tab.output.get("1.0", "end"))
+    assert tab.log_index is not None and len(tab.log_index) == 4
+    tab.set_log_view((5, None))
+    assert pump(lambda: tab._log_held is None and "m0" not in tab.output.get("1.0", "end"))
+    assert "ERROR m3" in tab.output.get("1.0", "end")
+    tab.destroy()
@@ -0,0 +1,84 @@
+"""Tests for the direct-exec fast path and per-project environments."""
+
+import os
+import shutil
+import stat
+
+import pytest
+
+from src import launcher
+from src.launcher import get_project_env, parse_env_file, prepare_launch, split_simple_command
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="POSIX quoting and PATH")
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    values = {
+        "project_env": True,
+        "project_env_files": [".env", ".env.local"],
+        "project_path_dirs": ["node_modules/.bin"],
+        "direct_exec": True,
+    }
+    monkeypatch.setattr(launcher, "get_setting", values.get)
+    monkeypatch.setattr(launcher, "_env_cache", {})
+    return values
+
+
+def test_simple_commands_skip_the_shell():
+    assert split_simple_command("ls -la 'my dir'") == [shutil.which("ls"), "-la", "my dir"]
+
+
+@pytest.mark.parametrize("command", [
+    "ls | wc -l", "echo $HOME", "make && make test", "FOO=1 make", "ls *.py", "cd src",
+    "./run.sh", "echo 'unterminated", "definitely-not-a-command-xyz", "  ",
+])
+def test_shell_syntax_and_builtins_need_a_shell(command):
+    assert split_simple_command(command) is None
+
+
+def test_parse_env_file(tmp_path):
+    path = tmp_path / ".env"
+    path.write_text(
+        "# comment\n"
+        "export A=1\n"
+        "B = two words  # trailing comment\n"
+        "C=\"line\\nbreak\" ignored\n"
+        "D='single # not a comment'\n"
+        "not an assignment\n"
+        "9BAD=x\n"
+        "E=\n"
+    )
+    assert parse_env_file(str(path)) == {
+        "A": "1", "B": "two words", "C": "line\nbreak", "D": "single # not a comment", "E": "",
+    }
+    assert parse_env_file(str(tmp_path / "missing")) == {}
+
+
+def test_project_env_is_cached_until_a_source_changes(tmp_path, settings):
+    assert get_project_env(str(tmp_path)) is None  # Nothing to add
+    (tmp_path / ".env").write_text("PORT=3000\n")
+    (tmp_path / ".env.local").write_text("PORT=4000\n")  # Later files win
+    env = get_project_env(str(tmp_path))
+    assert env["PORT"] == "4000" and env["HOME"] == os.environ["HOME"]
+    assert get_project_env(str(tmp_path)) is env
+
+    (tmp_path / ".env.local").write_text("PORT=5000\n")
+    assert get_project_env(str(tmp_path))["PORT"] == "5000"
+    settings["project_env"] = False
+    assert get_project_env(str(tmp_path)) is None
+
+
+def test_project_bin_dir_is_searched_first(tmp_path, settings):
+    bin_dir = tmp_path / "node_modules" / ".bin"
+    bin_dir.mkdir(parents=True)
+    tool = bin_dir / "ls"
+    tool.write_text("#!/bin/sh\n")
+    tool.chmod(tool.stat().st_mode | stat.S_IXUSR)
+    args, shell, env = prepare_launch("ls -a", str(tmp_path))
+    assert (args, shell) == ([str(tool), "-a"], False)
+    assert env["PATH"].startswith(str(bin_dir) + os.pathsep)
+
+    assert prepare_launch("ls | wc -l", str(tmp_path))[:2] == ("ls | wc -l", True)
+    settings["direct_exec"] = False
+    assert prepare_launch("ls -a", str(tmp_path))[:2] == ("ls -a", True)
@@ -0,0 +1,78 @@
+"""Tests for per-command limits and heavy-command slots."""
+
+import os
+import subprocess
+
+import pytest
+
+from src import limits
+from src.limits import HeavySlots, describe_limits, make_preexec, parse_cpus, resolve_limits
+
+
+@pytest.mark.parametrize("spec, cpus", [([0, 1], {0, 1}), ("0-3,6", {0, 1, 2, 3, 6}), (" 2 , ", {2}), ("", set())])
+def test_parse_cpus(spec, cpus):
+    assert parse_cpus(spec) == cpus
+
+
+def test_describe_limits():
+    assert describe_limits({"nice": 10, "ionice": "idle", "cpus": "0-1", "max_memory_mb": 2048,
+                            "max_cpu_s": 60, "heavy": True}) == \
+        "nice 10, ionice idle, cpus 0-1, mem 2048 MB, cpu 60s, heavy"
+    assert describe_limits({}) == ""
+
+
+def test_resolve_limits_layers(monkeypatch):
+    settings = {
+        "command_limits": {"make": {"nice": 5, "heavy": True}},
+        "custom_commands": [{"command": "make", "limits": {"nice": 15}}, {"command": "ls"}],
+    }
+    monkeypatch.setattr(limits, "get_setting", settings.get)
+    assert resolve_limits("make") == {"nice": 15, "heavy": True}
+    assert resolve_limits("ls") == {}
+
+
+def test_nothing_to_apply_keeps_the_plain_spawn():
+    then = object()
+    assert make_preexec({}, then) is then
+    assert make_preexec({"heavy": True}) is None
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX preexec_fn")
+def test_limits_apply_in_the_child():
+    preexec = make_preexec({"nice": 3, "max_cpu_s": 42})
+    output = subprocess.run(["sh", "-c", "ulimit -t; nice"], preexec_fn=preexec,
+                            capture_output=True, text=True, check=True).stdout.split()
+    assert output[0] == "42"
+    assert int(output[1]) == min(19, os.nice(0) + 3)
+
+
+def test_heavy_slots_queue_per_project():
+    slots = HeavySlots()
+    started = []
+
+    def start(tab_id):
+        def run():
+            assert slots.acquire("/p", tab_id, 1)
+            started.append(tab_id)
+        return run
+
+    assert slots.acquire("/p", "a", 1)
+    assert slots.acquire("/p", "a", 1)  # Restart of the holder
+    assert not slots.acquire("/p", "b", 1)
+    slots.wait("/p", "b", start("b"))
+    assert not slots.acquire("/p", "c", 1)
+    slots.wait("/p", "c", start("c"))
+    assert slots.acquire("/other", "d", 1)  # Separate projects
+
+    assert slots.cancel("c") and not slots.cancel("c")
+    slots.release("a")
+    assert started == ["b"]
+    slots.release("b")
+    assert started == ["b"] and slots.running["/p"] == set()
+    slots.release("unknown")
+
+
+def test_heavy_cap_below_one_still_allows_one():
+    slots = HeavySlots()
+    assert slots.acquire("/p", "a", 0)
+    assert not slots.acquire("/p", "b", 0)
@@ -0,0 +1,120 @@
+"""Tests for the problem matchers."""
+
+from src.problems import MAX_PROBLEMS, ProblemScanner
+
+
+def _scan(text, custom=None):
+    scanner = ProblemScanner(custom)
+    scanner.feed(text)
+    return scanner.snapshot()
+
+
+def _where(problem):
+    return problem["source"], problem["file"], problem["line"], problem["col"], problem["severity"]
+
+
+def test_tsc_both_formats():
+    problems = _scan(
+        "src/app.ts(12,5): error TS2322: Type 'string' is not assignable to type 'number'.\n"
+        "src/b.ts:3:1 - warning TS6133: 'x' is declared but never read.\n"
+    )
+    assert [_where(p) for p in problems] == [
+        ("tsc", "src/app.ts", 12, 5, "error"),
+        ("tsc", "src/b.ts", 3, 1, "warning"),
+    ]
+    assert problems[0]["code"] == "TS2322"
+
+
+def test_generic_and_pytest_lines():
+    problems = _scan(
+        "main.go:12:5: undefined: x\n"
+        "file.c:3:1: warning: unused variable\n"
+        "tests/test_api.py:42: AssertionError\n"
+        "12:30:01 server started\n"
+    )
+    assert [_where(p) for p in problems] == [
+        ("generic", "main.go", 12, 5, "error"),
+        ("generic", "file.c", 3, 1, "warning"),
+        ("pytest", "tests/test_api.py", 42, 0, "error"),
+    ]
+    assert problems[1]["message"] == "unused variable"
+
+
+def test_eslint_stylish_block():
+    problems = _scan(
+        "/repo/src/index.js\n"
+        "  3:10  error    'a' is defined but never used  no-unused-vars\n"
+        "  7:1   warning  Unexpected console statement   no-console\n"
+        "\n"
+        "  9:9  error  not under a file header\n"
+    )
+    assert [(_where(p), p["code"]) for p in problems] == [
+        (("eslint", "/repo/src/index.js", 3, 10, "error"), "no-unused-vars"),
+        (("eslint", "/repo/src/index.js", 7, 1, "warning"), "no-console"),
+    ]
+
+
+def test_python_traceback_reports_the_innermost_frame():
+    problems = _scan(
+        "Traceback (most recent call last):\n"
+        '  File "app.py", line 10, in <module>\n'
+        "    main()\n"
+        '  File "lib/util.py", line 4, in main\n'
+        "    raise ValueError('bad')\n"
+        "ValueError: bad\n"
+    )
+    assert [(_where(p), p["message"]) for p in problems] == [
+        (("python", "lib/util.py", 4, 0, "error"), "ValueError: bad"),
+    ]
+
+
+def test_jest_failure_uses_the_first_frame_outside_node_modules():
+    problems = _scan(
+        "  ● math › adds\n"
+        "\n"
+        "    expect(received).toBe(expected)\n"
+        "      at Object.toBe (node_modules/expect/build/index.js:1:1)\n"
+        "      at Object.<anonymous> (src/math.test.js:5:13)\n"
+    )
+    assert [(_where(p), p["message"], p["anchor"]) for p in problems] == [
+        (("jest", "src/math.test.js", 5, 13, "error"), "math › adds", "  ● math › adds"),
+    ]
+
+
+def test_streaming_ansi_and_redraws():
+    scanner = ProblemScanner()
+    scanner.feed("\x1b[31mmain.go:1:2: boom")
+    assert scanner.snapshot() == []  # Waits for the newline
+    scanner.feed("\x1b[0m\nbuilding...\rmain.go:3:4: bang\n")
+    problems = scanner.snapshot()
+    assert [(p["line"], p["message"]) for p in problems] == [(1, "boom"), (3, "bang")]
+    assert problems[0]["anchor"] == "\x1b[31mmain.go:1:2: boom\x1b[0m"
+
+
+def test_duplicates_are_counted_and_the_list_is_capped():
+    problems = _scan("a.go:1:1: same\n" * 3)
+    assert len(problems) == 1 and problems[0]["count"] == 3
+    problems = _scan("".join(f"a.go:{i}:1: e\n" for i in range(1, MAX_PROBLEMS + 50)))
+    assert len(problems) == MAX_PROBLEMS
+
+
+def test_custom_matchers(capsys):
+    custom = [
+        {"name": "lint", "pattern": r"^LINT (?P<file>\S+) (?P<line>\d+) (?P<message>.*)$", "hint": "LINT",
+         "severity": "warning"},
+        {"pattern": "("},          # Bad regex: reported and skipped
+        {"name": "no pattern"},
+    ]
+    problems = _scan("LINT a.py 3 too long\n", custom)
+    assert [(_where(p), p["message"]) for p in problems] == [(("lint", "a.py", 3, 0, "warning"), "too long")]
+    assert capsys.readouterr().out.count("Error in problem matcher") == 2
+
+
+def test_reset_and_changed_flag():
+    scanner = ProblemScanner()
+    scanner.snapshot()
+    assert not scanner.changed
+    scanner.feed("a.go:1:1: e\n")
+    assert scanner.changed
+    scanner.reset()
+    assert scanner.snapshot() == []
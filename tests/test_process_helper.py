@@ -0,0 +1,77 @@
+"""Tests for child process usage accounting and freeing ports."""
+
+import shutil
+import subprocess
+import sys
+import time
+
+import pytest
+
+from src.process_helper import check_port_in_use, kill_port, wait_with_usage
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="POSIX wait4 only")
+
+
+@pytest.fixture
+def large_parent():
+    """Hold ~300 MB of resident memory in this process while a child runs."""
+    ballast = b"\x01" * (300 * 1024 * 1024)
+    yield
+    del ballast
+
+
+def test_peak_is_the_commands_own(large_parent):
+    process = subprocess.Popen(["sleep", "0.3"])
+    exit_code, cpu, peak_kb = wait_with_usage(process)
+    assert exit_code == 0
+    assert cpu is not None
+    assert peak_kb is None or peak_kb < 50 * 1024
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="sampled from /proc")
+def test_peak_is_sampled_on_linux(large_parent):
+    process = subprocess.Popen(["sleep", "0.3"], preexec_fn=lambda: None)  # Forks instead of vfork
+    _, _, peak_kb = wait_with_usage(process)
+    assert peak_kb is not None and 0 < peak_kb < 50 * 1024
+
+
+def test_exit_code(large_parent):
+    assert wait_with_usage(subprocess.Popen(["sh", "-c", "exit 3"]))[0] == 3
+
+
+_SERVER = """
+import signal, socket, sys, time
+sock = socket.socket()
+sock.bind(("127.0.0.1", 0))
+sock.listen()
+if sys.argv[1] == "ignore":
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+else:
+    signal.signal(signal.SIGTERM, lambda *_: (print("term", flush=True), sys.exit(0)))
+print(sock.getsockname()[1], flush=True)
+time.sleep(30)
+"""
+
+
+def _server(mode):
+    process = subprocess.Popen([sys.executable, "-c", _SERVER, mode], stdout=subprocess.PIPE, text=True)
+    return process, int(process.stdout.readline())
+
+
+@pytest.mark.skipif(not shutil.which("lsof"), reason="needs lsof")
+def test_kill_port_asks_the_process_to_exit_first():
+    process, port = _server("exit")
+    assert check_port_in_use(port)
+    assert kill_port(port)
+    assert process.wait(5) == 0
+    assert process.stdout.read() == "term\n"
+
+
+@pytest.mark.skipif(not shutil.which("lsof"), reason="needs lsof")
+def test_kill_port_kills_a_process_that_ignores_sigterm():
+    process, port = _server("ignore")
+    start = time.monotonic()
+    assert kill_port(port, grace=0.5)
+    assert process.wait(5) == -9
+    assert time.monotonic() - start >= 0.5
+    assert not kill_port(port)
@@ -0,0 +1,112 @@
+"""Tests for project script discovery and server/port inference."""
+
+import json
+import textwrap
+
+import pytest
+
+from src.project_scripts import discover_scripts, find_script, infer, infer_command
+
+
+@pytest.mark.parametrize("name, body, expected", [
+    ("dev", "next dev", (True, 3000, False)),
+    ("dev", "next dev -p 4000", (True, 4000, True)),
+    ("start", "PORT=8080 node server.js", (True, 8080, True)),
+    ("serve", "vite", (True, 5173, False)),
+    ("server", "gunicorn app:app --bind 0.0.0.0:9000", (True, 9000, True)),
+    ("server", "gunicorn app:app -b unix:/run/app.sock", (True, None, False)),
+    ("build", "vite build", (False, None, False)),
+    ("migrate:dev", "prisma migrate dev", (False, None, False)),
+    ("up", "docker compose up -d", (False, None, False)),
+    ("build:watch", "tsc -p .", (True, None, False)),
+])
+def test_infer(name, body, expected):
+    assert infer(name, body) == expected
+
+
+@pytest.mark.parametrize("command", ["grep -w error log.txt", "tsc -w", "ls -w 80"])
+def test_watch_flags_of_other_tools_are_not_servers(command):
+    assert infer_command(command)[0] is False
+
+
+@pytest.mark.parametrize("command", ["tsc --watch", "npx jest --watchAll", "node --watch app.js", "cargo watch -x run"])
+def test_watchers_keep_running(command):
+    assert infer_command(command)[0] is True
+
+
+def test_runner_name_counts(tmp_path):
+    assert infer_command("npm run dev") == (True, None, False)
+    assert infer_command("make test") == (False, None, False)
+
+
+def _write(path, text):
+    path.write_text(textwrap.dedent(text).lstrip())
+
+
+def test_discovers_all_sources(tmp_path):
+    (tmp_path / "package.json").write_text(json.dumps({"scripts": {"dev": "vite --port 3001", "lint": "eslint ."}}))
+    (tmp_path / "pnpm-lock.yaml").write_text("")
+    _write(tmp_path / "Makefile", """
+        .PHONY: run test
+        run:
+        \tpython -m http.server 8001
+        test lint:
+        \tpytest
+        %.o: %.c
+        \tcc -c $<
+    """)
+    _write(tmp_path / "pyproject.toml", """
+        [project.scripts]
+        mytool = "pkg:main"
+
+        [tool.taskipy.tasks]
+        serve = "uvicorn app:app"
+    """)
+    _write(tmp_path / "compose.yaml", """
+        services:
+          web:
+            image: nginx
+            ports:
+              - "8080:80"
+              - target: 443
+                published: 8443
+          db:
+            image: postgres
+            ports: ["5432"]
+    """)
+    found = dict(discover_scripts(str(tmp_path)))
+    assert set(found) == {"pnpm", "Make", "Python", "Docker"}
+
+    pnpm = {s["label"]: s for s in found["pnpm"]}
+    assert pnpm["dev"]["command"] == "pnpm run dev"
+    assert (pnpm["dev"]["port"], pnpm["dev"]["port_explicit"]) == (3001, True)
+    assert pnpm["lint"]["long_running"] is False
+
+    assert [s["label"] for s in found["Make"]] == ["run", "test", "lint"]
+    assert found["Make"][0]["port"] == 8001
+
+    python = {s["label"]: s for s in found["Python"]}
+    assert python["mytool"]["command"] == "mytool"
+    assert (python["serve"]["command"], python["serve"]["port"], python["serve"]["port_explicit"]) == \
+        ("task serve", 8000, False)
+
+    docker = {s["label"]: s for s in found["Docker"]}
+    assert (docker["web"]["port"], docker["web"]["port_explicit"]) == (8080, True)
+    assert (docker["db"]["port"], docker["db"]["port_explicit"]) == (None, False)
+
+    assert find_script(str(tmp_path), "make run")["port"] == 8001
+    assert find_script(str(tmp_path), "make nope") is None
+
+
+def test_reparses_when_the_file_changes(tmp_path):
+    package = tmp_path / "package.json"
+    package.write_text(json.dumps({"scripts": {"dev": "vite"}}))
+    assert [s["label"] for s in dict(discover_scripts(str(tmp_path)))["NPM"]] == ["dev"]
+    package.write_text(json.dumps({"scripts": {"dev": "vite", "preview": "vite preview"}}))
+    assert [s["label"] for s in dict(discover_scripts(str(tmp_path)))["NPM"]] == ["dev", "preview"]
+
+
+def test_broken_package_json_is_skipped(tmp_path, capsys):
+    (tmp_path / "package.json").write_text("{not json")
+    assert discover_scripts(str(tmp_path)) == []
+    assert "Error reading" in capsys.readouterr().out
@@ -0,0 +1,76 @@
+"""Tests for recording and replaying tab output."""
+
+import threading
+
+from src.recording import Recorder, Replayer, cast_mode, read_cast
+
+CHUNKS = ["\x1b[31mred\x1b[0m\n", "50%\r", "100%\n", "héllo ✓\n"]
+
+
+def _record(path, mode="pty"):
+    recorder = Recorder(path, "make build", "build", (24, 80), mode=mode)
+    for chunk in CHUNKS:
+        recorder.write(chunk)
+    recorder.close()
+    return recorder
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "casts" / "build.cast"
+    recorder = _record(str(path), mode="pipe")
+    assert recorder.events == len(CHUNKS)
+
+    header, events = read_cast(path)
+    assert header["command"] == "make build" and (header["width"], header["height"]) == (80, 24)
+    assert cast_mode(header) == "pipe"
+    events = list(events)
+    assert [data for _, _, data in events] == CHUNKS
+    assert all(kind == "o" for _, kind, _ in events)
+    assert [seconds for seconds, _, _ in events] == sorted(seconds for seconds, _, _ in events)
+
+    received, done = [], threading.Event()
+    replayer = Replayer(path, received.append, speed=0,
+                        on_done=lambda events, elapsed, stopped: done.set())
+    replayer.start()
+    assert done.wait(5)
+    assert received == CHUNKS and replayer.events == len(CHUNKS)
+
+
+def test_torn_last_line_is_skipped(tmp_path):
+    path = tmp_path / "torn.cast"
+    _record(str(path))
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('[1.5,"o","cut sh')
+    header, events = read_cast(path)
+    assert cast_mode(header) == "pty"
+    assert [data for _, _, data in events] == CHUNKS
+
+
+def test_other_recordings_are_pty(tmp_path):
+    assert cast_mode({"version": 2}) == "pty"
+    assert cast_mode({"version": 2, "env": {"SHELL": "/bin/bash", "TERM": "xterm"}}) == "pty"
+    path = tmp_path / "bad.cast"
+    path.write_text('{"version": 1}\n')
+    try:
+        read_cast(path)
+    except ValueError as e:
+        assert "bad.cast" in str(e)
+    else:
+        raise AssertionError("version 1 accepted")
+
+
+def test_tab_filters_only_pty_recordings(tk_root, pump, tmp_path):
+    from src.terminal import TerminalTab
+
+    tab = TerminalTab(tk_root, "a", "a")
+    for mode, expected in (("pipe", "\x1b[31mred"), ("pty", "red\n")):
+        path = tmp_path / f"{mode}.cast"
+        _record(str(path), mode=mode)
+        tab.clear()
+        assert tab.replay(str(path), speed=0)
+        assert pump(lambda: tab.replayer is None)
+        text = tab.output.get("1.0", "end")
+        assert expected in text
+        if mode == "pty":
+            assert "\x1b" not in text
+    tab.destroy()
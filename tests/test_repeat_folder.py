@@ -0,0 +1,46 @@
+"""Tests for folding repeated output lines."""
+
+from src.repeat_folder import RepeatFolder
+
+
+def test_exact_repeats_become_a_counter():
+    folder = RepeatFolder("exact")
+    assert folder.feed("start\nwaiting\nwaiting\nwaiting\ndone\n") == [
+        ("text", "start\nwaiting\n"), ("count", 3), ("text", "done\n"),
+    ]
+    assert folder.folded == 2
+
+
+def test_run_continues_across_chunks():
+    folder = RepeatFolder("exact")
+    assert folder.feed("ping\n") == [("text", "ping\n")]
+    assert folder.feed("ping\n") == [("count", 2)]
+    assert folder.feed("ping\nping\n") == [("count", 4)]
+
+
+def test_numbers_mode_ignores_digits():
+    folder = RepeatFolder("numbers")
+    ops = folder.feed("retry 1 after 0.5s\nretry 2 after 1.0s\nretry 3 after 2.0s\n")
+    assert ops == [("text", "retry 1 after 0.5s\n"), ("count", 3)]
+    assert RepeatFolder("exact").feed("a 1\na 2\n") == [("text", "a 1\na 2\n")]
+
+
+def test_blank_lines_are_not_folded():
+    assert RepeatFolder().feed("\n\n\n") == [("text", "\n\n\n")]
+
+
+def test_partial_lines_are_never_repeats():
+    assert RepeatFolder().feed("x\nx") == [("text", "x\nx")]
+    folder = RepeatFolder()
+    assert folder.feed("x\n") == [("text", "x\n")]
+    assert folder.feed("x") == [("text", "x")]     # Still open: shown as is
+    assert folder.feed("\nx\n") == [("text", "\nx\n")]  # Continuation, then a fresh run
+
+
+def test_reset_and_off():
+    folder = RepeatFolder()
+    folder.feed("x\n")
+    folder.reset()
+    assert folder.feed("x\n") == [("text", "x\n")]
+    assert RepeatFolder("off").feed("x\nx\n") == [("text", "x\nx\n")]
+    assert RepeatFolder("bogus").mode == "off"
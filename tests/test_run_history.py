@@ -0,0 +1,62 @@
+"""Tests for run history and slow-run detection."""
+
+import pytest
+
+from src.run_history import MIN_BASELINE_RUNS, EXIT_CODE, WALL, RunHistory, format_duration
+
+
+@pytest.fixture
+def history(tmp_path):
+    return RunHistory(tmp_path / "history.json")
+
+
+def _record(history, walls, exit_code=0, command="npm test"):
+    for i, wall in enumerate(walls):
+        history.record("/p", command, 1000.0 + i, wall, 1.0, 2048, exit_code)
+
+
+def test_needs_a_baseline(history):
+    _record(history, [10.0] * (MIN_BASELINE_RUNS - 1))
+    assert history.check_regression("/p", "npm test", 60.0, 20, 1.5) is None
+    _record(history, [10.0])
+    assert history.check_regression("/p", "npm test", 60.0, 20, 1.5) == (6.0, 10.0, MIN_BASELINE_RUNS)
+
+
+def test_median_of_successful_runs_in_the_window(history):
+    _record(history, [100.0] * 10)
+    _record(history, [1.0] * 10, exit_code=1)  # Failed runs don't count
+    _record(history, [10.0, 11.0, 12.0, 9.0, 10.0])
+    assert history.baseline("/p", "npm test", 5) == (10.0, 5)
+    assert history.check_regression("/p", "npm test", 14.0, 5, 1.5) is None
+    assert history.check_regression("/p", "npm test", 15.0, 5, 1.5) == (1.5, 10.0, 5)
+
+
+def test_small_absolute_slowdowns_are_ignored(history):
+    _record(history, [0.2] * 10)
+    assert history.check_regression("/p", "npm test", 1.0, 20, 1.5) is None  # 5x, but only 0.8s
+
+
+def test_runs_are_per_project_and_command(history):
+    _record(history, [10.0] * 10)
+    assert history.check_regression("/p", "npm run build", 60.0, 20, 1.5) is None
+    assert history.check_regression("/other", "npm test", 60.0, 20, 1.5) is None
+
+
+def test_capped_and_persisted(history, tmp_path):
+    for i in range(5):
+        history.record("/p", "make", i, float(i), None, None, i % 2, max_runs=3)
+    rows = RunHistory(tmp_path / "history.json").runs("/p", "make")
+    assert [row[WALL] for row in rows] == [2.0, 3.0, 4.0]
+    assert [row[EXIT_CODE] for row in rows] == [0, 1, 0]
+    assert rows[0][2:4] == [None, None]
+
+
+def test_corrupt_file_starts_empty(tmp_path):
+    path = tmp_path / "history.json"
+    path.write_text("[1, 2")
+    assert RunHistory(path).runs("/p", "make") == []
+
+
+@pytest.mark.parametrize("seconds, text", [(4.24, "4.2s"), (185, "3m 05s"), (3720, "1h 02m")])
+def test_format_duration(seconds, text):
+    assert format_duration(seconds) == text
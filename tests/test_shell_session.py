@@ -0,0 +1,93 @@
+"""Tests for the persistent shell session."""
+
+import threading
+import time
+
+import pytest
+
+from src.shell_session import ShellSession
+
+pytestmark = pytest.mark.skipif(not ShellSession.supported(), reason="POSIX shell only")
+
+
+class _Collector:
+    def __init__(self):
+        self.output = []
+        self.done = {}
+        self.event = threading.Event()
+
+    def on_output(self, text):
+        self.output.append(text)
+
+    def on_done(self, run_id, exit_code):
+        self.done[run_id] = exit_code
+        self.event.set()
+
+    def wait(self, run_id, timeout=5):
+        while run_id not in self.done:
+            self.event.clear()
+            if run_id in self.done or not self.event.wait(timeout):
+                break
+        return self.done.get(run_id)
+
+
+@pytest.fixture
+def session():
+    collector = _Collector()
+    shell = ShellSession(on_output=collector.on_output, on_done=collector.on_done)
+    shell.start()
+    yield shell, collector
+    shell.close()
+
+
+def test_malformed_command_completes(session):
+    shell, collector = session
+    run_id = shell.run('echo "unterminated')
+    exit_code = collector.wait(run_id)
+    assert exit_code is not None and exit_code != 0
+
+    # The session is still usable afterwards
+    run_id = shell.run("echo after")
+    assert collector.wait(run_id) == 0
+    assert "after\n" in collector.output
+
+
+def test_state_persists_between_runs(session, tmp_path):
+    shell, collector = session
+    assert collector.wait(shell.run(f"cd {tmp_path} && export TM_TEST=1")) == 0
+    assert collector.wait(shell.run('echo "$PWD $TM_TEST"')) == 0
+    assert f"{tmp_path} 1\n" in collector.output
+
+
+def test_interrupt_aborts_the_whole_command(session, tmp_path):
+    shell, collector = session
+    run_id = shell.run("sleep 30; echo after-sleep")
+    time.sleep(0.3)
+    shell.interrupt()
+    assert collector.wait(run_id) == 130
+    assert "after-sleep\n" not in collector.output
+
+    # The shell and its state survive the interrupt
+    assert collector.wait(shell.run(f"cd {tmp_path}")) == 0
+    assert collector.wait(shell.run("echo $PWD")) == 0
+    assert f"{tmp_path}\n" in collector.output
+
+
+def test_stopped_tab_is_not_reported_as_completed(tk_root, pump, tmp_path, monkeypatch):
+    from src import terminal
+    from src.run_history import RunHistory
+    from src.terminal import TerminalTab
+
+    monkeypatch.setattr(terminal, "HISTORY", RunHistory(tmp_path / "history.json"))
+    tab = TerminalTab(tk_root, "a", "a")
+    tab.persistent_shell = True
+    tab.run_command("sleep 30; echo after-$((1 + 1))", use_pty=False)
+    time.sleep(0.3)
+    tab.stop_process()
+    assert pump(lambda: tab.action_btn.cget("text") == "🔄 Restart")
+    pump(lambda: False, timeout=0.3)
+    text = tab.output.get("1.0", "end")
+    assert "after-2\n" not in text
+    assert "[Process completed successfully]" not in text
+    assert tab.status_label.cget("text") == "■ Stopped"
+    tab.destroy()
@@ -0,0 +1,97 @@
+"""Tests for skipping commands whose inputs are unchanged."""
+
+import os
+
+import pytest
+
+from src import skip_cache
+from src.skip_cache import SkipCache, expand_inputs, resolve_cache_spec
+
+SPEC = {"inputs": ["package.json", "src/**/*.ts"], "outputs": ["dist"]}
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "app"
+    (root / "src" / "lib").mkdir(parents=True)
+    (root / "node_modules" / "x").mkdir(parents=True)
+    (root / "dist").mkdir()
+    (root / "package.json").write_text('{"name": "app"}')
+    (root / "src" / "index.ts").write_text("export {}")
+    (root / "src" / "lib" / "util.ts").write_text("export const a = 1")
+    (root / "src" / "notes.md").write_text("notes")
+    (root / "node_modules" / "x" / "index.ts").write_text("")
+    return root
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SkipCache(tmp_path / "skip_cache.json")
+
+
+def test_expand_inputs(project):
+    assert expand_inputs(str(project), ["package.json", "src/**/*.ts"]) == [
+        "package.json", "src/index.ts", "src/lib/util.ts",
+    ]
+    assert expand_inputs(str(project), ["./src/"]) == ["src/index.ts", "src/lib/util.ts", "src/notes.md"]
+    assert expand_inputs(str(project), ["**/*.ts"], ["node_modules"]) == ["src/index.ts", "src/lib/util.ts"]
+    assert expand_inputs(str(project), ["missing.json"]) == []
+
+
+def test_skips_until_an_input_changes(project, cache):
+    root = str(project)
+    assert cache.check(root, "tsc", SPEC) is None  # Never ran
+    cache.record_success(root, "tsc", SPEC)
+    assert cache.check(root, "tsc", SPEC).startswith("3 input files unchanged")
+
+    (project / "src" / "lib" / "util.ts").write_text("export const a = 2")
+    assert cache.check(root, "tsc", SPEC) is None
+    cache.record_success(root, "tsc", SPEC)
+    (project / "src" / "new.ts").write_text("")
+    assert cache.check(root, "tsc", SPEC) is None  # A new input file counts too
+
+
+def test_touch_without_change_still_skips(project, cache):
+    root = str(project)
+    cache.record_success(root, "tsc", SPEC)
+    index = project / "src" / "index.ts"
+    os.utime(index, ns=(index.stat().st_atime_ns, index.stat().st_mtime_ns + 10**9))
+    assert cache.check(root, "tsc", SPEC) is not None  # Same digest, new mtime
+
+
+def test_missing_output_or_other_command_runs(project, cache):
+    root = str(project)
+    cache.record_success(root, "tsc", SPEC)
+    assert cache.check(root, "tsc --noEmit", SPEC) is None
+    assert cache.check(root, "tsc", {**SPEC, "inputs": ["package.json"]}) is None  # Spec is in the key
+    (project / "dist").rmdir()
+    assert cache.check(root, "tsc", SPEC) is None
+
+
+def test_persists_and_forgets(project, tmp_path):
+    root = str(project)
+    SkipCache(tmp_path / "skip_cache.json").record_success(root, "tsc", SPEC)
+    reloaded = SkipCache(tmp_path / "skip_cache.json")
+    assert reloaded.check(root, "tsc", SPEC) is not None
+    reloaded.forget(root, "tsc")
+    assert SkipCache(tmp_path / "skip_cache.json").check(root, "tsc", SPEC) is None
+
+
+def test_corrupt_file_is_ignored(project, tmp_path):
+    path = tmp_path / "skip_cache.json"
+    path.write_text("{torn")
+    assert SkipCache(path).check(str(project), "tsc", SPEC) is None
+
+
+def test_resolve_cache_spec(monkeypatch):
+    settings = {
+        "command_inputs": {"make": {"inputs": ["Makefile", "src"]}},
+        "custom_commands": [{"command": "npm install", "outputs": ["node_modules", ".npmrc"]}],
+        "watch_ignore": [],
+    }
+    monkeypatch.setattr(skip_cache, "get_setting", settings.get)
+    assert resolve_cache_spec("make") == {"inputs": ["Makefile", "src"], "outputs": []}
+    assert resolve_cache_spec("npm install") == {
+        "inputs": ["package.json", "package-lock.json"], "outputs": ["node_modules", ".npmrc"],
+    }
+    assert resolve_cache_spec("npm test") is None
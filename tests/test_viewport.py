@@ -0,0 +1,61 @@
+"""Tests for the line store behind the virtualized output view."""
+
+from src.viewport import LineStore
+
+
+def _store(text):
+    store = LineStore()
+    store.append(text)
+    return store
+
+
+def test_lines_and_open_tail():
+    store = _store("one\ntwö\nthr")
+    store.append("ee")
+    assert len(store) == 3
+    assert [store.line(i) for i in range(3)] == ["one", "twö", "three"]
+    assert store.chars == len("one\ntwö\nthree")
+    assert store.text() == "one\ntwö\nthree"
+    store.append_line("four")  # Closes the open line first
+    assert store.text() == "one\ntwö\nthreefour\n"
+
+
+def test_line_limit_on_long_lines():
+    store = _store("é" * 10_000 + "\n")
+    assert store.line(0, 5) == "ééééé"
+
+
+def test_pop_chars_reopens_complete_lines():
+    store = _store("ab\ncd\nef")
+    assert store.pop_chars(4) == "d\nef"
+    assert store.text() == "ab\nc"
+    assert store.chars == 4
+    store.append("x\n")
+    assert [store.line(i) for i in range(len(store))] == ["ab", "cx", ""]
+
+
+def test_drop_lines_keeps_lookups_consistent():
+    store = LineStore()
+    for i in range(100):
+        store.append_line(f"line {i} ✓")
+    before = store.size()
+    store.drop_lines(90)
+    assert len(store) == 11  # Ten lines plus the empty open one
+    assert store.line(0) == "line 90 ✓"
+    assert store.chars == sum(len(f"line {i} ✓") + 1 for i in range(90, 100))
+    assert store.size() < before
+    assert list(store.find_lines("line 95")) == [5]
+    store.drop_lines(1000)
+    assert store.text() == "" and len(store) == 1
+
+
+def test_find_lines_once_per_line():
+    store = _store("error error\nok\nerror\nerror")  # The open last line isn't searched
+    assert list(store.find_lines("error")) == [0, 2]
+
+
+def test_tail_text():
+    store = _store("a\nbb\nccc")
+    assert store.tail_text(5) == "b\nccc"
+    assert store.tail_text(100) == "a\nbb\nccc"
+    assert store.tail_text(0) == ""